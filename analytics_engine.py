@@ -0,0 +1,131 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+MERCHANT_CATEGORIES = ["Shopping", "Travel", "Food", "Bills"]
+TIME_WINDOWS = {"Last 7 Days": 7, "Last 30 Days": 30, "Last 90 Days": 90}
+
+
+def today():
+    return int(np.datetime64("today", "D").astype(np.int64))
+
+
+class DailyRollup:
+    # Per-day, per-merchant-category totals of a transaction log. Days are
+    # integer day numbers (days since 1970-01-01). Appending is one
+    # bincount per batch; a window query sums `days` rows of the rollup,
+    # independent of how many transactions went into them.
+    def __init__(self, first_day, categories=MERCHANT_CATEGORIES):
+        self.first_day = first_day
+        self.categories = list(categories)
+        self.amount = np.zeros((0, len(self.categories)))
+        self.count = np.zeros((0, len(self.categories)), dtype=np.int64)
+        self.success = np.zeros((0, len(self.categories)), dtype=np.int64)
+        self.days = 0
+        self.transactions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def last_day(self):
+        return self.first_day + self.days - 1
+
+    def _grow(self, days):
+        extra = days - len(self.amount)
+        if extra > 0:
+            # Grow geometrically so daily appends don't copy every time
+            extra = max(extra, len(self.amount) // 2)
+            shape = (extra, len(self.categories))
+            self.amount = np.concatenate([self.amount, np.zeros(shape)])
+            self.count = np.concatenate([self.count, np.zeros(shape, dtype=np.int64)])
+            self.success = np.concatenate([self.success, np.zeros(shape, dtype=np.int64)])
+        self.days = max(self.days, days)
+
+    def append(self, day, category, amount, success=None):
+        # day: day numbers, category: index into categories, amount: value
+        # of each transaction, success: optional bool per transaction
+        day = np.asarray(day, dtype=np.int64)
+        category = np.asarray(category, dtype=np.int64)
+        if len(day) == 0:
+            return
+        if day.min() < self.first_day:
+            raise ValueError(f"Transaction day {day.min()} is before the rollup start {self.first_day}")
+        n_categories = len(self.categories)
+        # Out-of-range categories would land in another day's cells
+        if category.min() < 0 or category.max() >= n_categories:
+            bad = category.min() if category.min() < 0 else category.max()
+            raise ValueError(f"Transaction category {bad} is outside 0..{n_categories - 1}")
+        cell = (day - self.first_day) * n_categories + category
+        size = (int(day.max()) - self.first_day + 1) * n_categories
+        amount_sums = np.bincount(cell, weights=amount, minlength=size)
+        counts = np.bincount(cell, minlength=size)
+        successes = counts if success is None else np.bincount(cell, weights=success, minlength=size).astype(np.int64)
+        rows = size // n_categories
+        with self._lock:
+            self._grow(rows)
+            self.amount[:rows] += amount_sums.reshape(rows, n_categories)
+            self.count[:rows] += counts.reshape(rows, n_categories)
+            self.success[:rows] += successes.reshape(rows, n_categories)
+            self.transactions += len(day)
+
+    def window(self, days, end_day=None):
+        # Totals per category over the `days` days ending at end_day
+        with self._lock:
+            end_day = self.last_day if end_day is None else end_day
+            # Clamped after placing the window, so a window running past
+            # either end of the data only covers the days it overlaps
+            stop = end_day - self.first_day + 1
+            start = min(max(stop - days, 0), self.days)
+            stop = min(max(stop, 0), self.days)
+            return (
+                self.amount[start:stop].sum(axis=0),
+                self.count[start:stop].sum(axis=0),
+                self.success[start:stop].sum(axis=0),
+            )
+
+    def summary(self, days, end_day=None):
+        # Window totals plus the change against the window before it
+        end_day = today() if end_day is None else end_day
+        amount, count, success = self.window(days, end_day)
+        prev_amount, prev_count, _ = self.window(days, end_day - days)
+        total, transactions = amount.sum(), count.sum()
+        prev_total, prev_transactions = prev_amount.sum(), prev_count.sum()
+        average = total / transactions if transactions else 0.0
+        prev_average = prev_total / prev_transactions if prev_transactions else 0.0
+        return {
+            "by_category": pd.DataFrame({"Category": self.categories, "Amount": amount}).set_index("Category"),
+            "total": total,
+            "transactions": int(transactions),
+            "average": average,
+            "success_rate": success.sum() / transactions if transactions else 0.0,
+            "average_change": _change(average, prev_average),
+            "transactions_change": _change(transactions, prev_transactions),
+        }
+
+
+def _change(current, previous):
+    return (current - previous) / previous if previous else None
+
+
+def generate_transactions(n, days=120, end_day=None, chunk_size=5_000_000, seed=0):
+    # Synthetic transaction log for testing: yields (day, category, amount,
+    # success) array chunks covering the `days` days ending at end_day
+    end_day = today() if end_day is None else end_day
+    rng = np.random.default_rng(seed)
+    # Category mix and typical spend loosely follow the old static chart
+    weights = np.array([0.4, 0.1, 0.3, 0.2])
+    mean_amount = np.array([1500.0, 4000.0, 400.0, 1200.0])
+    for start in range(0, n, chunk_size):
+        size = min(chunk_size, n - start)
+        day = end_day - rng.integers(0, days, size)
+        category = rng.choice(len(MERCHANT_CATEGORIES), size, p=weights)
+        amount = rng.exponential(mean_amount[category])
+        success = rng.random(size) < 0.97
+        yield day, category, amount, success
+
+
+def build_rollup(transactions, first_day):
+    rollup = DailyRollup(first_day)
+    for chunk in transactions:
+        rollup.append(*chunk)
+    return rollup
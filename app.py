@@ -1,12 +1,22 @@
 import streamlit as st
-import random
-import pandas as pd
-from PIL import Image
-import time
-from datetime import datetime
-import plotly.express as px
-from plotly import graph_objects as go
 
+from assets import asset_bytes
+from contact_queue import SUBMIT_TIMEOUT, get_contact_queue
+from instrumentation import ENABLED as INSTRUMENTATION_ENABLED, REGISTRY, timed
+from session_manager import (
+    USER_KEY, SessionUser, current_user, get_session_registry, session_footprint, session_id,
+    touch_session,
+)
+from user_store import ROLES, get_user_store
+
+# Modules that pull in NumPy, pandas or Plotly are imported inside the
+# pages that use them, so a fresh worker renders the logged-out landing
+# and static pages without loading them.
+
+# Applications listed at once for Admin approval
+REVIEW_PAGE_SIZE = 10
+# Shown when the sidebar image is missing or fails to load
+SIDEBAR_PLACEHOLDER = "https://via.placeholder.com/150"
 
 # Page Configuration
 st.set_page_config(
@@ -16,10 +26,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state
-if 'logged_in' not in st.session_state:
-    st.session_state.logged_in = False
-
 # Custom CSS for Full-Page Coverage and Metrics Styling
 st.markdown("""
     <style>
@@ -40,14 +46,56 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Session Handling
+def start_session(user, token):
+    st.session_state[USER_KEY] = SessionUser(user["id"], user["username"], user["role"], token)
+    # Keep the token in the URL so a reload, restart or another replica
+    # can restore the session from the user store. Streamlit can't set
+    # cookies, so the token is rotated on every restore instead: a URL
+    # left in history or logs stops working once its owner reloads, and
+    # every token expires SESSION_TTL after login.
+    st.query_params["session"] = token
+
+
+def restore_session():
+    token = st.query_params.get("session")
+    if token and current_user() is None:
+        restored = get_user_store().rotate_session(token)
+        if restored:
+            start_session(*restored)
+        else:
+            st.query_params.pop("session", None)
+
+# Credit Scoring
+@st.cache_resource(show_spinner=False)
+def scoring_client():
+    from scoring_service import ScoringClient
+
+    return ScoringClient()
+
+
+def check_credit_score(aadhaar_number):
+    # Scored by the local scoring service, off this process's GIL; scored
+    # in-process when the service isn't running. Both read the land records
+    # from data_loader.land_path() plus the change files in LAND_CHANGES_DIR,
+    # so they give the same scores.
+    from credit_scoring import calculate_credit_score
+    from data_loader import load_score_table
+
+    try:
+        return scoring_client().calculate_credit_score(aadhaar_number)
+    except ConnectionError:
+        return calculate_credit_score(aadhaar_number, load_score_table())
+
 # Sidebar Navigation
+@timed("page.create_sidebar")
 def create_sidebar():
     with st.sidebar:
-        # Sidebar Image
+        # Sidebar Image (pre-resized and cached in-process)
         try:
-            st.image("credit.jpg", caption="Harvest Pay")
-        except:
-            st.image("https://via.placeholder.com/150", caption="Harvest Pay")
+            st.image(asset_bytes("sidebar") or SIDEBAR_PLACEHOLDER, caption="Harvest Pay")
+        except Exception:
+            st.image(SIDEBAR_PLACEHOLDER, caption="Harvest Pay")
         
         selected = st.radio(
             "Navigate to",
@@ -57,34 +105,43 @@ def create_sidebar():
         st.divider()
         
         # Login/Logout Section
-        if st.session_state.get('logged_in', False):
-            st.success(f"Welcome, {st.session_state.get('user_name', 'User')} ({st.session_state.get('user_role', 'Role')})")
+        user = current_user()
+        if user:
+            st.success(f"Welcome, {user.username} ({user.role})")
             if st.button("Logout"):
-                st.session_state.logged_in = False
-                st.session_state.pop('user_name', None)
-                st.session_state.pop('user_id', None)
-                st.session_state.pop('user_role', None)
+                get_user_store().logout(user.token)
+                get_session_registry().drop(session_id())
+                st.query_params.pop('session', None)
+                del st.session_state[USER_KEY]
                 st.rerun()
         else:
             with st.expander("Login"):
                 # Role Selection
-                role = st.selectbox("Login as", ["Select", "Admin", "Farmer", "Contributor"], key="login_role")
+                role = st.selectbox("Login as", ["Select"] + ROLES, key="login_role")
                 username = st.text_input("Username", key="login_username")
                 password = st.text_input("Password", type="password", key="login_password")
                 if st.button("Login"):
                     if role != "Select" and username and password:
-                        st.session_state.logged_in = True
-                        st.session_state.user_name = username
-                        st.session_state.user_id = random.randint(1, 1000)
-                        st.session_state.user_role = role
-                        st.rerun()
+                        login = get_user_store().login(username, password, role)
+                        if login:
+                            start_session(*login)
+                            st.rerun()
+                        else:
+                            st.error("Incorrect password or role for this username. Admin accounts are created by an administrator.")
                     else:
                         st.error("Please select a role and enter both username and password.")
         
-        return selected.lower().replace(" ", "_") if st.session_state.get('logged_in', False) else "login"
+        return selected.lower().replace(" ", "_") if user else "login"
 
 # Home Page
+@timed("page.home")
 def home():
+    from charts import soil_health_gauge
+    from credit_scoring import get_risk_level
+    from crop_rotation import CROPS, IRRIGATION, SOIL_TYPES, recommend_next_crop
+    from dashboard_data import live_stats, loan_schedule, user_loans
+    from soil_health import soil_health_band, soil_health_score
+
     # Main Layout
     col1, col2 = st.columns([2, 1])
 
@@ -93,7 +150,9 @@ def home():
         st.title("🌟 Welcome to Harvest Pay Credit Card System")
 
         # Role-based Welcome Message
-        role = st.session_state.get('user_role', 'Guest')
+        user = current_user()
+        role = user.role if user else "Guest"
+        user_id = user.id if user else None
         if role == "Admin":
             st.subheader("You have administrative access to manage the system.")
         elif role == "Farmer":
@@ -117,23 +176,63 @@ def home():
             - **24/7 Customer Support**: Always available for your queries.
             """)
 
+        with st.expander("💳 Check Your Credit Score"):
+            aadhaar_number = st.text_input("Aadhaar number", max_chars=12, key="aadhaar_number")
+            if aadhaar_number:
+                aadhaar_number = aadhaar_number.strip()
+                # Not cached: a lookup is sub-millisecond and must reflect
+                # change files applied since the last one
+                score, risk = check_credit_score(aadhaar_number)
+                if score is None:
+                    st.warning("No land records found for this Aadhaar number.")
+                else:
+                    st.metric("Credit Score", score)
+                    st.write(f"**Risk:** {risk} (risk level {get_risk_level(risk)})")
+
+        if role == "Farmer":
+            with st.expander("📝 Apply for a Loan"):
+                from applications import REASONS, SUBMIT_TIMEOUT as APPLICATION_TIMEOUT, get_application_pipeline
+                from loans import MAX_PRINCIPAL, MAX_TERM, MIN_PRINCIPAL
+
+                with st.form("loan_application"):
+                    name = st.text_input("Name as on Aadhaar")
+                    aadhaar = st.text_input("Aadhaar number", max_chars=12)
+                    age = st.number_input("Age", min_value=0, max_value=120, value=30)
+                    state = st.text_input("State")
+                    amount = st.number_input(
+                        "Amount (₹)", min_value=MIN_PRINCIPAL, max_value=MAX_PRINCIPAL, value=50_000, step=5_000
+                    )
+                    months = st.number_input("Term (months)", min_value=1, max_value=MAX_TERM, value=12)
+                    if st.form_submit_button("Apply"):
+                        if not (name.strip() and aadhaar.strip() and state.strip()):
+                            st.error("Please fill in your name, Aadhaar number and state.")
+                        else:
+                            # Returns once KYC and fraud checks have run
+                            future = get_application_pipeline().submit(
+                                aadhaar, name, age, state, amount, months, user_id
+                            )
+                            try:
+                                result = future.result(APPLICATION_TIMEOUT)
+                            except TimeoutError:
+                                st.error("Your application is still being checked. Please check back later.")
+                            except Exception:
+                                st.error("We couldn't check your application right now. Please try again.")
+                            else:
+                                if result["reason"] is None:
+                                    st.success(
+                                        f"✅ Application {result['id']} passed checks and is awaiting loan approval."
+                                    )
+                                else:
+                                    st.error(f"{result['stage']}: {REASONS[result['reason']]}")
+
     # Right Column: Dynamic Live Statistics
     with col2:
         st.subheader("📊 Live Statistics")
 
-        if role == "Admin":
-            st.metric("📈 Active Users", f"{random.randint(1000, 5000):,}")
-            st.metric("📊 Average Credit Score", random.randint(700, 800))
-            st.metric("💰 Total Credit Issued", f"₹{random.randint(10_000_000, 50_000_000):,}")
-        elif role == "Contributor":
-            st.metric("💵 Amount Invested", f"₹{random.randint(500_000, 5_000_000):,}")
-            st.metric("📉 Rate of Interest Allocated", f"{random.uniform(5.0, 12.0):.2f}%")
-            st.metric("📈 Profit Made", f"₹{random.randint(100_000, 500_000):,}")
-        elif role == "Farmer":
-            st.metric("💳 Credit Limit", f"₹{random.randint(50_000, 300_000):,}")
-            st.metric("📉 Rate of Interest", f"{random.uniform(3.0, 8.0):.2f}%")
-            st.metric("📊 Credit Amount", f"₹{random.randint(15_000, 200_000):,}")
-        else:
+        stats = live_stats(role, None if role == "Admin" else user_id)
+        for label, value, help_text in stats:
+            st.metric(label, value, help=help_text)
+        if not stats:
             st.info("Log in to view role-specific statistics.")
 
     # Horizontal Divider
@@ -150,21 +249,13 @@ def home():
             st.write("Get recommendations for the next crop to grow based on soil health and the last planted crop.")
 
         # Input Fields
-        last_crop = st.selectbox("Select Last Planted Crop", ["Wheat", "Rice", "Maize", "Sugarcane", "Cotton"])
-        soil_type = st.selectbox("Select Soil Type", ["Loamy", "Sandy", "Clayey", "Silty", "Peaty"])
-        irrigation = st.radio("Do you have irrigation facilities?", ["Yes", "No"])
+        last_crop = st.selectbox("Select Last Planted Crop", CROPS)
+        soil_type = st.selectbox("Select Soil Type", SOIL_TYPES)
+        irrigation = st.radio("Do you have irrigation facilities?", IRRIGATION)
         organic_matter = st.slider("Organic Matter Content (%)", min_value=1, max_value=100, value=50)
         
         # Logic for Recommendations
-        recommendations = {
-            "Wheat": {"Loamy": "Maize", "Sandy": "Peanuts", "Clayey": "Rice"},
-            "Rice": {"Loamy": "Sugarcane", "Sandy": "Cotton", "Clayey": "Wheat"},
-            "Maize": {"Loamy": "Beans", "Sandy": "Millets", "Clayey": "Rice"},
-            "Sugarcane": {"Loamy": "Soybeans", "Sandy": "Groundnuts", "Clayey": "Cotton"},
-            "Cotton": {"Loamy": "Wheat", "Sandy": "Sunflower", "Clayey": "Rice"}
-        }
-        
-        next_crop = recommendations.get(last_crop, {}).get(soil_type, "No recommendation available")
+        next_crop = recommend_next_crop(last_crop, soil_type, irrigation, organic_matter)
         
         # Display Results
         st.write("### Recommendations")
@@ -175,21 +266,9 @@ def home():
         st.write(f"**Recommended Next Crop:** {next_crop}")
         
         # Visualization with Gauge
-        soil_health_score = organic_matter + (20 if irrigation == "Yes" else 0)
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=soil_health_score,
-            title={"text": "Soil Health Score"},
-            gauge={
-                "axis": {"range": [0, 120]},
-                "steps": [
-                    {"range": [0, 40], "color": "red"},
-                    {"range": [40, 80], "color": "yellow"},
-                    {"range": [80, 120], "color": "green"},
-                ],
-                "bar": {"color": "blue"}
-            }
-        ))
+        soil_score = soil_health_score(organic_matter, irrigation)
+        st.write(f"**Soil Health:** {soil_health_band(soil_score)}")
+        fig = soil_health_gauge(soil_score)
         st.plotly_chart(fig, use_container_width=True)
 
 
@@ -197,12 +276,14 @@ def home():
     with col2:
         if st.button("📑 View Loan Details"):
             st.write("**Your Current Loans**")
-            st.write("""
-            | Loan ID | Amount (₹) | Interest Rate (%) | Status |
-            |---------|------------|-------------------|--------|
-            | 10101   | 2,50,000   | 08.0            | Active |
-            | 10102   | 1,00,000   | 08.0              | Paid   |
-            """)
+            loans = user_loans(user_id)
+            if loans.empty:
+                st.write("You have no loans yet.")
+            else:
+                st.dataframe(loans[["Amount (₹)", "Interest Rate (%)", "EMI (₹)", "Status"]])
+            for loan_id, loan in loans[loans["Status"] == "Active"].iterrows():
+                with st.expander(f"Repayment schedule for loan {loan_id}"):
+                    st.dataframe(loan_schedule(loan["Amount (₹)"], loan["Interest Rate (%)"], loan["Term (months)"]))
             st.info("📊 Visit your loan dashboard for more details.")
 
     # Feature 3: Customer Support
@@ -220,6 +301,7 @@ def home():
     st.divider()
     st.caption("© 2024 Vidya's Credit Card System. All rights reserved.")
 # About Page
+@timed("page.about")
 def about():
     st.title("🌟About HarvestPay Credit System")
     
@@ -288,6 +370,7 @@ def about():
     )
 
 # Features Page
+@timed("page.features")
 def features():
     st.title("🌟 Key Features")
 
@@ -338,12 +421,14 @@ def features():
 
     # Feature Comparison Section
     st.write("### Compare Features")
-    feature_comparison = {
-        "Feature": ["AI Credit Scoring", "Loan Benefits", "Security"],
-        "User Rating (⭐)": [4.8, 4.6, 4.9],
-        "Benefit Level": ["High", "Moderate", "Very High"]
-    }
-    st.dataframe(feature_comparison)
+    # A static table: st.dataframe would load pandas just for this
+    st.markdown("""
+    | Feature | User Rating (⭐) | Benefit Level |
+    |---------|-----------------|---------------|
+    | AI Credit Scoring | 4.8 | High |
+    | Loan Benefits | 4.6 | Moderate |
+    | Security | 4.9 | Very High |
+    """)
 
     # Interactive Button
     st.markdown(
@@ -357,92 +442,108 @@ def features():
         unsafe_allow_html=True
     )
 #def dashbooard            
+@timed("page.dashboard")
 def dashboard():
+    from dashboard_data import DASHBOARD_SECTIONS
+    from sections import CHART_RENDERERS, render_sections
+
     st.title("📊 User Dashboard")
     
     # Retrieve the user's role from session state
-    role = st.session_state.get("user_role", "Guest")  # Default to 'Guest' if not set
-
-    if role == "Admin":
-        st.subheader("Admin Dashboard")
-        # Graph: Active Users Over Time
-        st.write("### Active Users Over Time")
-        active_users_data = pd.DataFrame({
-            "Month": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
-            "Active Users": [random.randint(1000, 5000) for _ in range(6)]
-        })
-        st.line_chart(active_users_data.set_index("Month"))
-
-        # Graph: Pending Applications by Type
-        st.write("### Pending Applications by Type")
-        pending_apps_data = pd.DataFrame({
-            "Type": ["Loan Approval", "KYC Verification", "Fraud Check"],
-            "Count": [random.randint(50, 200) for _ in range(3)]
-        })
-        st.bar_chart(pending_apps_data.set_index("Type"))
-
-    elif role == "Contributor":
-        st.subheader("Contributor Dashboard")
-        # Graph: Investments in Different Sectors
-        st.write("### Investments in Different Sectors")
-        investment_data = pd.DataFrame({
-            "Sector": ["Agriculture", "Retail", "Technology", "Healthcare"],
-            "Amount Invested (₹)": [random.randint(100000, 500000) for _ in range(4)]
-        })
-        st.bar_chart(investment_data.set_index("Sector"))
-
-        # Graph: Monthly Profits
-        st.write("### Monthly Profits")
-        profit_data = pd.DataFrame({
-            "Month": ["Jan", "Feb", "Mar", "Apr"],
-            "Profit (₹)": [random.randint(10000, 50000) for _ in range(4)]
-        })
-        st.line_chart(profit_data.set_index("Month"))
-
-    elif role == "Farmer":
-        st.subheader("Farmer Dashboard")
-        # Graph: Loan Usage Breakdown
-        st.write("### Loan Usage Breakdown")
-        usage_data = pd.DataFrame({
-            "Category": ["Seeds", "Equipment", "Fertilizers", "Labor"],
-            "Amount Used (₹)": [random.randint(10000, 50000) for _ in range(4)]
-        })
-        st.bar_chart(usage_data.set_index("Category"))
-
-        # Graph: Monthly Payments
-        st.write("### Monthly Payments")
-        payment_data = pd.DataFrame({
-            "Month": ["Jan", "Feb", "Mar", "Apr"],
-            "Payment (₹)": [random.randint(5000, 20000) for _ in range(4)]
-        })
-        st.line_chart(payment_data.set_index("Month"))
-
+    user = current_user()
+    role = user.role if user else "Guest"  # Default to 'Guest' if not set
+
+    if role in DASHBOARD_SECTIONS:
+        st.subheader(f"{role} Dashboard")
+        user_id = user.id
+        # Providers are cached and run concurrently, so one slow section
+        # doesn't hold up the others
+        render_sections([
+            (title, CHART_RENDERERS[chart], provider, (user_id, months))
+            for title, chart, provider, months in DASHBOARD_SECTIONS[role]
+        ])
     else:
         st.info("Please log in to view your dashboard.")
+
+    if role == "Admin":
+        review_applications()
+        diagnostics()
+
+
+# Admin-only approval of applications that passed KYC and fraud checks
+def review_applications():
+    from applications import APPROVAL, get_application_pipeline
+    from dashboard_data import issue_loan
+
+    pipeline = get_application_pipeline()
+    with st.expander("📝 Applications Awaiting Approval"):
+        waiting = pipeline.awaiting(REVIEW_PAGE_SIZE)
+        if not waiting:
+            st.info("No applications are awaiting approval.")
+        for application in waiting:
+            details, approve, decline = st.columns([4, 1, 1])
+            details.write(
+                f"**#{application['id']}** {application['name']} · ₹{application['amount']:,.0f} "
+                f"over {application['months']} months"
+            )
+            if approve.button("Approve", key=f"approve_{application['id']}"):
+                # None if another Admin decided it first
+                if pipeline.decide(application["id"], True) is not None:
+                    issue_loan(application)
+                st.rerun()
+            if decline.button("Decline", key=f"decline_{application['id']}"):
+                pipeline.decide(application["id"], False)
+                st.rerun()
+        waiting_count = pipeline.pending()[APPROVAL]
+        if waiting_count > len(waiting):
+            st.caption(f"Showing the oldest {len(waiting)} of {waiting_count:,}.")
+
+
+# Admin-only timing and session memory view
+def diagnostics():
+    with st.expander("🩺 Diagnostics"):
+        state_bytes, cached_bytes = session_footprint()
+        registry = get_session_registry()
+        st.caption(
+            f"This session: {state_bytes / 1024:,.1f} KiB in session state, {cached_bytes / 1024:,.1f} KiB cached. "
+            f"All sessions: {registry.total / 2**20:,.1f} of {registry.budget / 2**20:,.0f} MiB cached over "
+            f"{len(registry):,} sessions, {registry.evictions:,} evicted."
+        )
+        if not INSTRUMENTATION_ENABLED:
+            st.info("Instrumentation is off. Start the app with HARVEST_INSTRUMENT=1 to record timings.")
+            return
+        st.dataframe(REGISTRY.snapshot())
+        st.download_button("Download Prometheus metrics", REGISTRY.render_prometheus(), file_name="metrics.prom")
 # Analytics Page
+@timed("page.analytics")
 def analytics():
+    from analytics_engine import TIME_WINDOWS
+    from dashboard_data import transaction_rollup
+
     st.title("Analytics Dashboard")
-    time_period = st.selectbox("Select Time Period", ["Last 7 Days", "Last 30 Days", "Last 90 Days"])
+    time_period = st.selectbox("Select Time Period", list(TIME_WINDOWS))
+    summary = transaction_rollup().summary(TIME_WINDOWS[time_period])
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Transaction Analytics")
-        st.write("• Transaction success rates")
+        st.write(f"• Transaction success rate: {summary['success_rate']:.1%}")
         st.write("• Usage patterns by merchant category")
         st.write("• Card activation trends")
-        chart_data = pd.DataFrame({
-            'Category': ['Shopping', 'Travel', 'Food', 'Bills'],
-            'Amount': [45000, 30000, 25000, 20000]
-        })
-        st.bar_chart(chart_data.set_index('Category'))
+        st.bar_chart(summary["by_category"])
     with col2:
         st.subheader("Customer Insights")
         st.write("• Spending behavior analysis")
         st.write("• Customer segmentation")
         st.write("• Risk assessment metrics")
-        st.metric("Average Transaction Value", "₹15,000", "+12%")
-        st.metric("Active Users", "25,000", "+5%")
+        st.metric("Average Transaction Value", f"₹{summary['average']:,.0f}", format_change(summary["average_change"]))
+        st.metric("Transactions", f"{summary['transactions']:,}", format_change(summary["transactions_change"]))
+
+
+def format_change(change):
+    return None if change is None else f"{change:+.0%}"
 
 # Contact Page
+@timed("page.contact")
 def contact():
     # Background color for the page
     st.markdown(
@@ -500,26 +601,33 @@ def contact():
             message = st.text_area("Message", placeholder="Write your message here...")
             submitted = st.form_submit_button("Submit", help="Click to send your message")
             if submitted:
-                st.success("✅ Thank you for your message. We'll get back to you soon!")
+                if not (name.strip() and email.strip() and message.strip()):
+                    st.error("Please fill in your name, email and message.")
+                else:
+                    # Returns once the message is committed to the queue
+                    user = current_user()
+                    future = get_contact_queue().submit(
+                        name.strip(), email.strip(), message.strip(), user.id if user else None
+                    )
+                    try:
+                        future.result(SUBMIT_TIMEOUT)
+                    except Exception:
+                        st.error("We couldn't send your message right now. Please try again.")
+                    else:
+                        st.success("✅ Thank you for your message. We'll get back to you soon!")
         st.markdown('</div>', unsafe_allow_html=True)
 
     st.markdown('</div>', unsafe_allow_html=True)
 
 
 # Main Function
-import os
-
 def main():
-    if 'page' not in st.session_state:
-        st.session_state.page = 'login'
-    
+    touch_session()
+    restore_session()
     page = create_sidebar()
     
-    # Define the image path
-    image_path = "crop_image.jpg"
-    
     # If not logged in, show the login page with the image
-    if not st.session_state.get('logged_in', False):
+    if current_user() is None:
         st.markdown("""
             <div style="text-align:center; margin-top:50px;">
                 <h1>Welcome to Harvest Pay Credit System</h1>
@@ -527,10 +635,14 @@ def main():
         """, unsafe_allow_html=True)
 
         # Display image
-        if os.path.exists(image_path):
-            st.image(image_path, caption="Secure Credit Card Services", use_container_width=True)
-        else:
-            st.error("Image not found. Please check the file path.")
+        try:
+            landing_image = asset_bytes("landing")
+            if landing_image:
+                st.image(landing_image, caption="Secure Credit Card Services", use_container_width=True)
+            else:
+                st.error("Image not found. Please check the file path.")
+        except Exception:
+            st.error("Image could not be loaded.")
     elif page == "home":
         home()
     elif page == "about":
@@ -547,6 +659,8 @@ def main():
     else:
         st.error("Page not found.")
 
+    REGISTRY.maybe_export()
+
 # Run the application
 if __name__ == "__main__":
     main()
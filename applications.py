@@ -0,0 +1,252 @@
+import itertools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import streamlit as st
+
+from credit_scoring import RISK_BANDS, to_aadhaar_array
+from data_loader import load_aadhaar_index, load_score_table
+from kyc import KYC_REASONS
+from loans import MAX_PRINCIPAL, MAX_TERM, MIN_PRINCIPAL
+
+KYC = "KYC Verification"
+FRAUD = "Fraud Check"
+APPROVAL = "Loan Approval"
+# Pending-application types in the order the Admin dashboard shows them
+PENDING_TYPES = [APPROVAL, KYC, FRAUD]
+
+APPLICATION_WORKERS = int(os.environ.get("HARVEST_APPLICATION_WORKERS", "2"))  # threads per check stage
+BATCH_SIZE = 1024  # applications checked in one pass
+SUBMIT_TIMEOUT = 10.0
+# A second application from the same Aadhaar number within this many
+# seconds is held back as a possible duplicate
+REPEAT_WINDOW = 24 * 3600
+
+# Largest loan per borrower risk band; applicants without land records are
+# treated as High risk
+BAND_LIMITS = {"Low": MAX_PRINCIPAL, "Moderate": 150_000, "High": 50_000}
+
+# Reasons the fraud check holds an application back, in the order they
+# are checked
+FRAUD_REASONS = {
+    "amount_out_of_range": f"Amount must be between ₹{MIN_PRINCIPAL:,} and ₹{MAX_PRINCIPAL:,}",
+    "term_out_of_range": f"Term must be between 1 and {MAX_TERM} months",
+    "over_band_limit": "Amount is above the limit for the applicant's credit risk",
+    "repeat_aadhaar": "Another application with this Aadhaar number was made recently",
+}
+REASONS = {**KYC_REASONS, **FRAUD_REASONS}
+
+_STOP = object()
+
+
+def first_reasons(codes, reasons):
+    # Reason key per application from an index into `reasons` (-1: none)
+    keys = np.array([None, *reasons], dtype=object)
+    return keys[np.asarray(codes) + 1]
+
+
+class RecentApplications:
+    # Aadhaar numbers seen within the last `window` seconds, as sorted
+    # arrays so a batch is checked with one searchsorted
+    def __init__(self, window=REPEAT_WINDOW):
+        self.window = window
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.seen = np.zeros(0, dtype=np.float64)
+        self._lock = threading.Lock()
+
+    def add(self, ids, now, eligible=None):
+        # Marks each eligible id seen at `now`; True where it was already
+        # seen within the window, including earlier in the same batch.
+        # Ineligible ids (rejected for another reason) are neither checked
+        # nor recorded, so a corrected retry isn't held back as a repeat.
+        if eligible is not None:
+            repeat = np.zeros(len(ids), dtype=bool)
+            repeat[eligible] = self.add(ids[eligible], now)
+            return repeat
+        unique, first = np.unique(ids, return_index=True)
+        repeat = np.ones(len(ids), dtype=bool)
+        repeat[first] = False
+        with self._lock:
+            live = self.seen >= now - self.window
+            if not live.all():
+                self.keys, self.seen = self.keys[live], self.seen[live]
+            positions = np.searchsorted(self.keys, unique)
+            exists = positions < len(self.keys)
+            exists[exists] = self.keys[positions[exists]] == unique[exists]
+            repeat[first[exists]] = True
+            self.seen[positions[exists]] = now
+            new = ~exists
+            self.keys = np.insert(self.keys, positions[new], unique[new])
+            self.seen = np.insert(self.seen, positions[new], now)
+        return repeat
+
+
+class ApplicationPipeline:
+    # Loan applications go through KYC verification, then fraud checks, then
+    # wait for loan approval. Each check stage has its own queue and
+    # `workers` threads; a worker takes everything queued (up to batch_size)
+    # and checks it in one vectorized pass, so a burst costs a few batch
+    # passes rather than one lookup per application.
+    #
+    # The Aadhaar index and score table come from aadhaar_loader and
+    # score_loader, called once per batch, so the checks follow data files
+    # and land change files that arrive while the pipeline runs.
+    #
+    # submit() returns a Future that resolves once the application is held
+    # back by a check or reaches loan approval. Pending counts per stage are
+    # kept as running totals, so pending() is O(1).
+    def __init__(self, aadhaar_loader=load_aadhaar_index, score_loader=load_score_table, workers=APPLICATION_WORKERS,
+                 batch_size=BATCH_SIZE, repeat_window=REPEAT_WINDOW):
+        self.aadhaar_loader = aadhaar_loader
+        self.score_loader = score_loader
+        self.batch_size = batch_size
+        self.recent = RecentApplications(repeat_window)
+        self.awaiting_approval = {}
+        self.outcomes = {"Rejected": 0, "Approved": 0, "Declined": 0}
+        self._pending = dict.fromkeys(PENDING_TYPES, 0)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._queues = {KYC: queue.SimpleQueue(), FRAUD: queue.SimpleQueue()}
+        self._workers = {
+            stage: [
+                threading.Thread(
+                    target=self._work, args=(stage, check, next_stage),
+                    name=f"harvest-{stage.split()[0].lower()}-{i}", daemon=True,
+                )
+                for i in range(workers)
+            ]
+            for stage, check, next_stage in ((KYC, self._kyc, FRAUD), (FRAUD, self._fraud, APPROVAL))
+        }
+        for threads in self._workers.values():
+            for thread in threads:
+                thread.start()
+
+    def submit(self, aadhaar_number, name, age, address, amount, months, user_id=None):
+        # Raises ValueError for an age, amount or term that isn't a number
+        application = {
+            "id": next(self._ids),
+            "aadhaar_number": str(aadhaar_number).strip(),
+            "name": str(name),
+            "age": int(age),
+            "address": str(address),
+            "amount": float(amount),
+            "months": int(months),
+            "user_id": user_id,
+            "submitted_at": time.time(),
+        }
+        future = Future()
+        with self._lock:
+            self._pending[KYC] += 1
+        self._queues[KYC].put((application, future))
+        return future
+
+    def pending(self):
+        # Applications waiting at each stage, in PENDING_TYPES order
+        with self._lock:
+            return dict(self._pending)
+
+    def awaiting(self, limit=None):
+        # Applications awaiting approval, oldest first
+        with self._lock:
+            return list(itertools.islice(self.awaiting_approval.values(), limit))
+
+    def decide(self, application_id, approved):
+        # Loan approval for an application that passed both checks; returns
+        # the application, or None if it isn't awaiting approval
+        with self._lock:
+            application = self.awaiting_approval.pop(application_id, None)
+            if application is not None:
+                self._pending[APPROVAL] -= 1
+                self.outcomes["Approved" if approved else "Declined"] += 1
+        return application
+
+    def _kyc(self, applications):
+        codes = self.aadhaar_loader().verify(
+            [application["aadhaar_number"] for application in applications],
+            [application["name"] for application in applications],
+            [application["age"] for application in applications],
+            [application["address"] for application in applications],
+        )
+        return first_reasons(codes, KYC_REASONS)
+
+    def _fraud(self, applications):
+        ids = to_aadhaar_array([application["aadhaar_number"] for application in applications])
+        amount = np.array([application["amount"] for application in applications])
+        months = np.array([application["months"] for application in applications])
+        found, _, risk = self.score_loader().scores(ids)
+        limit = np.array([BAND_LIMITS[band] for band in RISK_BANDS])[np.where(found, risk, len(RISK_BANDS) - 1)]
+        checks = [
+            (amount < MIN_PRINCIPAL) | (amount > MAX_PRINCIPAL),
+            (months < 1) | (months > MAX_TERM),
+            amount > limit,
+        ]
+        # Only applications passing every other check count as made
+        checks.append(self.recent.add(ids, time.time(), ~np.logical_or.reduce(checks)))
+        codes = np.full(len(ids), -1, dtype=np.int8)
+        # Checked last to first, so the earliest failing check is kept
+        for code in range(len(checks) - 1, -1, -1):
+            codes[checks[code]] = code
+        return first_reasons(codes, FRAUD_REASONS)
+
+    def _work(self, stage, check, next_stage):
+        pending = self._queues[stage]
+        stopping = False
+        while not stopping:
+            batch = []
+            item = pending.get()
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    break
+            stopping = item is _STOP
+            if batch:
+                self._advance(stage, check, next_stage, batch)
+
+    def _advance(self, stage, check, next_stage, batch):
+        applications = [application for application, _ in batch]
+        try:
+            reasons = check(applications)
+        except Exception as exc:
+            with self._lock:
+                self._pending[stage] -= len(batch)
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        passed = [item for item, reason in zip(batch, reasons) if reason is None]
+        with self._lock:
+            self._pending[stage] -= len(batch)
+            self._pending[next_stage] += len(passed)
+            self.outcomes["Rejected"] += len(batch) - len(passed)
+            if next_stage == APPROVAL:
+                for application, _ in passed:
+                    self.awaiting_approval[application["id"]] = application
+        for (application, future), reason in zip(batch, reasons):
+            if reason is not None:
+                future.set_result({"id": application["id"], "status": "Rejected", "stage": stage, "reason": reason})
+            elif next_stage == APPROVAL:
+                future.set_result({"id": application["id"], "status": APPROVAL, "stage": APPROVAL, "reason": None})
+            else:
+                self._queues[next_stage].put((application, future))
+
+    def close(self):
+        # Finishes everything already submitted; applications awaiting
+        # approval are kept
+        for stage in (KYC, FRAUD):
+            for _ in self._workers[stage]:
+                self._queues[stage].put(_STOP)
+            for thread in self._workers[stage]:
+                thread.join()
+
+
+# One pipeline (and its worker threads) per process, shared by every session
+@st.cache_resource(show_spinner=False)
+def get_application_pipeline(workers=APPLICATION_WORKERS):
+    return ApplicationPipeline(load_aadhaar_index, load_score_table, workers)
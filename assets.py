@@ -0,0 +1,62 @@
+import io
+import os
+
+import streamlit as st
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (source file, width in px). Widths are 2x the rendered width so
+# images stay sharp on high-DPI screens; smaller sources are never upscaled.
+ASSET_VARIANTS = {
+    "sidebar": ("credit.jpg", 672),
+    "landing": ("crop_image.jpg", 1200),
+}
+
+# st.image serves JPEG/PNG/GIF bytes as-is and transcodes anything else to
+# JPEG on every call, so the app uses JPEG variants. WebP variants are
+# produced for callers that serve bytes directly.
+ASSET_FORMAT = "JPEG"
+ENCODE_OPTIONS = {
+    "JPEG": {"quality": 82, "optimize": True, "progressive": True},
+    "WEBP": {"quality": 80, "method": 6},
+}
+
+
+# Decoded once per process
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _decoded(path, version):
+    # Pillow is only needed to build a variant, not to serve a cached one
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return image.convert("RGB")
+
+
+# Encoded bytes per (image, width, format), shared by every session
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _encoded(path, version, width, fmt):
+    from PIL import Image
+
+    image = _decoded(path, version)
+    if image.width > width:
+        image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **ENCODE_OPTIONS[fmt])
+    return buffer.getvalue()
+
+
+def asset_bytes(name, fmt=ASSET_FORMAT):
+    # Encoded variant of a named asset, or None if its source file is
+    # missing. When a variant can't be built (no Pillow, or a file Pillow
+    # can't read) the source file's bytes are served as they are.
+    filename, width = ASSET_VARIANTS[name]
+    path = os.path.join(ASSET_DIR, filename)
+    try:
+        version = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    try:
+        return _encoded(path, version, width, fmt)
+    except (ImportError, OSError, ValueError):
+        with open(path, "rb") as f:
+            return f.read()
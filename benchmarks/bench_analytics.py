@@ -0,0 +1,60 @@
+# Ingest rate and window-query latency of the daily analytics rollup,
+# compared with scanning the raw transaction log per query.
+#
+#   python benchmarks/bench_analytics.py --transactions 100000000
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from analytics_engine import MERCHANT_CATEGORIES, TIME_WINDOWS, DailyRollup, generate_transactions, today
+
+
+def scan_window(day, category, amount, days, end_day):
+    # What answering a window query from the raw log costs
+    mask = (day > end_day - days) & (day <= end_day)
+    return np.bincount(category[mask], weights=amount[mask], minlength=len(MERCHANT_CATEGORIES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analytics rollup benchmark")
+    parser.add_argument("--transactions", type=int, default=100_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--chunk-size", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    end_day = today()
+    rollup = DailyRollup(end_day - args.days + 1)
+    ingest_s = 0.0
+    first_chunk = None
+    for chunk in generate_transactions(args.transactions, args.days, end_day, args.chunk_size):
+        start = time.perf_counter()
+        rollup.append(*chunk)
+        ingest_s += time.perf_counter() - start
+        if first_chunk is None:
+            first_chunk = chunk
+            check = DailyRollup(rollup.first_day)
+            check.append(*chunk)
+    print(f"ingest: {rollup.transactions:,} transactions in {ingest_s:.2f}s "
+          f"({rollup.transactions / ingest_s:,.0f}/s, appended in {args.chunk_size:,}-row batches)")
+
+    day, category, amount, _ = first_chunk
+    scale = rollup.transactions / len(day)
+    for label, days in TIME_WINDOWS.items():
+        np.testing.assert_allclose(check.window(days, end_day)[0], scan_window(day, category, amount, days, end_day))
+        start = time.perf_counter()
+        for _ in range(1000):
+            rollup.window(days, end_day)
+        rollup_us = (time.perf_counter() - start) / 1000 * 1e6
+        start = time.perf_counter()
+        scan_window(day, category, amount, days, end_day)
+        scan_s = (time.perf_counter() - start) * scale
+        print(f"{label:<13} rollup {rollup_us:8.1f} us | raw scan ~{scan_s:7.2f} s at {rollup.transactions:,} transactions")
+
+
+if __name__ == "__main__":
+    main()
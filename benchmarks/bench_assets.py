@@ -0,0 +1,76 @@
+# Image bytes handed to the browser and st.image render time per rerun:
+# raw JPEG paths (old behaviour) vs pre-resized cached asset variants.
+#
+#   python benchmarks/bench_assets.py --reruns 50
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from streamlit.elements.lib import image_utils
+from streamlit.testing.v1 import AppTest
+
+from assets import ASSET_VARIANTS, asset_bytes
+
+PAGES = {
+    "raw files": f"""
+import os
+import streamlit as st
+os.chdir({ROOT!r})
+st.image("credit.jpg", caption="Harvest Pay")
+st.image("crop_image.jpg", caption="Secure Credit Card Services", use_container_width=True)
+""",
+    "asset variants": f"""
+import sys
+sys.path.insert(0, {ROOT!r})
+import streamlit as st
+from assets import asset_bytes
+st.image(asset_bytes("sidebar"), caption="Harvest Pay")
+st.image(asset_bytes("landing"), caption="Secure Credit Card Services", use_container_width=True)
+""",
+}
+
+SENT = []
+_ensure = image_utils._ensure_image_size_and_format
+
+
+def _recording_ensure(image_data, layout_config, image_format):
+    # Bytes Streamlit registers with its media manager for each image
+    data = _ensure(image_data, layout_config, image_format)
+    SENT.append(len(data))
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Image asset pipeline benchmark")
+    parser.add_argument("--reruns", type=int, default=50)
+    args = parser.parse_args()
+    image_utils._ensure_image_size_and_format = _recording_ensure
+
+    for name, (filename, width) in ASSET_VARIANTS.items():
+        original = os.path.getsize(os.path.join(ROOT, filename))
+        print(f"{name:<8} {filename:<15} original {original / 1024:6.1f} KiB | "
+              f"JPEG {len(asset_bytes(name, 'JPEG')) / 1024:6.1f} KiB | "
+              f"WebP {len(asset_bytes(name, 'WEBP')) / 1024:6.1f} KiB (width <= {width}px)")
+
+    for label, script in PAGES.items():
+        at = AppTest.from_string(script, default_timeout=30)
+        at.run()
+        timings = []
+        SENT.clear()
+        for _ in range(args.reruns):
+            start = time.perf_counter()
+            at.run()
+            timings.append(time.perf_counter() - start)
+            assert not at.exception, at.exception
+        per_rerun = sum(SENT) / args.reruns
+        print(f"{label:<15} {per_rerun / 1024:7.1f} KiB of image data per rerun | "
+              f"median rerun {statistics.median(timings) * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
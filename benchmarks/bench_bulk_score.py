@@ -0,0 +1,96 @@
+# Rows/sec and peak RSS of the bulk scoring CLI, plus a check that its
+# output matches calculate_credit_score row by row.
+#
+#   python benchmarks/bench_bulk_score.py --rows 50000000 --workers 0 4
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_land_data
+
+
+def write_input(path, land_ids, rows, chunk=5_000_000):
+    # Mostly known applicants, some unknown and a few malformed IDs,
+    # including known ones written as floats the way spreadsheets export them
+    rng = np.random.default_rng(3)
+    header = True
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        numbers = rng.choice(land_ids, n)
+        ids = numbers.astype(str).astype(object)
+        unknown = rng.random(n) < 0.1
+        ids[unknown] = rng.integers(10**11, 10**12, unknown.sum()).astype(str)
+        ids[rng.random(n) < 0.001] = "not-a-number"
+        as_float = rng.random(n) < 0.001
+        ids[as_float] = [f"{number}.0" for number in numbers[as_float]]
+        as_exponent = rng.random(n) < 0.001
+        ids[as_exponent] = [f"{number:.11e}" for number in numbers[as_exponent]]
+        pd.DataFrame({"aadhaar_number": ids}).to_csv(path, mode="w" if header else "a", header=header, index=False)
+        header = False
+
+
+def verify(input_path, output_path, land_path, sample):
+    from bulk_score import open_land
+    from credit_scoring import calculate_credit_score, get_risk_level
+
+    land = open_land(land_path)
+    inputs = pd.read_csv(input_path, dtype=str, nrows=sample)["aadhaar_number"]
+    if output_path.endswith(".parquet"):
+        outputs = pd.read_parquet(output_path).head(sample)
+    else:
+        outputs = pd.read_csv(output_path, dtype={"aadhaar_number": str}, nrows=sample)
+    for aadhaar, row in zip(inputs, outputs.itertuples()):
+        score, risk = calculate_credit_score(aadhaar, land)
+        got_score = None if pd.isna(row.score) else int(row.score)
+        got_risk = None if pd.isna(row.risk) else row.risk
+        expected = (None if score is None else int(score), risk, get_risk_level(risk))
+        assert row.aadhaar_number == aadhaar, (row.aadhaar_number, aadhaar)
+        assert (got_score, got_risk, row.risk_level) == expected, (aadhaar, row, expected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk scoring CLI benchmark")
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--land-rows", type=int, default=10_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4])
+    parser.add_argument("--format", choices=["csv", "parquet"], default="parquet")
+    parser.add_argument("--verify", type=int, default=20_000, help="Rows to check against the per-row function")
+    args = parser.parse_args()
+
+    from land_registry import convert_csv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        land_csv = os.path.join(tmp, "land_records.csv")
+        land = make_land_data(args.land_rows)
+        land.to_csv(land_csv, index=False)
+        registry = os.path.join(tmp, "land_registry")
+        convert_csv(land_csv, registry)
+        input_path = os.path.join(tmp, "applicants.csv")
+        write_input(input_path, land["aadhaar_number"].to_numpy(), args.rows)
+        del land
+
+        for workers in args.workers:
+            output_path = os.path.join(tmp, f"scores_{workers}.{args.format}")
+            start = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, os.path.join(ROOT, "bulk_score.py"), input_path, output_path,
+                 "--land", registry, "--workers", str(workers)],
+                check=True, capture_output=True, text=True, cwd=ROOT,
+            )
+            elapsed = time.perf_counter() - start
+            print(f"workers={workers}: {proc.stderr.strip().splitlines()[-1]} (wall incl. startup {elapsed:.1f}s)")
+            verify(input_path, output_path, registry, args.verify)
+        print(f"Output matches calculate_credit_score on the first {args.verify:,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Sustained contact form submissions/sec and the latency a user waits on
+# submit, for the group-commit queue and for one fsynced commit per
+# submission.
+#
+#   python benchmarks/bench_contact_queue.py --clients 1 16 64 --duration 10
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from contact_queue import INSERT_MESSAGE, SCHEMA, ContactQueue
+
+
+class CommitPerSubmission:
+    # Baseline: each submission is its own fsynced transaction on a shared
+    # connection, so concurrent submitters queue behind each other's fsync
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def submit(self, name, email, message, user_id=None):
+        with self.lock, self.conn:
+            self.conn.execute(INSERT_MESSAGE, (name, email, message, user_id, time.time()))
+
+    def close(self):
+        self.conn.close()
+
+
+def run(store, clients, duration, group_commit):
+    latencies = [[] for _ in range(clients)]
+    stop = time.monotonic() + duration
+
+    def client(i):
+        own = latencies[i]
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            result = store.submit(f"Farmer {i}", f"farmer{i}@example.com", "Please call me about my loan.", i)
+            if group_commit:
+                result.result()
+            own.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.concatenate([np.array(own) for own in latencies]), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contact queue benchmark")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--dir", default=None, help="Directory for the databases (default: a temp dir)")
+    args = parser.parse_args()
+
+    for clients in args.clients:
+        for label, group_commit in [("commit per submission", False), ("group commit", True)]:
+            with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+                path = os.path.join(tmp, "harvest.db")
+                processed = []
+                if group_commit:
+                    store = ContactQueue(path, handler=lambda messages: processed.extend(m["id"] for m in messages))
+                else:
+                    store = CommitPerSubmission(path)
+                latencies, elapsed = run(store, clients, args.duration, group_commit)
+                store.close()
+                p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+                extra = ""
+                if group_commit:
+                    # Everything acknowledged reached the drainer, once
+                    assert sorted(processed) == list(range(1, len(latencies) + 1))
+                    extra = f", drained {len(processed):,}"
+                print(f"{clients:3d} clients, {label:22s}: {len(latencies) / elapsed:8,.0f} submissions/s, "
+                      f"p50 {p50:.2f} ms, p99 {p99:.2f} ms{extra}")
+
+
+if __name__ == "__main__":
+    main()
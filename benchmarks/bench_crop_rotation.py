@@ -0,0 +1,44 @@
+# Nightly-batch throughput of the crop rotation recommender.
+#
+#   python benchmarks/bench_crop_rotation.py --plots 10000000
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from crop_rotation import CROPS, SOIL_TYPES, recommend_batch, recommend_next_crop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crop rotation batch benchmark")
+    parser.add_argument("--plots", type=int, default=10_000_000)
+    parser.add_argument("--single", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.plots
+    last_crops = np.array(CROPS, dtype=object)[rng.integers(0, len(CROPS), n)]
+    soils = np.array(SOIL_TYPES, dtype=object)[rng.integers(0, len(SOIL_TYPES), n)]
+    irrigated = rng.random(n) < 0.6
+    organic_matter = rng.integers(1, 101, n)
+
+    start = time.perf_counter()
+    result = recommend_batch(last_crops, soils, irrigated, organic_matter)
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(args.single):
+        expected = recommend_next_crop(last_crops[i], soils[i], "Yes" if irrigated[i] else "No", organic_matter[i])
+        assert expected == result[i]
+    single_s = (time.perf_counter() - start) / args.single
+
+    print(f"batch: {n:,} plots in {batch_s:.2f}s ({n / batch_s:,.0f} plots/s)")
+    print(f"single: {single_s * 1e6:.1f} us/plot ({n * single_s:,.0f}s projected for {n:,} plots)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Load time and memory of the land registry: default read_csv vs the compact
+# loader, its Parquet sidecar and the process-wide cache.
+#
+#   python benchmarks/bench_data_loader.py --rows 5000000
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.synthetic import make_land_data
+from data_loader import load_land_records, read_dataset, sidecar_path
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    frame = fn()
+    elapsed = time.perf_counter() - start
+    mb = frame.memory_usage(deep=True).sum() / 2**20
+    print(f"{label:<32} {elapsed:8.3f}s {mb:10.1f} MiB")
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Land registry loader benchmark")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "land_records.csv")
+        make_land_data(args.rows).to_csv(path, index=False)
+        print(f"{args.rows:,} rows, CSV {os.path.getsize(path) / 2**20:.1f} MiB")
+
+        timed("pd.read_csv (default dtypes)", lambda: pd.read_csv(path))
+        timed("read_dataset (compact dtypes)", lambda: read_dataset(path, "land_records"))
+        timed("read_dataset + write sidecar", lambda: read_dataset(path, "land_records", sidecar=True))
+        print(f"{'':<32} sidecar {os.path.getsize(sidecar_path(path)) / 2**20:.1f} MiB")
+        timed("read_dataset (from sidecar)", lambda: read_dataset(path, "land_records"))
+        timed("load_land_records (first call)", lambda: load_land_records(path))
+        timed("load_land_records (cached)", lambda: load_land_records(path))
+
+
+if __name__ == "__main__":
+    main()
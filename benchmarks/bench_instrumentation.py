@@ -0,0 +1,54 @@
+# Per-call overhead of the instrumentation hooks, disabled and enabled.
+# track() follows HARVEST_INSTRUMENT; run once with and once without it.
+#
+#   python benchmarks/bench_instrumentation.py --calls 1000000
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from instrumentation import Registry, timed, track
+
+
+def work(x):
+    return x + 1
+
+
+def per_call(func, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instrumentation overhead benchmark")
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    registry = Registry()
+
+    def tracked(x):
+        with track("bench.track", registry=registry):
+            return x + 1
+
+    variants = [
+        ("raw call", work),
+        ("@timed disabled", timed("bench.off", enabled=False, registry=registry)(work)),
+        ("track() env", tracked),
+        ("@timed enabled", timed("bench.on", enabled=True, registry=registry)(work)),
+    ]
+    baseline = None
+    for label, func in variants:
+        seconds = per_call(func, args.calls)
+        baseline = seconds if baseline is None else baseline
+        print(f"{label:16s} {seconds * 1e9:8.0f} ns/call  (+{(seconds - baseline) * 1e9:.0f} ns)")
+
+    for row in registry.snapshot():
+        print(f"{row['name']}: {row['calls']:,} calls, p50 {row['p50_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Resident memory and lookup latency: memory-mapped land registry vs the
+# in-memory DataFrame index. Each path runs in a fresh subprocess so RSS
+# numbers are not polluted by the other.
+#
+#   python benchmarks/bench_land_registry.py --rows 10000000
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.synthetic import make_land_data
+
+
+def rss_mib():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def measure(mode, csv_path, registry_dir, n_single, n_batch):
+    from credit_scoring import build_land_index, calculate_credit_score, score_batch
+
+    base_rss = rss_mib()
+    start = time.perf_counter()
+    if mode == "memory":
+        from data_loader import read_dataset
+        land = build_land_index(read_dataset(csv_path, "land_records"))
+    else:
+        from land_registry import open_registry
+        land = open_registry(registry_dir)
+    open_s = time.perf_counter() - start
+    open_rss = rss_mib() - base_rss
+
+    rng = np.random.default_rng(7)
+    queries = np.asarray(land.keys[rng.integers(0, len(land), n_single + n_batch)])
+    latencies = np.empty(n_single)
+    for i, aadhaar in enumerate(queries[:n_single]):
+        start = time.perf_counter()
+        calculate_credit_score(aadhaar, land)
+        latencies[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    score_batch(queries[n_single:], land)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "open_s": open_s,
+        "rss_after_open_mib": open_rss,
+        "rss_after_lookups_mib": rss_mib() - base_rss,
+        "p50_us": np.percentile(latencies, 50) * 1e6,
+        "p99_us": np.percentile(latencies, 99) * 1e6,
+        "batch_lookups_per_s": n_batch / batch_s,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory-mapped land registry benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--single", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=100_000)
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "CSV", "REGISTRY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child, args.single, args.batch)))
+        return
+
+    from land_registry import convert_csv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "land_records.csv")
+        registry_dir = os.path.join(tmp, "land_registry")
+        make_land_data(args.rows).to_csv(csv_path, index=False)
+        start = time.perf_counter()
+        convert_csv(csv_path, registry_dir)
+        print(f"{args.rows:,} rows, converted in {time.perf_counter() - start:.1f}s")
+
+        for mode in ("memory", "mmap"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, csv_path, registry_dir,
+                 "--single", str(args.single), "--batch", str(args.batch)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(
+                f"{r['mode']:<7} open {r['open_s']:6.2f}s | RSS open {r['rss_after_open_mib']:7.1f} MiB, "
+                f"after lookups {r['rss_after_lookups_mib']:7.1f} MiB | single p50 {r['p50_us']:6.1f}us "
+                f"p99 {r['p99_us']:6.1f}us | batch {r['batch_lookups_per_s']:>11,.0f}/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# Load test of one app.py process: scripted sessions (log in through the
+# sidebar, visit all six pages, move the crop advisor slider, send the
+# contact form) run concurrently under Streamlit's AppTest harness, at each
+# concurrency level in turn. Sessions share the process and its caches, as
+# they do under `streamlit run`.
+#
+# AppTest installs a process-wide runtime for each rerun, so reruns from
+# different sessions can't overlap here; they queue on a lock instead.
+# Each step reports its rerun time and its latency (queueing included),
+# which is what a user waits on a worker whose reruns are GIL-bound.
+#
+# Reports percentiles per step and resident memory per session as JSON;
+# pass an earlier report as --baseline to compare runs.
+#
+#   python benchmarks/bench_load.py --concurrency 1 2 4 8 16 --output load.json
+#   python benchmarks/bench_load.py --baseline load.json
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP = os.path.join(ROOT, "app.py")
+sys.path.insert(0, ROOT)
+
+from session_manager import USER_KEY
+
+PAGES = ["Home", "About", "Features", "Dashboard", "Analytics", "Contact"]
+ROLES = ["Farmer", "Contributor", "Admin"]
+SLIDER_VALUES = [20, 65, 90]
+PERCENTILES = [50, 90, 99]
+
+_rerun_lock = threading.Lock()
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak rather than current outside Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def widget(elements, label):
+    return next(element for element in elements if element.label == label)
+
+
+class Session:
+    # One scripted visit. Each step is recorded as (step, latency, rerun
+    # seconds); the AppTest is kept so its state stays resident until the
+    # level is measured.
+    def __init__(self, name, role, timeout, think):
+        self.name = name
+        self.role = role
+        self.think = think
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.timings = []
+        self.errors = []
+
+    def step(self, name, action):
+        start = time.perf_counter()
+        with _rerun_lock:
+            started = time.perf_counter()
+            try:
+                action()
+            except Exception as exc:
+                # A missing widget or a timed-out rerun; the rest of the
+                # visit still runs
+                self.errors.append(f"{name}: {exc!r}")
+                return
+            finished = time.perf_counter()
+        self.timings.append((name, finished - start, finished - started))
+        if self.at.exception:
+            self.errors.append(f"{name}: {self.at.exception[0].message}")
+        if self.think:
+            time.sleep(self.think)
+
+    def navigate(self, page):
+        self.step(f"page:{page}", lambda: self.at.sidebar.radio[0].set_value(page).run())
+
+    def run(self):
+        at = self.at
+        self.step("landing", at.run)
+
+        def login():
+            at.selectbox(key="login_role").set_value(self.role)
+            at.text_input(key="login_username").input(self.name)
+            at.text_input(key="login_password").input("load-test")
+            widget(at.sidebar.button, "Login").click().run()
+        self.step("login", login)
+        if USER_KEY not in at.session_state:
+            self.errors.append("login: not logged in")
+            return self
+
+        for page in PAGES:
+            self.navigate(page)
+            if page == "Home":
+                for value in SLIDER_VALUES:
+                    self.step("home:slider", lambda: widget(at.slider, "Organic Matter Content (%)").set_value(value).run())
+            elif page == "Contact":
+                def submit():
+                    widget(at.text_input, "Name").input(self.name)
+                    widget(at.text_input, "Email").input(f"{self.name}@example.com")
+                    at.text_area[0].input("Load test message")
+                    widget(at.button, "Submit").click().run()
+                self.step("contact:submit", submit)
+        return self
+
+
+def percentiles(seconds):
+    ms = np.asarray(seconds) * 1000
+    summary = {"mean_ms": round(float(ms.mean()), 2)}
+    summary.update({f"p{p}_ms": round(float(np.percentile(ms, p)), 2) for p in PERCENTILES})
+    summary["max_ms"] = round(float(ms.max()), 2)
+    return summary
+
+
+def summarize(timings):
+    # timings: (latency, rerun) seconds per step
+    latency, rerun = zip(*timings)
+    return {"count": len(timings), "latency": percentiles(latency), "rerun": percentiles(rerun)}
+
+
+def run_level(concurrency, sessions, label, timeout, think):
+    from user_store import SELF_REGISTER_ROLES, get_user_store
+
+    gc.collect()
+    rss_before = rss_bytes()
+    visits = [
+        Session(f"load-{label}-{concurrency}-{i}", ROLES[i % len(ROLES)], timeout, think)
+        for i in range(sessions)
+    ]
+    # Admins can't register themselves at login
+    for visit in visits:
+        if visit.role not in SELF_REGISTER_ROLES:
+            get_user_store().create_user(visit.name, "load-test", visit.role)
+    peak = [rss_before]
+
+    def sample():
+        while not done.wait(0.05):
+            peak[0] = max(peak[0], rss_bytes())
+
+    done = threading.Event()
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(Session.run, visits))
+    wall = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    gc.collect()
+    rss_after = rss_bytes()
+
+    by_step = defaultdict(list)
+    for visit in visits:
+        for step, latency, rerun in visit.timings:
+            by_step[step].append((latency, rerun))
+    reruns = sum(len(times) for times in by_step.values())
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "wall_s": round(wall, 3),
+        "reruns_per_s": round(reruns / wall, 2),
+        "steps": {step: summarize(times) for step, times in by_step.items()},
+        "all_steps": summarize([timing for times in by_step.values() for timing in times]),
+        "rss_mib": round(rss_after / 2**20, 1),
+        "peak_rss_mib": round(max(peak[0], rss_after) / 2**20, 1),
+        "rss_per_session_kib": round((rss_after - rss_before) / sessions / 1024, 1),
+        "errors": [error for visit in visits for error in visit.errors],
+    }
+
+
+def print_level(level, out):
+    print(f"concurrency {level['concurrency']:>3}: {level['sessions']} sessions in {level['wall_s']:.1f}s, "
+          f"{level['reruns_per_s']:.1f} reruns/s, {level['rss_per_session_kib']:,.0f} KiB RSS/session, "
+          f"peak {level['peak_rss_mib']:,.0f} MiB, {len(level['errors'])} errors", file=out)
+    for step, stats in level["steps"].items():
+        latency, rerun = stats["latency"], stats["rerun"]
+        print(f"  {step:<16} rerun p50 {rerun['p50_ms']:7.1f} p90 {rerun['p90_ms']:7.1f} ms   latency "
+              f"p50 {latency['p50_ms']:7.1f} p90 {latency['p90_ms']:7.1f} p99 {latency['p99_ms']:7.1f} ms", file=out)
+
+
+def compare(report, baseline, out):
+    # p90 latency change per step at each concurrency level both runs
+    # measured
+    previous = {level["concurrency"]: level for level in baseline["levels"]}
+    for level in report["levels"]:
+        before = previous.get(level["concurrency"])
+        if before is None:
+            continue
+        print(f"vs baseline at concurrency {level['concurrency']}:", file=out)
+        for step, stats in level["steps"].items():
+            if step in before["steps"]:
+                old = before["steps"][step]["latency"]["p90_ms"]
+                new = stats["latency"]["p90_ms"]
+                print(f"  {step:<16} p90 {old:8.1f} -> {new:8.1f} ms ({new / old - 1:+.0%})", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent session load test")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--sessions", type=int, default=None, help="sessions per level (default: 2x concurrency)")
+    parser.add_argument("--think-ms", type=float, default=0, help="pause after every step")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument("--output", default="-", help="JSON report path, - for stdout")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    # Users, sessions and contact messages go to a scratch database and
+    # inbox, never the real ones
+    scratch = tempfile.mkdtemp(prefix="harvest-load-")
+    os.environ["HARVEST_DB_PATH"] = os.path.join(scratch, "harvest.db")
+    os.environ["HARVEST_SUPPORT_INBOX"] = os.path.join(scratch, "support_inbox.jsonl")
+    os.chdir(ROOT)
+    label = format(int(time.time()), "x")
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "cpus": os.cpu_count(),
+        "think_ms": args.think_ms,
+        "levels": [],
+    }
+    try:
+        # Fill the process-wide caches first, so the levels measure
+        # steady-state reruns rather than one-off loads
+        start = time.perf_counter()
+        warmup = run_level(1, len(ROLES), f"{label}w", args.timeout, 0)
+        report["warmup_s"] = round(time.perf_counter() - start, 3)
+        report["warmup_errors"] = warmup["errors"]
+        for concurrency in args.concurrency:
+            level = run_level(concurrency, args.sessions or concurrency * 2, label, args.timeout, args.think_ms / 1000)
+            print_level(level, sys.stderr)
+            report["levels"].append(level)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f), sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Monte Carlo portfolio risk: scenarios x loans per second and peak memory
+# per worker count, plus checks that results don't depend on the worker
+# count and that the simulated expected loss matches the closed form.
+#
+#   python benchmarks/bench_portfolio_risk.py --loans 100000 --simulations 100000 --workers 1 2 4 8
+import argparse
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from credit_scoring import RISK_BANDS
+from loans import generate_loan_book, outstanding, paid_instalments
+from portfolio_risk import CHUNK_CELLS, Portfolio, band_default_probabilities, simulate, summarize
+
+
+def make_portfolio(n, seed=0):
+    # Active loans of a synthetic book, each borrower in a random risk band
+    book = generate_loan_book(n * 3, seed=seed)
+    term = book["months"].to_numpy()
+    paid = paid_instalments(book["start_month"].to_numpy(), term)
+    active = np.flatnonzero(paid < term)[:n]
+    balance, interest = outstanding(
+        book["principal"].to_numpy()[active], book["annual_rate"].to_numpy()[active], term[active], paid[active]
+    )
+    bands = np.random.default_rng(seed).integers(0, len(RISK_BANDS), len(active))
+    return Portfolio(balance, interest, bands)
+
+
+def naive_chunk(portfolio, probability, simulations, rng):
+    # Independent float64 uniform per loan-scenario, compared in one piece
+    defaulted = rng.random((simulations, len(portfolio))) < probability
+    return portfolio.interest - defaulted @ portfolio.loss.astype(np.float64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio risk simulation benchmark")
+    parser.add_argument("--loans", type=int, default=100_000)
+    parser.add_argument("--simulations", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunk-cells", type=int, default=CHUNK_CELLS)
+    args = parser.parse_args()
+
+    portfolio = make_portfolio(args.loans)
+    cells = args.simulations * len(portfolio)
+    print(f"{len(portfolio):,} active loans, ₹{portfolio.exposure:,.0f} outstanding; "
+          f"{args.simulations:,} scenarios ({cells:,} loan-scenarios)")
+
+    # Same seed, same results whatever the worker count
+    check = min(args.simulations, 2_000)
+    reference = simulate(portfolio, check, seed=1, chunk_cells=args.chunk_cells)
+    for workers in args.workers:
+        assert np.array_equal(reference, simulate(portfolio, check, seed=1, workers=workers, chunk_cells=args.chunk_cells))
+
+    results = None
+    for workers in args.workers:
+        tracemalloc.start()
+        start = time.perf_counter()
+        profit = simulate(portfolio, args.simulations, seed=0, workers=workers, chunk_cells=args.chunk_cells)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results = summarize(portfolio, profit)
+        print(f"workers={workers}: {elapsed:.2f}s ({cells / elapsed / 1e6:,.0f}M loan-scenarios/s), "
+              f"peak {peak / 2**20:,.0f} MiB traced in this process")
+
+    probability = np.repeat(band_default_probabilities(), np.diff(portfolio.offsets))
+    naive_sims = max(1, args.chunk_cells // len(portfolio))
+    start = time.perf_counter()
+    naive_chunk(portfolio, probability, naive_sims, np.random.default_rng(0))
+    naive_s = time.perf_counter() - start
+    print(f"float64 draw per loan-scenario: {naive_sims * len(portfolio) / naive_s / 1e6:,.0f}M loan-scenarios/s "
+          f"({cells / (naive_sims * len(portfolio)) * naive_s:,.0f}s projected)")
+
+    analytic = float(portfolio.loss.astype(np.float64) @ probability)
+    print(f"expected profit ₹{results['expected_profit']:,.0f} of ₹{results['interest']:,.0f} interest due")
+    print(f"expected loss ₹{results['expected_loss']:,.0f} (closed form ₹{analytic:,.0f}, "
+          f"{results['expected_loss'] / analytic - 1:+.3%})")
+    for quantile, loss in results["loss_quantiles"].items():
+        print(f"  loss at {quantile:.1%}: ₹{loss:,.0f}")
+    print(f"max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.0f} MiB (this process)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Live statistics aggregates: cost of folding loan batches into the running
+# totals and of reading them, against re-aggregating the whole book, plus
+# a check that the running totals match a full recompute.
+#
+#   python benchmarks/bench_portfolio_stats.py --loans 10000000 --batch 10000
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from loans import generate_loan_book
+from portfolio_stats import PortfolioStats
+
+
+def same_rows(a, b):
+    # Tables may be padded to different lengths; missing rows are zero
+    rows = max(len(a), len(b))
+    a = np.vstack([a, np.zeros((rows - len(a), a.shape[1]))])
+    b = np.vstack([b, np.zeros((rows - len(b), b.shape[1]))])
+    return np.allclose(a, b, rtol=1e-9, atol=1e-3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio aggregates benchmark")
+    parser.add_argument("--loans", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--reads", type=int, default=100_000)
+    args = parser.parse_args()
+
+    book = generate_loan_book(args.loans)
+
+    # Grow the book batch by batch, then retire a batch of loans
+    stats = PortfolioStats()
+    start = time.perf_counter()
+    for offset in range(0, len(book), args.batch):
+        stats.add(book.iloc[offset:offset + args.batch])
+    incremental_s = time.perf_counter() - start
+    retired = book.sample(args.batch, random_state=1)
+    stats.remove(retired)
+
+    start = time.perf_counter()
+    full = PortfolioStats.from_loans(book.drop(retired.index))
+    full_s = time.perf_counter() - start
+
+    assert np.allclose(stats.total, full.total, rtol=1e-9)
+    assert same_rows(stats.by_borrower, full.by_borrower)
+    assert same_rows(stats.by_contributor, full.by_contributor)
+
+    rng = np.random.default_rng(0)
+    users = rng.integers(1, args.loans // 4, args.reads)
+    start = time.perf_counter()
+    for user_id in users:
+        stats.borrower(int(user_id))
+    read_s = (time.perf_counter() - start) / args.reads
+
+    batches = -(-args.loans // args.batch)
+    print(f"incremental: {batches:,} batches of {args.batch:,} in {incremental_s:.2f}s "
+          f"({incremental_s / batches * 1000:.2f} ms per batch)")
+    print(f"full recompute: {args.loans - args.batch:,} loans in {full_s:.2f}s")
+    print(f"read: {read_s * 1e6:.2f} us per user lookup; matches full recompute")
+
+
+if __name__ == "__main__":
+    main()
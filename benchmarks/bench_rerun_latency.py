@@ -0,0 +1,62 @@
+# Rerun latency of the Home and Dashboard pages under Streamlit's AppTest
+# harness, with the data/figure caches cleared before every rerun (the old
+# behaviour) and with warm caches.
+#
+#   python benchmarks/bench_rerun_latency.py --reruns 30
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP = os.path.join(ROOT, "app.py")
+sys.path.insert(0, ROOT)
+
+from session_manager import USER_KEY, SessionUser
+
+
+def logged_in_app(role, page):
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.session_state[USER_KEY] = SessionUser(1, "bench", role, "bench")
+    at.run()
+    at.sidebar.radio[0].set_value(page).run()
+    return at
+
+
+def time_reruns(at, reruns, clear_caches):
+    timings = []
+    for _ in range(reruns):
+        if clear_caches:
+            st.cache_data.clear()
+            st.cache_resource.clear()
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+        assert not at.exception, at.exception
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit rerun latency benchmark")
+    parser.add_argument("--reruns", type=int, default=30)
+    args = parser.parse_args()
+    os.chdir(ROOT)
+
+    for role, page in [("Farmer", "Home"), ("Admin", "Dashboard"), ("Contributor", "Dashboard"), ("Farmer", "Dashboard")]:
+        at = logged_in_app(role, page)
+        results = {}
+        for label, clear in (("uncached", True), ("cached", False)):
+            timings = time_reruns(at, args.reruns, clear)
+            results[label] = statistics.median(timings) * 1000
+        print(
+            f"{role:<11} {page:<9} median rerun: uncached {results['uncached']:7.1f} ms, "
+            f"cached {results['cached']:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
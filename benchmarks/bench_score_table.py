@@ -0,0 +1,91 @@
+# Applying a day's land-record changes to the materialized score table
+# versus rebuilding the index and rescoring every record, with a check
+# that both end in the same table and band totals.
+#
+#   python benchmarks/bench_score_table.py --records 10000000 --changes 100000
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import CROPS, make_aadhaar_numbers, make_land_data
+from credit_scoring import build_land_index, calculate_credit_score, to_aadhaar_array
+from score_table import ScoreTable
+
+
+def make_changes(land, n, seed=5):
+    # Mostly parcel/crop updates, some new records and deletions, and a
+    # few numbers changed twice in the same feed
+    rng = np.random.default_rng(seed)
+    n_new, n_delete = n // 5, n // 10
+    existing = rng.choice(land["aadhaar_number"].to_numpy(), n - n_new, replace=False)
+    new = make_aadhaar_numbers(n_new, seed=seed) + 0  # may rarely collide; collisions become updates
+    ids = np.concatenate([existing, new])
+    op = np.array(["upsert"] * len(ids), dtype=object)
+    op[rng.choice(len(existing), n_delete, replace=False)] = "delete"
+    changes = pd.DataFrame({
+        "aadhaar_number": ids.astype(str),
+        "land_size": pd.array(rng.integers(1, 30, len(ids)), dtype="Int32"),
+        "crop_type": pd.Categorical(np.array(CROPS)[rng.integers(0, len(CROPS), len(ids))], categories=CROPS),
+        "op": pd.Categorical(op, categories=["upsert", "delete"]),
+    })
+    repeat = changes.sample(n // 100, random_state=seed).assign(land_size=pd.array(rng.integers(1, 30, n // 100), dtype="Int32"))
+    return pd.concat([changes, repeat], ignore_index=True)
+
+
+def apply_to_frame(land, changes):
+    # The land records after the changes, for the full recompute
+    changes = changes.assign(aadhaar_number=changes["aadhaar_number"].astype(np.int64))
+    merged = pd.concat([land.assign(op="upsert"), changes], ignore_index=True)
+    merged = merged.drop_duplicates("aadhaar_number", keep="last")
+    return merged[merged["op"].astype(str) != "delete"].drop(columns="op")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental score table benchmark")
+    parser.add_argument("--records", type=int, default=10_000_000)
+    parser.add_argument("--changes", type=int, default=100_000)
+    parser.add_argument("--single", type=int, default=20_000)
+    args = parser.parse_args()
+
+    land = make_land_data(args.records)
+    changes = make_changes(land, args.changes)
+    table = ScoreTable.from_land_data(land)
+
+    start = time.perf_counter()
+    affected = table.apply_changes(changes)
+    delta_s = time.perf_counter() - start
+
+    updated = apply_to_frame(land, changes)
+    start = time.perf_counter()
+    full = ScoreTable.from_land_data(updated)
+    full_s = time.perf_counter() - start
+
+    assert len(table) == len(full)
+    everyone = np.concatenate([land["aadhaar_number"].to_numpy(), to_aadhaar_array(changes["aadhaar_number"])])
+    (found, score, risk), (full_found, full_score, full_risk) = table.scores(everyone), full.scores(everyone)
+    assert np.array_equal(found, full_found)
+    assert np.array_equal(score[found], full_score[found]) and np.array_equal(risk[found], full_risk[found])
+    assert table.score_sum == full.score_sum and table.band_counts() == full.band_counts()
+
+    index = build_land_index(updated)
+    ids = updated["aadhaar_number"].to_numpy()[:args.single]
+    start = time.perf_counter()
+    for aadhaar in ids:
+        calculate_credit_score(aadhaar, index)
+    single_s = (time.perf_counter() - start) / len(ids)
+
+    print(f"delta: {len(changes):,} changes ({affected:,} Aadhaar numbers) applied in {delta_s * 1000:.0f} ms")
+    print(f"full rebuild: {len(updated):,} records in {full_s:.2f}s ({full_s / delta_s:.0f}x the delta)")
+    print(f"per-applicant calculate_credit_score: {single_s * 1e6:.1f} us ({single_s * len(updated):,.0f}s for everyone)")
+    print(f"average score {table.average_score():.1f}, bands {table.band_counts()}; matches full rebuild")
+
+
+if __name__ == "__main__":
+    main()
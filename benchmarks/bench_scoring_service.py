@@ -0,0 +1,111 @@
+# Load test of the scoring service: single-applicant lookups from many
+# concurrent clients, reporting throughput and tail latency per worker
+# count. Client threads share this process, so on small hosts they compete
+# with the service for CPU.
+#
+#   python benchmarks/bench_scoring_service.py --records 5000000 --workers 1 2 4 8 --clients 64
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_land_data
+from credit_scoring import calculate_credit_score
+from scoring_service import ScoringClient
+
+
+def start_service(land_path, workers, window_ms, max_batch):
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "scoring_service.py"), "--land", land_path, "--changes", "", "--port", "0",
+         "--workers", str(workers), "--window-ms", str(window_ms), "--max-batch", str(max_batch)],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    url = process.stdout.readline().split()[3]
+    client = ScoringClient(url)
+    # Wait until every worker has loaded the land index
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            client.score(["0"] * workers)
+            break
+        except ConnectionError:
+            time.sleep(0.2)
+    return process, client
+
+
+def run_load(client, ids, clients, duration):
+    latencies = [[] for _ in range(clients)]
+    stop = time.monotonic() + duration
+
+    def worker(i):
+        rng = np.random.default_rng(i)
+        own = latencies[i]
+        while time.monotonic() < stop:
+            aadhaar = ids[rng.integers(len(ids))]
+            start = time.perf_counter()
+            client.calculate_credit_score(aadhaar)
+            own.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return np.concatenate([np.array(own) for own in latencies]), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring service load test")
+    parser.add_argument("--records", type=int, default=5_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=1024)
+    args = parser.parse_args()
+
+    land = make_land_data(args.records)
+    ids = land["aadhaar_number"].astype(str).to_numpy()
+    with tempfile.TemporaryDirectory() as tmp:
+        land_path = os.path.join(tmp, "land_records.csv")
+        land.to_csv(land_path, index=False)
+
+        # In-process baseline: what each lookup costs in the Streamlit script
+        from credit_scoring import build_land_index
+
+        index = build_land_index(land)
+        start = time.perf_counter()
+        for aadhaar in ids[:20_000]:
+            calculate_credit_score(aadhaar, index)
+        print(f"in-process: {(time.perf_counter() - start) / 20_000 * 1e6:.1f} us/lookup (holds the GIL)")
+
+        for workers in args.workers:
+            process, client = start_service(land_path, workers, args.window_ms, args.max_batch)
+            try:
+                # Check the service agrees with the in-process scorer
+                for aadhaar in ids[:100]:
+                    assert client.calculate_credit_score(aadhaar) == tuple(
+                        None if v is None else (int(v) if k == 0 else v)
+                        for k, v in enumerate(calculate_credit_score(aadhaar, index))
+                    )
+                latencies, elapsed = run_load(client, ids, args.clients, args.duration)
+            finally:
+                process.terminate()
+                process.wait()
+            p50, p99, p999 = np.percentile(latencies, [50, 99, 99.9]) * 1000
+            print(f"workers={workers}: {len(latencies) / elapsed:,.0f} lookups/s with {args.clients} clients, "
+                  f"p50 {p50:.1f} ms, p99 {p99:.1f} ms, p99.9 {p999:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
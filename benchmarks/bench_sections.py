@@ -0,0 +1,94 @@
+# Time-to-first-paint and total page time for dashboard sections with
+# artificially slow providers: sequential rendering vs render_sections.
+#
+#   python benchmarks/bench_sections.py
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+# Filled by the page script, read by main(); both run in this process
+PAINTS = []
+STARTED = []
+
+PAGE_SCRIPT = f"""
+import sys
+sys.path.insert(0, {ROOT!r})
+import streamlit as st
+from benchmarks.bench_sections import run_page
+run_page(st.session_state["mode"], st.session_state["delays"], st.session_state["timeout"])
+"""
+
+
+def slow_provider(delay):
+    time.sleep(delay)
+    return pd.DataFrame({"Month": ["Jan", "Feb", "Mar"], "Value": [1, 2, 3]}).set_index("Month")
+
+
+def record_paint(slot, data):
+    PAINTS.append(time.perf_counter())
+    slot.line_chart(data)
+
+
+def run_page(mode, delays, timeout):
+    import streamlit as st
+    from sections import render_sections
+
+    STARTED.append(time.perf_counter())
+    if mode == "sequential":
+        for i, delay in enumerate(delays):
+            st.write(f"### Section {i}")
+            record_paint(st, slow_provider(delay))
+    else:
+        render_sections(
+            [(f"Section {i}", record_paint, slow_provider, (delay,)) for i, delay in enumerate(delays)],
+            timeout=timeout,
+        )
+
+
+def measure(mode, delays, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    # The page script imports this file as a module, not as __main__
+    from benchmarks.bench_sections import PAINTS, STARTED
+
+    PAINTS.clear()
+    STARTED.clear()
+    at = AppTest.from_string(PAGE_SCRIPT, default_timeout=60)
+    at.session_state["mode"] = mode
+    at.session_state["delays"] = delays
+    at.session_state["timeout"] = timeout
+    at.run()
+    end = time.perf_counter()
+    assert not at.exception, at.exception
+    first_paint = (min(PAINTS) - STARTED[0]) if PAINTS else float("nan")
+    return first_paint, end - STARTED[0], len(PAINTS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent dashboard section benchmark")
+    parser.add_argument("--delays", type=float, nargs="+", default=[0.8, 0.3, 0.5, 0.2])
+    parser.add_argument("--timeout", type=float, default=1.5)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("all sections slow", args.delays),
+        ("one section hangs", args.delays + [30.0]),
+    ]
+    for label, delays in scenarios:
+        for mode in ("sequential", "concurrent"):
+            if mode == "sequential" and max(delays) > 10:
+                print(f"{label:<18} {mode:<10} page blocked for {sum(delays):.1f}s (not run)")
+                continue
+            first, total, painted = measure(mode, delays, args.timeout)
+            print(f"{label:<18} {mode:<10} first paint {first:5.2f}s | page {total:5.2f}s | "
+                  f"{painted}/{len(delays)} sections painted")
+
+
+if __name__ == "__main__":
+    main()
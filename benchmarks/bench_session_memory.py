@@ -0,0 +1,126 @@
+# Resident memory per 1,000 sessions under two session-state layouts, each
+# measured in a fresh interpreter:
+#
+#   loose   - login details as five separate keys plus a leftover page key,
+#             and each session holding its own copy of its loans frame and
+#             credit check (the pattern data features would otherwise follow)
+#   compact - one SessionUser record; loans and credit checks cached through
+#             the SessionRegistry, whose budget evicts idle sessions' copies
+#
+# Widget values are stored as plain keys in both layouts. Every session
+# but the last is treated as idle.
+#
+#   python benchmarks/bench_session_memory.py --sessions 5000 --budget-mb 1
+import argparse
+import gc
+import json
+import os
+import secrets
+import subprocess
+import sys
+import uuid
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+LAYOUTS = ["loose", "compact"]
+USERS = 1000  # distinct Farmers the sessions belong to
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def widget_values(i):
+    return {
+        "login_role": "Farmer",
+        "login_username": f"farmer{i}",
+        "login_password": "correct horse battery",
+        "user_name": f"Farmer {i}",
+        "aadhaar_number": f"{100000000000 + i}",
+    }
+
+
+def child(layout, sessions, budget_mb):
+    import logging
+
+    from streamlit.runtime.state.session_state import SessionState
+
+    from dashboard_data import user_loans
+    from session_manager import USER_KEY, SessionRegistry, SessionUser, footprint
+
+    # SessionState warns on every write outside a script run
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    # Frames as st.cache_data hands them out, built before measuring; each
+    # session keeps its own copy
+    frames = [user_loans(user_id) for user_id in range(1, min(sessions, USERS) + 1)]
+    registry = SessionRegistry(int(budget_mb * 2**20), active_window=0)
+    gc.collect()
+    before = rss_bytes()
+
+    states = []
+    footprints = []
+    for i in range(sessions):
+        user_id = i % USERS + 1
+        state = SessionState()
+        for key, value in widget_values(i).items():
+            state[key] = value
+        token = secrets.token_urlsafe(24)
+        if layout == "loose":
+            state["logged_in"] = True
+            state["user_name"] = f"farmer{i}"
+            state["user_id"] = user_id
+            state["user_role"] = "Farmer"
+            state["session_token"] = token
+            state["page"] = "login"
+            state["loans"] = frames[user_id - 1].copy()
+            state["credit_score"] = (590, "Moderate")
+        else:
+            state[USER_KEY] = SessionUser(user_id, f"farmer{i}", "Farmer", token)
+            session = str(uuid.uuid4())
+            registry.put(session, "loans", frames[user_id - 1].copy())
+            registry.put(session, "credit_score", (590, "Moderate"))
+        states.append(state)
+        if i < 200:
+            footprints.append(footprint(state.filtered_state))
+
+    gc.collect()
+    grown = rss_bytes() - before
+    print(json.dumps({
+        "layout": layout,
+        "sessions": sessions,
+        "rss_growth_mib_per_1000": grown / sessions * 1000 / 2**20,
+        "state_kib_per_session": sum(footprints) / len(footprints) / 1024,
+        "cached_mib": registry.total / 2**20,
+        "evictions": registry.evictions,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session memory benchmark")
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--budget-mb", type=float, default=1, help="session data budget for the compact layout")
+    parser.add_argument("--child", choices=LAYOUTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.sessions, args.budget_mb)
+        return
+
+    for layout in LAYOUTS:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", layout, "--sessions", str(args.sessions),
+             "--budget-mb", str(args.budget_mb)],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if proc.returncode:
+            sys.exit(proc.stderr[-2000:])
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{layout:8s} {result['rss_growth_mib_per_1000']:7.2f} MiB RSS per 1,000 sessions, "
+              f"{result['state_kib_per_session']:6.2f} KiB in session state each, "
+              f"{result['cached_mib']:.2f} MiB cached after {result['evictions']:,} evictions")
+
+
+if __name__ == "__main__":
+    main()
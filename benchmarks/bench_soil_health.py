@@ -0,0 +1,43 @@
+# Per-plot cost of soil health scoring: scalar loop vs one vectorized call.
+#
+#   python benchmarks/bench_soil_health.py --plots 5000000
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from soil_health import score_plots, soil_health_band, soil_health_score
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soil health scoring microbenchmark")
+    parser.add_argument("--plots", type=int, default=5_000_000)
+    parser.add_argument("--scalar-plots", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    organic_matter = rng.integers(1, 101, args.plots)
+    irrigation = np.where(rng.random(args.plots) < 0.5, "Yes", "No").astype(object)
+    irrigated = irrigation == "Yes"
+
+    n = args.scalar_plots
+    om_list, irr_list = organic_matter[:n].tolist(), irrigation[:n].tolist()
+    start = time.perf_counter()
+    scalar = [soil_health_band(soil_health_score(om, irr)) for om, irr in zip(om_list, irr_list)]
+    scalar_ns = (time.perf_counter() - start) / n * 1e9
+
+    for label, irr in (("vectorized (str)", irrigation), ("vectorized (bool)", irrigated)):
+        start = time.perf_counter()
+        scores, bands = score_plots(organic_matter, irr)
+        vector_ns = (time.perf_counter() - start) / args.plots * 1e9
+        assert list(bands[:n]) == scalar
+        print(f"{label:<18} {vector_ns:8.1f} ns/plot over {args.plots:,} plots")
+    print(f"{'scalar':<18} {scalar_ns:8.1f} ns/plot over {n:,} plots")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Cold-start profile of app.py: for each page, a fresh interpreter renders
+# the logged-out landing page and then the page itself (what the first
+# visitor to a new worker triggers). Reports render times, which heavy
+# libraries each step imported, and the -X importtime breakdown by
+# top-level package.
+#
+#   python benchmarks/bench_startup.py --pages landing about home dashboard
+import argparse
+import collections
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP = os.path.join(ROOT, "app.py")
+PAGES = ["landing", "about", "features", "contact", "home", "dashboard", "analytics"]
+HEAVY = ["numpy", "pandas", "pyarrow", "PIL.Image", "plotly.express", "plotly.graph_objects"]
+
+
+def loaded():
+    return [name for name in HEAVY if name in sys.modules]
+
+
+def child(page, role):
+    from streamlit.testing.v1 import AppTest
+
+    result = {"page": page}
+    start = time.perf_counter()
+    at = AppTest.from_file(APP, default_timeout=600).run()
+    result["landing_s"] = time.perf_counter() - start
+    result["landing_imports"] = loaded()
+    if page != "landing":
+        from session_manager import USER_KEY, SessionUser
+
+        at.session_state[USER_KEY] = SessionUser(1, "bench", role, "bench")
+        at.sidebar.radio[0].set_value(page.title())
+        start = time.perf_counter()
+        at.run()
+        result["page_s"] = time.perf_counter() - start
+        result["page_imports"] = [name for name in loaded() if name not in result["landing_imports"]]
+        assert not at.exception, at.exception
+    print(json.dumps(result))
+
+
+def import_profile(stderr, top):
+    # Self time per top-level package from -X importtime output
+    self_us = collections.Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, module = line[len("import time:"):].split("|")
+        self_us[module.strip().split(".")[0]] += int(own)
+    total = sum(self_us.values())
+    return total, self_us.most_common(top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="App cold-start benchmark")
+    parser.add_argument("--pages", nargs="+", default=PAGES, choices=PAGES)
+    parser.add_argument("--role", default="Farmer")
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--child", choices=PAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.role)
+        return
+
+    env = dict(os.environ, HARVEST_DB_PATH=os.path.join(ROOT, "data", "bench_startup.db"))
+    for page in args.pages:
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", __file__, "--child", page, "--role", args.role],
+            capture_output=True, text=True, env=env,
+        )
+        wall_s = time.perf_counter() - start
+        if proc.returncode:
+            sys.exit(proc.stderr[-2000:])
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        total, top = import_profile(proc.stderr, args.top)
+        line = f"{page:10s} process {wall_s:5.2f}s  landing {result['landing_s']:5.2f}s"
+        if "page_s" in result:
+            line += f"  first render {result['page_s']:5.2f}s  +{','.join(result['page_imports']) or '-'}"
+        print(line)
+        print(f"{'':10s} landing imported: {', '.join(result['landing_imports']) or 'none of ' + '/'.join(HEAVY)}")
+        print(f"{'':10s} imports {total / 1e6:.2f}s: " + ", ".join(f"{name} {us / 1e3:.0f}ms" for name, us in top))
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(env["HARVEST_DB_PATH"] + suffix):
+            os.remove(env["HARVEST_DB_PATH"] + suffix)
+
+
+if __name__ == "__main__":
+    main()
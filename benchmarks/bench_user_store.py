@@ -0,0 +1,64 @@
+# Concurrent login load test for the SQLite-backed user store: first-time
+# registrations, repeat logins and session lookups from many threads.
+#
+#   python benchmarks/bench_user_store.py --users 5000 --threads 64
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from user_store import PASSWORD_ITERATIONS, SELF_REGISTER_ROLES, SQLitePool, UserStore
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def run_phase(label, pool, fn, items):
+    start = time.perf_counter()
+    results = list(pool.map(lambda item: timed(fn, *item), items))
+    elapsed = time.perf_counter() - start
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    print(
+        f"{label:<16} {len(items):>7,} ops {len(items) / elapsed:>9,.0f}/s | "
+        f"p50 {np.percentile(latencies, 50):7.2f} ms  p99 {np.percentile(latencies, 99):7.2f} ms"
+    )
+    return [result for _, result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="User store login load test")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=PASSWORD_ITERATIONS,
+                        help="PBKDF2 iterations (hashing dominates login latency)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UserStore(SQLitePool(os.path.join(tmp, "users.db"), size=args.pool_size),
+                          iterations=args.iterations)
+        users = [(f"farmer{i}", f"pw{i}", SELF_REGISTER_ROLES[i % len(SELF_REGISTER_ROLES)]) for i in range(args.users)]
+        with ThreadPoolExecutor(args.threads) as pool:
+            logins = run_phase("register", pool, store.login, users)
+            assert all(logins)
+            logins = run_phase("repeat login", pool, store.login, users)
+            assert all(logins)
+            tokens = [(token,) for _, token in logins]
+            run_phase("session (cached)", pool, store.get_session, tokens)
+            store._sessions.clear()
+            found = run_phase("session (db)", pool, store.get_session, tokens)
+            assert all(found)
+        store.pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# Synthetic datasets shared by the benchmark scripts
+import numpy as np
+import pandas as pd
+
+CROPS = ["Wheat", "Rice", "Maize", "Sugarcane", "Cotton"]
+STATES = ["Karnataka", "Tamil Nadu", "Kerala", "Maharashtra", "Punjab", "Bihar"]
+
+
+def make_aadhaar_numbers(n, seed=0):
+    # Unique 12-digit numbers in random order
+    rng = np.random.default_rng(seed)
+    aadhaar = np.unique(rng.integers(10**11, 10**12, int(n * 1.01) + 16, dtype=np.int64))
+    while len(aadhaar) < n:
+        extra = rng.integers(10**11, 10**12, n, dtype=np.int64)
+        aadhaar = np.unique(np.concatenate([aadhaar, extra]))
+    aadhaar = aadhaar[:n]
+    rng.shuffle(aadhaar)
+    return aadhaar
+
+
+def make_land_data(n_records, seed=0):
+    rng = np.random.default_rng(seed + 1)
+    return pd.DataFrame({
+        "aadhaar_number": make_aadhaar_numbers(n_records, seed),
+        "land_size": rng.integers(1, 30, n_records, dtype=np.int64),
+        "crop_type": pd.Categorical.from_codes(rng.integers(0, len(CROPS), n_records), CROPS),
+    })
+
+
+def make_aadhaar_data(n_records, seed=0):
+    # Same numbers as make_land_data(n_records, seed), in the aadhar.csv
+    # schema
+    rng = np.random.default_rng(seed + 2)
+    return pd.DataFrame({
+        "aadhaar_number": make_aadhaar_numbers(n_records, seed),
+        "name": pd.array([f"Farmer {i}" for i in range(n_records)], dtype="string"),
+        "age": rng.integers(16, 80, n_records, dtype=np.int64).astype(np.uint8),
+        "address": pd.Categorical.from_codes(rng.integers(0, len(STATES), n_records), STATES),
+    })
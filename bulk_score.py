@@ -0,0 +1,157 @@
+import argparse
+import os
+import resource
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from credit_scoring import build_land_index, get_risk_levels, score_batch
+from data_loader import LAND_CHANGES_DIR, land_path, read_dataset
+from land_registry import open_registry
+from score_table import ScoreTable
+
+# Land lookup used by score_chunk; set once per process by init_worker
+_land = None
+
+
+def open_land(path):
+    # A registry directory is memory-mapped and shared through the page
+    # cache; a CSV is loaded into an in-memory index.
+    if os.path.isdir(path):
+        return open_registry(path)
+    return build_land_index(read_dataset(path, "land_records"))
+
+
+def open_score_table(path, changes_dir=LAND_CHANGES_DIR):
+    # The land records at `path` plus every change file in changes_dir (if
+    # any): the same scores data_loader.load_score_table gives the app.
+    # Shared by the bulk scorer and the scoring service workers.
+    table = ScoreTable(open_land(path))
+    if changes_dir:
+        table.sync(changes_dir)
+    return table
+
+
+def init_worker(land_path, changes_dir=LAND_CHANGES_DIR):
+    global _land
+    _land = open_score_table(land_path, changes_dir)
+
+
+def score_chunk(aadhaar_numbers):
+    result = score_batch(aadhaar_numbers, _land)
+    result["risk_level"] = get_risk_levels(result["risk"])
+    return result
+
+
+class ResultWriter:
+    # Appends scored chunks to CSV or Parquet without keeping them around
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self._writer = None
+        self._header = True
+
+    def write(self, frame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Fixed schema: a chunk with no matches has an all-null risk
+            # column, which would otherwise be typed null for the whole file
+            schema = pa.schema([
+                ("aadhaar_number", pa.string()),
+                ("score", pa.int64()),
+                ("risk", pa.string()),
+                ("risk_level", pa.int64()),
+            ])
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def read_chunks(input_path, column, chunksize):
+    # Read IDs as text so one malformed row doesn't fail the whole chunk
+    for chunk in pd.read_csv(input_path, usecols=[column], dtype={column: str}, chunksize=chunksize):
+        yield chunk[column].to_numpy()
+
+
+def bulk_score(input_path, output_path, land_path, column="aadhaar_number",
+               chunksize=200_000, workers=0, max_in_flight=None, changes_dir=LAND_CHANGES_DIR):
+    # Stream input_path through the scorer in chunks and write results in
+    # input order. Returns the number of rows scored.
+    writer = ResultWriter(output_path)
+    rows = 0
+    try:
+        if workers <= 1:
+            init_worker(land_path, changes_dir)
+            for ids in read_chunks(input_path, column, chunksize):
+                writer.write(score_chunk(ids))
+                rows += len(ids)
+            return rows
+
+        # Bound the number of chunks queued or held so memory stays flat
+        # however large the input is
+        max_in_flight = max_in_flight or workers * 2
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(land_path, changes_dir)) as pool:
+            pending = deque()
+            for ids in read_chunks(input_path, column, chunksize):
+                if len(pending) >= max_in_flight:
+                    result = pending.popleft().result()
+                    writer.write(result)
+                    rows += len(result)
+                pending.append(pool.submit(score_chunk, ids))
+            while pending:
+                result = pending.popleft().result()
+                writer.write(result)
+                rows += len(result)
+        return rows
+    finally:
+        writer.close()
+
+
+def peak_rss_mib():
+    # ru_maxrss is in KiB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return own / 1024, children / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV of Aadhaar numbers in bulk")
+    parser.add_argument("input", help="CSV with an Aadhaar number column")
+    parser.add_argument("output", help="Output .csv or .parquet")
+    parser.add_argument("--land", default=land_path(),
+                        help="land_records.csv or a land registry directory")
+    parser.add_argument("--changes", default=LAND_CHANGES_DIR,
+                        help="land-record change files to apply, as in the app (empty to skip)")
+    parser.add_argument("--column", default="aadhaar_number")
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=0, help="Process pool size (0 = score in this process)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = bulk_score(
+        args.input, args.output, args.land, args.column, args.chunksize, args.workers, changes_dir=args.changes
+    )
+    elapsed = time.perf_counter() - start
+    own, children = peak_rss_mib()
+    print(
+        f"Scored {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s), "
+        f"peak RSS {own:.0f} MiB (largest worker {children:.0f} MiB)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import streamlit as st
+from plotly import graph_objects as go
+
+from soil_health import GAUGE_BANDS, SCORE_RANGE
+
+
+# Figures are memoized per input tuple and shared across sessions; callers
+# must not modify the returned figure.
+@st.cache_resource(max_entries=256, show_spinner=False)
+def soil_health_gauge(score):
+    return go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=score,
+        title={"text": "Soil Health Score"},
+        gauge={
+            "axis": {"range": list(SCORE_RANGE)},
+            "steps": [
+                {"range": [lower, upper], "color": color}
+                for lower, upper, _, color in GAUGE_BANDS
+            ],
+            "bar": {"color": "blue"}
+        }
+    ))
@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import closing
+
+import streamlit as st
+
+from user_store import DB_PATH
+
+INBOX_PATH = os.environ.get(
+    "HARVEST_SUPPORT_INBOX",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "support_inbox.jsonl"),
+)
+MAX_GROUP = 256  # submissions per commit
+DRAIN_BATCH = 500  # messages handed to the handler at once
+DRAIN_INTERVAL = 1.0  # seconds between drainer polls when nothing wakes it
+SUBMIT_TIMEOUT = 10.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contact_messages (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    message TEXT NOT NULL,
+    user_id INTEGER,
+    created_at REAL NOT NULL,
+    processed_at REAL
+);
+CREATE INDEX IF NOT EXISTS contact_messages_queued
+    ON contact_messages (id) WHERE processed_at IS NULL;
+"""
+
+INSERT_MESSAGE = "INSERT INTO contact_messages (name, email, message, user_id, created_at) VALUES (?, ?, ?, ?, ?)"
+SELECT_QUEUED = (
+    "SELECT id, name, email, message, user_id, created_at FROM contact_messages "
+    "WHERE processed_at IS NULL ORDER BY id LIMIT ?"
+)
+MARK_PROCESSED = "UPDATE contact_messages SET processed_at = ? WHERE id = ?"
+COUNT_QUEUED = "SELECT COUNT(*) FROM contact_messages WHERE processed_at IS NULL"
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+def append_to_inbox(messages, path=INBOX_PATH):
+    # Default drain handler: one JSON line per message for the support team
+    with open(path, "a") as f:
+        for message in messages:
+            f.write(json.dumps(message) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class ContactQueue:
+    # Durable queue of contact form submissions in SQLite (WAL).
+    #
+    # submit() hands the message to a single writer thread and returns a
+    # Future for its row id. The writer takes everything that queued up
+    # while its previous commit was syncing and writes it in one
+    # transaction, so a burst of submissions shares one fsync instead of
+    # waiting on one each (group commit). A Future resolves only after its
+    # commit is on disk.
+    #
+    # A drainer thread hands committed messages to `handler` in id order and
+    # marks them processed afterwards, so a crash between the two replays
+    # them (at-least-once).
+    def __init__(self, path=DB_PATH, handler=append_to_inbox, max_group=MAX_GROUP,
+                 drain_batch=DRAIN_BATCH, drain_interval=DRAIN_INTERVAL):
+        self.path = path
+        self.handler = handler
+        self.max_group = max_group
+        self.drain_batch = drain_batch
+        self.drain_interval = drain_interval
+        self._pending = queue.SimpleQueue()
+        self._wake_drainer = threading.Event()
+        self._closed = threading.Event()
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+        self._writer = threading.Thread(target=self._write_loop, name="harvest-contact-writer", daemon=True)
+        self._drainer = threading.Thread(target=self._drain_loop, name="harvest-contact-drainer", daemon=True)
+        self._writer.start()
+        self._drainer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Every commit is fsynced: an acknowledged message survives a power cut
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def submit(self, name, email, message, user_id=None):
+        future = Future()
+        self._pending.put(((name, email, message, user_id, time.time()), future))
+        return future
+
+    def queued(self):
+        with closing(self._connect()) as conn:
+            return conn.execute(COUNT_QUEUED).fetchone()[0]
+
+    def _write_loop(self):
+        # Any failure fails only the group being written; the connection is
+        # reopened for the next one, so later submissions still commit
+        conn = None
+        stopping = False
+        while not stopping:
+            group = []
+            item = self._pending.get()
+            while item is not _STOP:
+                group.append(item)
+                if len(group) >= self.max_group:
+                    break
+                try:
+                    item = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+            stopping = item is _STOP
+            if not group:
+                continue
+            try:
+                if conn is None:
+                    conn = self._connect()
+                with conn:
+                    ids = [conn.execute(INSERT_MESSAGE, values).lastrowid for values, _ in group]
+            except Exception as exc:
+                logger.exception("Failed to commit %d contact messages", len(group))
+                for _, future in group:
+                    future.set_exception(exc)
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                continue
+            for (_, future), message_id in zip(group, ids):
+                future.set_result(message_id)
+            self._wake_drainer.set()
+        if conn is not None:
+            conn.close()
+
+    def _drain_loop(self):
+        conn = None
+        while True:
+            self._wake_drainer.wait(self.drain_interval)
+            self._wake_drainer.clear()
+            try:
+                if conn is None:
+                    conn = self._connect()
+                self.drain(conn)
+            except Exception:
+                # Left queued; retried on the next pass
+                logger.exception("Failed to drain contact messages")
+                if conn is not None:
+                    conn.close()
+                    conn = None
+            if self._closed.is_set():
+                break
+        if conn is not None:
+            conn.close()
+
+    def drain(self, conn):
+        # Hand every queued message to the handler, oldest first
+        while True:
+            rows = conn.execute(SELECT_QUEUED, (self.drain_batch,)).fetchall()
+            if not rows:
+                return
+            self.handler([
+                {"id": row[0], "name": row[1], "email": row[2], "message": row[3],
+                 "user_id": row[4], "created_at": row[5]}
+                for row in rows
+            ])
+            now = time.time()
+            with conn:
+                conn.executemany(MARK_PROCESSED, [(now, row[0]) for row in rows])
+
+    def close(self):
+        # Commits everything already submitted and drains it once more
+        self._pending.put(_STOP)
+        self._writer.join()
+        self._closed.set()
+        self._wake_drainer.set()
+        self._drainer.join()
+
+
+# One queue (and writer/drainer pair) per process, shared by every session
+@st.cache_resource(show_spinner=False)
+def get_contact_queue(path=DB_PATH):
+    return ContactQueue(path)
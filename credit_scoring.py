@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+# Scoring constants
+BASE_SCORE = 500
+LAND_SIZE_WEIGHT = 10
+CROP_NAME_WEIGHT = 5
+LOW_RISK_ABOVE = 700
+MODERATE_RISK_ABOVE = 500
+
+RISK_LEVELS = {"Low": 100, "Moderate": 50, "High": 20}
+# Risk bands in the order of the codes returned by risk_codes
+RISK_BANDS = ["Low", "Moderate", "High"]
+
+
+# Lookup index over the land records, keyed on aadhaar_number.
+# Build it once and reuse it for every lookup instead of scanning the
+# whole DataFrame per applicant.
+class LandIndex:
+    def __init__(self, land_data):
+        keys = land_data["aadhaar_number"].to_numpy(dtype=np.int64)
+        # Stable sort so the first record per Aadhaar number wins, same as
+        # the old iloc[0]
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        order = order[first]
+        self.keys = keys[first]
+        self.land_size = land_data["land_size"].to_numpy()[order]
+        self.crop_len = crop_name_lengths(land_data["crop_type"])[order]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def land_columns(self, start, stop):
+        # (land_size, crop name length) for the records start:stop in key order
+        return self.land_size[start:stop], self.crop_len[start:stop]
+
+    def lookup(self, aadhaar_numbers):
+        # Returns (found mask, land_size, crop name length) aligned to the input
+        ids = to_aadhaar_array(aadhaar_numbers)
+        if len(self.keys) == 0:
+            empty = np.zeros(len(ids), dtype=np.int64)
+            return np.zeros(len(ids), dtype=bool), empty, empty
+        positions = np.searchsorted(self.keys, ids)
+        np.minimum(positions, len(self.keys) - 1, out=positions)
+        found = self.keys[positions] == ids
+        return found, self.land_size[positions], self.crop_len[positions]
+
+
+def build_land_index(land_data):
+    return LandIndex(land_data)
+
+
+def crop_name_lengths(crop_type):
+    # Categorical columns only need the length of each category once
+    if isinstance(crop_type.dtype, pd.CategoricalDtype):
+        lengths = crop_type.cat.categories.astype(str).str.len().to_numpy(dtype=np.int64)
+        codes = crop_type.cat.codes.to_numpy()
+        return np.where(codes >= 0, lengths[codes], 0)
+    return crop_type.fillna("").astype(str).str.len().to_numpy(dtype=np.int64)
+
+
+# Text int() accepts as an Aadhaar number
+INTEGER_TEXT = r"\s*[+-]?\d+\s*"
+_text_mask = np.frompyfunc(lambda value: isinstance(value, str), 1, 1)
+
+
+# Convert Aadhaar numbers (ints or strings) to int64, with -1 for anything
+# that int() would have rejected.
+def to_aadhaar_array(aadhaar_numbers):
+    values = np.asarray(aadhaar_numbers)
+    if values.ndim == 0:
+        values = values.reshape(1)
+    if np.issubdtype(values.dtype, np.integer):
+        return values.astype(np.int64, copy=False)
+    series = pd.Series(values)
+    # to_numeric also takes float text ("123456789012.0", "1.2e11"), which
+    # int() rejects
+    text = _is_text(values)
+    if text.any():
+        integer = series[text].str.fullmatch(INTEGER_TEXT).to_numpy(dtype=bool)
+        if not integer.all():
+            series = series.astype(object)
+            series.iloc[np.flatnonzero(text)[~integer]] = None
+    numeric = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+    valid = np.isfinite(numeric) & (numeric == np.floor(numeric))
+    result = np.full(len(numeric), -1, dtype=np.int64)
+    # float64 is exact below 2**53, which covers every 12-digit Aadhaar
+    # number; anything larger is re-parsed from its text
+    exact = valid & (np.abs(numeric) < 2**53)
+    result[exact] = numeric[exact]
+    large = valid & ~exact
+    if large.any():
+        result[large] = pd.Series(values[large]).astype(str).str.strip().map(_parse_int).to_numpy(dtype=np.int64)
+    return result
+
+
+def _is_text(values):
+    if values.dtype.kind == "U":
+        return np.ones(len(values), dtype=bool)
+    if values.dtype.kind != "O":
+        return np.zeros(len(values), dtype=bool)
+    return _text_mask(values).astype(bool)
+
+
+def _parse_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        return -1
+    # Outside int64 cannot match any key
+    return value if -2**63 <= value < 2**63 else -1
+
+
+# Vectorized score and risk band for already looked-up land fields
+def score_from_land(land_size, crop_len):
+    score = land_scores(land_size, crop_len)
+    risk = np.array(RISK_BANDS, dtype=object)[risk_codes(score)]
+    return score, risk
+
+
+def land_scores(land_size, crop_len):
+    return BASE_SCORE + land_size * LAND_SIZE_WEIGHT + crop_len * CROP_NAME_WEIGHT
+
+
+def risk_codes(score):
+    # Index into RISK_BANDS per score
+    return np.select([score > LOW_RISK_ABOVE, score > MODERATE_RISK_ABOVE], [0, 1], 2).astype(np.int8)
+
+
+# Batch Credit Score Calculation
+@timed("scoring.score_batch")
+def score_batch(aadhaar_numbers, land_index):
+    if not hasattr(land_index, "lookup"):
+        land_index = build_land_index(land_index)
+    found, land_size, crop_len = land_index.lookup(aadhaar_numbers)
+    score, risk = score_from_land(land_size, crop_len)
+    risk[~found] = None
+    return pd.DataFrame({
+        "aadhaar_number": np.asarray(aadhaar_numbers).reshape(-1),
+        "score": pd.Series(pd.array(score)).where(found),
+        "risk": risk,
+    })
+
+
+# Enhanced Credit Score Calculation
+@timed("scoring.calculate_credit_score")
+def calculate_credit_score(aadhaar_number, land_data):
+    # land_data can be a DataFrame or a pre-built LandIndex; pass the index
+    # when scoring more than one applicant.
+    try:
+        int(aadhaar_number)
+    except ValueError:
+        return None, None
+    if hasattr(land_data, "lookup"):
+        found, land_size, crop_len = land_data.lookup([aadhaar_number])
+    else:
+        found, land_size, crop_len = _scan(land_data, aadhaar_number)
+    if not found[0]:
+        return None, None
+    score, risk = score_from_land(land_size[:1], crop_len[:1])
+    return score[0], risk[0]
+
+
+def _scan(land_data, aadhaar_number):
+    # One lookup straight against the DataFrame: a single O(n) mask is far
+    # cheaper than sorting the whole table into a LandIndex for it
+    rows = np.flatnonzero(land_data["aadhaar_number"].to_numpy() == to_aadhaar_array(aadhaar_number)[0])
+    if len(rows) == 0:
+        empty = np.zeros(1, dtype=np.int64)
+        return np.zeros(1, dtype=bool), empty, empty
+    # First record per Aadhaar number wins, as in LandIndex
+    row = rows[:1]
+    land_size = land_data["land_size"].to_numpy()[row]
+    return np.ones(1, dtype=bool), land_size, crop_name_lengths(land_data["crop_type"].iloc[row])
+
+
+# Map Risk Levels to Numeric Values
+def get_risk_level(risk):
+    return RISK_LEVELS.get(risk, 0)
+
+
+def get_risk_levels(risks):
+    return pd.Series(risks).map(RISK_LEVELS).fillna(0).astype(np.int64).to_numpy()
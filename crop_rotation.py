@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+CROPS = ["Wheat", "Rice", "Maize", "Sugarcane", "Cotton"]
+SOIL_TYPES = ["Loamy", "Sandy", "Clayey", "Silty", "Peaty"]
+IRRIGATION = ["Yes", "No"]
+# Organic matter (%) below the first edge counts as depleted
+ORGANIC_MATTER_EDGES = [30]
+NO_RECOMMENDATION = "No recommendation available"
+
+# Next crop on irrigated land with adequate organic matter
+BASE_ROTATION = {
+    "Wheat": {"Loamy": "Maize", "Sandy": "Peanuts", "Clayey": "Rice", "Silty": "Soybeans", "Peaty": "Potatoes"},
+    "Rice": {"Loamy": "Sugarcane", "Sandy": "Cotton", "Clayey": "Wheat", "Silty": "Mustard", "Peaty": "Potatoes"},
+    "Maize": {"Loamy": "Beans", "Sandy": "Millets", "Clayey": "Rice", "Silty": "Soybeans", "Peaty": "Beans"},
+    "Sugarcane": {"Loamy": "Soybeans", "Sandy": "Groundnuts", "Clayey": "Cotton", "Silty": "Wheat", "Peaty": "Potatoes"},
+    "Cotton": {"Loamy": "Wheat", "Sandy": "Sunflower", "Clayey": "Rice", "Silty": "Chickpeas", "Peaty": "Potatoes"},
+}
+
+# Without irrigation, water-hungry crops give way to dryland ones
+RAINFED_SUBSTITUTES = {
+    "Rice": "Millets",
+    "Sugarcane": "Sorghum",
+    "Potatoes": "Barley",
+    "Cotton": "Pigeon Peas",
+}
+
+# Depleted soil gets a legume to rebuild nitrogen and organic matter
+SOIL_BUILDERS = {
+    "Loamy": "Beans",
+    "Sandy": "Groundnuts",
+    "Clayey": "Chickpeas",
+    "Silty": "Soybeans",
+    "Peaty": "Beans",
+}
+RAINFED_SOIL_BUILDERS = {"Loamy": "Chickpeas", "Silty": "Chickpeas", "Peaty": "Chickpeas"}
+
+
+def _recommend(last_crop, soil_type, irrigated, depleted):
+    if depleted:
+        builders = SOIL_BUILDERS if irrigated else {**SOIL_BUILDERS, **RAINFED_SOIL_BUILDERS}
+        return builders[soil_type]
+    crop = BASE_ROTATION[last_crop][soil_type]
+    return crop if irrigated else RAINFED_SUBSTITUTES.get(crop, crop)
+
+
+def _build_table():
+    # table[crop, soil, irrigation, organic matter bucket] -> index into names
+    names = []
+    codes = {}
+    table = np.empty(
+        (len(CROPS), len(SOIL_TYPES), len(IRRIGATION), len(ORGANIC_MATTER_EDGES) + 1), dtype=np.int16
+    )
+    for c, crop in enumerate(CROPS):
+        for s, soil in enumerate(SOIL_TYPES):
+            for i, irrigation in enumerate(IRRIGATION):
+                for b in range(table.shape[3]):
+                    name = _recommend(crop, soil, irrigation == "Yes", b == 0)
+                    if name not in codes:
+                        codes[name] = len(names)
+                        names.append(name)
+                    table[c, s, i, b] = codes[name]
+    # Unknown inputs map to the last slot
+    names.append(NO_RECOMMENDATION)
+    return table, np.array(names, dtype=object)
+
+
+ROTATION_TABLE, RECOMMENDED_CROPS = _build_table()
+_NO_RECOMMENDATION_CODE = len(RECOMMENDED_CROPS) - 1
+
+
+def _codes(values, categories):
+    return pd.Categorical(np.asarray(values, dtype=object).reshape(-1), categories=categories).codes
+
+
+def _irrigation_codes(irrigation):
+    irrigation = np.asarray(irrigation).reshape(-1)
+    if irrigation.dtype == bool:
+        return np.where(irrigation, 0, 1).astype(np.int8)
+    return _codes(irrigation, IRRIGATION)
+
+
+def recommend_codes(last_crops, soil_types, irrigation, organic_matter):
+    # Vectorized lookup returning indices into RECOMMENDED_CROPS
+    crop = _codes(last_crops, CROPS)
+    soil = _codes(soil_types, SOIL_TYPES)
+    irrigated = _irrigation_codes(irrigation)
+    bucket = np.digitize(np.asarray(organic_matter, dtype=np.float64).reshape(-1), ORGANIC_MATTER_EDGES)
+    known = (crop >= 0) & (soil >= 0) & (irrigated >= 0)
+    result = ROTATION_TABLE[
+        np.where(known, crop, 0), np.where(known, soil, 0), np.where(known, irrigated, 0), bucket
+    ]
+    return np.where(known, result, _NO_RECOMMENDATION_CODE)
+
+
+def recommend_batch(last_crops, soil_types, irrigation, organic_matter):
+    # Next crop for many plots at once. irrigation is "Yes"/"No" or bool.
+    return RECOMMENDED_CROPS[recommend_codes(last_crops, soil_types, irrigation, organic_matter)]
+
+
+_CROP_INDEX = {crop: i for i, crop in enumerate(CROPS)}
+_SOIL_INDEX = {soil: i for i, soil in enumerate(SOIL_TYPES)}
+_IRRIGATION_INDEX = {"Yes": 0, "No": 1, True: 0, False: 1}
+
+
+def recommend_next_crop(last_crop, soil_type, irrigation, organic_matter):
+    # Scalar path for the UI: plain dict lookups, no array setup
+    crop = _CROP_INDEX.get(last_crop)
+    soil = _SOIL_INDEX.get(soil_type)
+    irrigated = _IRRIGATION_INDEX.get(irrigation)
+    if crop is None or soil is None or irrigated is None:
+        return NO_RECOMMENDATION
+    bucket = sum(organic_matter >= edge for edge in ORGANIC_MATTER_EDGES)
+    return RECOMMENDED_CROPS[ROTATION_TABLE[crop, soil, irrigated, bucket]]
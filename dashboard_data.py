@@ -0,0 +1,287 @@
+import random
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from analytics_engine import build_rollup, generate_transactions, today
+from applications import PENDING_TYPES, get_application_pipeline
+from credit_scoring import RISK_BANDS
+from data_loader import load_score_table
+from loans import (
+    BASE_RATE, FIRST_LOAN_ID, MAX_PRINCIPAL, emi, generate_loan_book, month_starts, month_number, outstanding,
+    paid_instalments, payments_by_month, schedule_frame, this_month,
+)
+from portfolio_risk import Portfolio, simulate, summarize
+from portfolio_stats import PortfolioStats
+from user_store import get_user_store
+
+# Dashboard data providers. Each one is cached per (user, time window) for
+# DASHBOARD_TTL seconds, so reruns that don't change those inputs reuse
+# the same frames instead of rebuilding them.
+DASHBOARD_TTL = 300
+DASHBOARD_MAX_ENTRIES = 1000
+
+# Size of the synthetic transaction log behind the Analytics page until a
+# real transaction feed is connected
+SYNTHETIC_TRANSACTIONS = 1_000_000
+ANALYTICS_HISTORY_DAYS = 180
+
+# Synthetic loan book, spread over user ids from 1, until loans are stored
+# per user
+SYNTHETIC_LOANS = 200_000
+SYNTHETIC_BORROWERS = 50_000
+SYNTHETIC_CONTRIBUTORS = 2_000
+# Rate approved applications are booked at, and the contributor id of
+# loans no Contributor funds yet
+APPROVED_LOAN_RATE = BASE_RATE
+UNFUNDED = 0
+# Home page live statistics are recomputed at most this often
+LIVE_STATS_TTL = 30
+LOAN_SCHEDULE_CACHE_SIZE = 1024
+# Monte Carlo scenarios behind each Contributor's risk sections
+RISK_SIMULATIONS = 20_000
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _cached(func):
+    return st.cache_data(ttl=DASHBOARD_TTL, max_entries=DASHBOARD_MAX_ENTRIES, show_spinner=False)(func)
+
+
+@_cached
+def active_users(user_id, months):
+    return pd.DataFrame({
+        "Month": MONTHS[:months],
+        "Active Users": [random.randint(1000, 5000) for _ in range(months)]
+    }).set_index("Month")
+
+
+# Live counts from the application pipeline; not cached, reading them is
+# O(1)
+def pending_applications(user_id, months):
+    pending = get_application_pipeline().pending()
+    return pd.DataFrame({
+        "Type": PENDING_TYPES,
+        "Count": [pending[stage] for stage in PENDING_TYPES]
+    }).set_index("Type")
+
+
+@_cached
+def loan_usage(user_id, months):
+    return pd.DataFrame({
+        "Category": ["Seeds", "Equipment", "Fertilizers", "Labor"],
+        "Amount Used (₹)": [random.randint(10000, 50000) for _ in range(4)]
+    }).set_index("Category")
+
+
+class LoanBook:
+    # Loans shared by every session, sorted by borrower so each user's loans
+    # are one contiguous slice. add() swaps in a new frame, so a reader
+    # always sees a whole book.
+    def __init__(self, loans):
+        self.loans = loans.sort_values("borrower_id", kind="stable", ignore_index=True)
+        self._next_id = int(loans["loan_id"].max()) + 1 if len(loans) else FIRST_LOAN_ID
+        self._lock = threading.Lock()
+
+    def add(self, loans):
+        # loans: frame in the generate_loan_book schema without loan_id;
+        # returns it with the loan ids it was booked under
+        with self._lock:
+            loans = loans.assign(loan_id=np.arange(self._next_id, self._next_id + len(loans)))
+            self._next_id += len(loans)
+            self.loans = pd.concat([self.loans, loans[self.loans.columns]], ignore_index=True).sort_values(
+                "borrower_id", kind="stable", ignore_index=True
+            )
+        return loans
+
+
+@st.cache_resource(show_spinner=False)
+def get_loan_book():
+    return LoanBook(generate_loan_book(
+        SYNTHETIC_LOANS, borrowers=SYNTHETIC_BORROWERS, contributors=SYNTHETIC_CONTRIBUTORS
+    ))
+
+
+def loan_book():
+    return get_loan_book().loans
+
+
+# Running totals over the loan book; loans added to or removed from the
+# book go through portfolio_stats().add()/remove()
+@st.cache_resource(show_spinner=False)
+def portfolio_stats():
+    return PortfolioStats.from_loans(loan_book())
+
+
+def issue_loan(application):
+    # Books an application approved by an Admin as a loan from next month,
+    # unassigned to a Contributor, and adds it to the running totals.
+    # Returns the loan id.
+    loans = get_loan_book().add(pd.DataFrame({
+        "borrower_id": [application["user_id"]],
+        "contributor_id": [UNFUNDED],
+        "principal": [application["amount"]],
+        "annual_rate": [APPROVED_LOAN_RATE],
+        "months": [application["months"]],
+        "start_month": [this_month() + 1],
+    }))
+    portfolio_stats().add(loans)
+    # Drop cached views of the book so the borrower and the totals see it
+    user_loans.clear()
+    monthly_payments.clear()
+    live_stats.clear()
+    return int(loans["loan_id"].iloc[0])
+
+
+@_cached
+def user_loans(user_id):
+    book = loan_book()
+    if user_id is None:
+        loans = book.iloc[:0]
+    else:
+        start, stop = np.searchsorted(book["borrower_id"].to_numpy(), [user_id, user_id + 1])
+        loans = book.iloc[start:stop]
+    term = loans["months"].to_numpy()
+    paid = paid_instalments(loans["start_month"].to_numpy(), term)
+    return pd.DataFrame({
+        "Loan ID": loans["loan_id"].to_numpy(),
+        "Amount (₹)": loans["principal"].to_numpy(),
+        "Interest Rate (%)": loans["annual_rate"].to_numpy(),
+        "Term (months)": term,
+        "First Instalment": loans["start_month"].to_numpy().astype("datetime64[M]").astype(str),
+        "EMI (₹)": emi(loans["principal"], loans["annual_rate"], term).round(2),
+        "Instalments Paid": paid,
+        "Status": np.where(paid == term, "Paid", "Active"),
+    }).set_index("Loan ID")
+
+
+# Metrics for the Home page "Live Statistics" column: (label, value, help)
+# rows read from running totals, so each refresh is O(1) in the size of
+# the portfolio. Shared by every session for LIVE_STATS_TTL seconds.
+@st.cache_data(ttl=LIVE_STATS_TTL, max_entries=DASHBOARD_MAX_ENTRIES, show_spinner=False)
+def live_stats(role, user_id):
+    stats = portfolio_stats()
+    if role == "Admin":
+        scores = load_score_table()
+        bands = " · ".join(f"{band}: {count:,}" for band, count in scores.band_counts().items())
+        overall = stats.overall()
+        return [
+            ("👥 Registered Users", f"{get_user_store().user_count():,}", None),
+            ("📊 Average Credit Score", f"{scores.average_score():.0f}", f"Risk bands: {bands}"),
+            ("💰 Total Credit Issued", f"₹{overall['principal']:,.0f}", f"{overall['loans']:,} loans"),
+        ]
+    if role == "Contributor":
+        funded = stats.contributor(user_id)
+        return [
+            ("💵 Amount Invested", f"₹{funded['principal']:,.0f}", f"{funded['loans']:,} loans"),
+            ("📉 Rate of Interest Allocated", f"{funded['average_rate']:.2f}%", "Weighted by amount"),
+            ("📈 Expected Profit", f"₹{funded['interest']:,.0f}", "Interest over the full loan terms"),
+        ]
+    if role == "Farmer":
+        borrowed = stats.borrower(user_id)
+        return [
+            ("💳 Credit Limit", f"₹{MAX_PRINCIPAL:,}", "Per loan"),
+            ("📉 Rate of Interest", f"{borrowed['average_rate']:.2f}%", "Weighted by amount"),
+            ("📊 Credit Amount", f"₹{borrowed['principal']:,.0f}", f"{borrowed['loans']:,} loans"),
+        ]
+    return []
+
+
+# Schedules depend only on the loan terms, so they are cached per loan and
+# shared by every session without expiry
+@st.cache_data(max_entries=LOAN_SCHEDULE_CACHE_SIZE, show_spinner=False)
+def loan_schedule(principal, annual_rate, months):
+    return schedule_frame(principal, annual_rate, months)
+
+
+@_cached
+def monthly_payments(user_id, months):
+    # Instalments due over the next `months` calendar months
+    loans = user_loans(user_id)
+    start_month = [month_number(month) for month in loans["First Instalment"]]
+    first_month = this_month()
+    due = payments_by_month(loans["EMI (₹)"], start_month, loans["Term (months)"], first_month, months)
+    return pd.DataFrame({
+        "Month": month_starts(first_month, months),
+        "Payment (₹)": due.round(2),
+    }).set_index("Month")
+
+
+def borrower_bands(borrower_ids):
+    # Index into RISK_BANDS per borrower. Until Farmers' Aadhaar numbers are
+    # stored with their loans, borrower ids map onto land records in order.
+    return load_score_table().bands_at(np.asarray(borrower_ids) - 1)
+
+
+@_cached
+def contributor_risk(user_id):
+    # Simulated profit over the remaining terms of the loans this
+    # Contributor funds that are still being repaid
+    book = loan_book()
+    loans = book[book["contributor_id"].to_numpy() == user_id]
+    term = loans["months"].to_numpy()
+    paid = paid_instalments(loans["start_month"].to_numpy(), term)
+    active = paid < term
+    balance, interest = outstanding(
+        loans["principal"].to_numpy()[active], loans["annual_rate"].to_numpy()[active], term[active], paid[active]
+    )
+    portfolio = Portfolio(balance, interest, borrower_bands(loans["borrower_id"].to_numpy()[active]))
+    return summarize(portfolio, simulate(portfolio, RISK_SIMULATIONS, seed=user_id or 0))
+
+
+def _ordered(labels, name):
+    # Bar charts keep the order of an ordered categorical index
+    return pd.CategoricalIndex(labels, categories=labels, ordered=True, name=name)
+
+
+@_cached
+def risk_exposure(user_id, months):
+    exposure = contributor_risk(user_id)["exposure_by_band"]
+    return pd.DataFrame(
+        {"Outstanding (₹)": [round(exposure[band]) for band in RISK_BANDS]},
+        index=_ordered([f"{band} Risk" for band in RISK_BANDS], "Borrower Risk"),
+    )
+
+
+@_cached
+def simulated_profit(user_id, months):
+    # Expected profit, then the profit in the worst 10% ... 0.1% of
+    # scenarios (interest due less the losses at that quantile)
+    risk = contributor_risk(user_id)
+    labels = ["Expected"]
+    profit = [risk["expected_profit"]]
+    for quantile, loss in risk["loss_quantiles"].items():
+        if quantile > 0.5:
+            labels.append(f"Worst {(1 - quantile) * 100:g}%")
+            profit.append(risk["interest"] - loss)
+    return pd.DataFrame({"Profit (₹)": np.round(profit)}, index=_ordered(labels, "Scenario"))
+
+
+# Sections shown per role: (title, chart type, provider, months)
+DASHBOARD_SECTIONS = {
+    "Admin": [
+        ("Active Users Over Time", "line", active_users, 6),
+        ("Pending Applications by Type", "bar", pending_applications, 6),
+    ],
+    "Contributor": [
+        ("Outstanding Exposure by Borrower Risk", "bar", risk_exposure, 4),
+        ("Simulated Profit Over Remaining Terms", "bar", simulated_profit, 4),
+    ],
+    "Farmer": [
+        ("Loan Usage Breakdown", "bar", loan_usage, 4),
+        ("Upcoming Monthly Payments", "line", monthly_payments, 6),
+    ],
+}
+
+
+# Daily rollup shared by every session; new transactions are appended to it
+# in place, so the Analytics page never rescans the transaction log.
+@st.cache_resource(show_spinner=False)
+def transaction_rollup():
+    end_day = today()
+    first_day = end_day - ANALYTICS_HISTORY_DAYS + 1
+    return build_rollup(
+        generate_transactions(SYNTHETIC_TRANSACTIONS, ANALYTICS_HISTORY_DAYS, end_day), first_day
+    )
@@ -0,0 +1,147 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from credit_scoring import build_land_index
+from instrumentation import timed
+from kyc import build_aadhaar_index
+from land_registry import META_FILE, open_registry
+from score_table import ScoreTable
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+AADHAAR_PATH = os.path.join(DATA_DIR, "aadhar.csv")
+LAND_RECORDS_PATH = os.path.join(DATA_DIR, "land_records.csv")
+# Memory-mapped registry built with `python land_registry.py`
+LAND_REGISTRY_DIR = os.path.join(DATA_DIR, "land_registry")
+# Daily land-record change files applied to the score table
+LAND_CHANGES_DIR = os.path.join(DATA_DIR, "land_changes")
+
+# Compact column types: fixed-width integer IDs and categoricals for the
+# low-cardinality text columns instead of int64/object defaults.
+DATASET_DTYPES = {
+    "aadhaar": {
+        "aadhaar_number": "int64",
+        "name": "string[pyarrow]",
+        "age": "uint8",
+        "address": "category",
+    },
+    "land_records": {
+        "aadhaar_number": "int64",
+        "land_size": "int32",
+        "crop_type": "category",
+    },
+}
+
+# Set HARVEST_PARQUET_SIDECAR=1 to write a .parquet copy next to each CSV on
+# first load so later cold starts skip CSV parsing.
+SIDECAR_ENABLED = os.environ.get("HARVEST_PARQUET_SIDECAR", "0") == "1"
+
+
+def sidecar_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def file_version(path):
+    return os.stat(path).st_mtime_ns
+
+
+def land_path():
+    # The land registry when it is at least as new as the CSV it is built
+    # from (the same rule as the Parquet sidecar), else the CSV. Either is
+    # accepted wherever a land path is.
+    meta = os.path.join(LAND_REGISTRY_DIR, META_FILE)
+    if os.path.exists(meta) and (
+        not os.path.exists(LAND_RECORDS_PATH) or file_version(meta) >= file_version(LAND_RECORDS_PATH)
+    ):
+        return LAND_REGISTRY_DIR
+    return LAND_RECORDS_PATH
+
+
+def land_version(path):
+    return file_version(os.path.join(path, META_FILE) if os.path.isdir(path) else path)
+
+
+def read_dataset(path, dataset, sidecar=False):
+    # Uncached read; prefer the Parquet sidecar when it is at least as new
+    # as the CSV it was built from.
+    dtypes = DATASET_DTYPES[dataset]
+    parquet = sidecar_path(path)
+    if os.path.exists(parquet) and file_version(parquet) >= file_version(path):
+        return pd.read_parquet(parquet)
+
+    frame = pd.read_csv(path, dtype=dtypes, usecols=list(dtypes))
+    if sidecar:
+        try:
+            frame.to_parquet(parquet, index=False)
+        except (ImportError, OSError):
+            # No pyarrow or read-only data dir: keep serving from CSV
+            pass
+    return frame
+
+
+# Cached once per process and shared across sessions and reruns. The file
+# version is part of the cache key, so editing the CSV reloads it. Callers
+# must treat the returned frames as read-only.
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_dataset(path, version, dataset, sidecar):
+    return read_dataset(path, dataset, sidecar)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_land_index(path, version, sidecar):
+    return build_land_index(_load_dataset(path, version, "land_records", sidecar))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_aadhaar_index(path, version, sidecar):
+    return build_aadhaar_index(_load_dataset(path, version, "aadhaar", sidecar))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_score_table(path, version, sidecar):
+    # Built straight from the memory-mapped columns when `path` is a land
+    # registry, so the CSV is never parsed and no DataFrame is kept
+    if os.path.isdir(path):
+        return ScoreTable(_load_land_registry(path, version))
+    return ScoreTable(_load_land_index(path, version, sidecar))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_land_registry(path, version):
+    return open_registry(path)
+
+
+@timed("data.load_aadhaar_data")
+def load_aadhaar_data(path=AADHAAR_PATH, sidecar=SIDECAR_ENABLED):
+    return _load_dataset(path, file_version(path), "aadhaar", sidecar)
+
+
+@timed("data.load_aadhaar_index")
+def load_aadhaar_index(path=AADHAAR_PATH, sidecar=SIDECAR_ENABLED):
+    return _load_aadhaar_index(path, file_version(path), sidecar)
+
+
+@timed("data.load_land_records")
+def load_land_records(path=LAND_RECORDS_PATH, sidecar=SIDECAR_ENABLED):
+    return _load_dataset(path, file_version(path), "land_records", sidecar)
+
+
+@timed("data.load_land_index")
+def load_land_index(path=LAND_RECORDS_PATH, sidecar=SIDECAR_ENABLED):
+    return _load_land_index(path, file_version(path), sidecar)
+
+
+@timed("data.load_land_registry")
+def load_land_registry(path=LAND_REGISTRY_DIR):
+    return _load_land_registry(path, land_version(path))
+
+
+@timed("data.load_score_table")
+def load_score_table(path=None, changes_dir=LAND_CHANGES_DIR, sidecar=SIDECAR_ENABLED):
+    # Scores as of the land records (see land_path) plus every change file
+    # applied so far
+    path = path or land_path()
+    table = _load_score_table(path, land_version(path), sidecar)
+    table.sync(changes_dir)
+    return table
@@ -0,0 +1,191 @@
+import bisect
+import functools
+import math
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# HARVEST_INSTRUMENT=1 records wall time and call counts; =alloc also
+# records net allocated bytes through tracemalloc (much slower). Read once
+# at import: with it unset, @timed returns functions untouched.
+_MODE = os.environ.get("HARVEST_INSTRUMENT", "0")
+ENABLED = _MODE in ("1", "alloc")
+TRACE_ALLOCATIONS = _MODE == "alloc"
+
+METRICS_FILE = os.environ.get(
+    "HARVEST_METRICS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "metrics.prom"),
+)
+EXPORT_INTERVAL = 15.0
+
+# Histogram bucket upper bounds in seconds, Prometheus style. Starts well
+# below 1 ms: cached loaders and batch lookups usually finish in tens to
+# hundreds of microseconds.
+BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf,
+)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count", "alloc_bytes")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+        self.alloc_bytes = 0
+
+
+class Registry:
+    # Process-wide timings, one histogram per instrumented name
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._last_export = 0.0
+
+    def observe(self, name, seconds, alloc_bytes=0):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+            histogram.total += seconds
+            histogram.count += 1
+            histogram.alloc_bytes += alloc_bytes
+
+    def snapshot(self):
+        # One row per name: calls, total/mean time, approximate p50/p99
+        # (bucket upper bounds) and net allocations
+        with self._lock:
+            items = [(name, list(h.counts), h.total, h.count, h.alloc_bytes)
+                     for name, h in self._histograms.items()]
+        rows = []
+        for name, counts, total, count, alloc_bytes in sorted(items):
+            rows.append({
+                "name": name,
+                "calls": count,
+                "total_s": total,
+                "mean_ms": total / count * 1000 if count else 0.0,
+                "p50_ms": _quantile(counts, count, 0.5) * 1000,
+                "p99_ms": _quantile(counts, count, 0.99) * 1000,
+                "alloc_kib": alloc_bytes / 1024,
+            })
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self):
+        with self._lock:
+            items = [(name, list(h.counts), h.total, h.count, h.alloc_bytes)
+                     for name, h in sorted(self._histograms.items())]
+        lines = [
+            "# HELP harvest_call_seconds Wall time of instrumented calls.",
+            "# TYPE harvest_call_seconds histogram",
+        ]
+        for name, counts, total, count, _ in items:
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS, counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f'harvest_call_seconds_bucket{{name="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'harvest_call_seconds_sum{{name="{name}"}} {total}')
+            lines.append(f'harvest_call_seconds_count{{name="{name}"}} {count}')
+        if TRACE_ALLOCATIONS:
+            lines.append("# HELP harvest_call_alloc_bytes_total Net bytes allocated by instrumented calls.")
+            lines.append("# TYPE harvest_call_alloc_bytes_total counter")
+            for name, _, _, _, alloc_bytes in items:
+                lines.append(f'harvest_call_alloc_bytes_total{{name="{name}"}} {alloc_bytes}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path=METRICS_FILE):
+        # Write to a temp file and rename so scrapers never see half a file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+    def maybe_export(self, path=METRICS_FILE, interval=EXPORT_INTERVAL):
+        # Called once per rerun; writes the export file at most every
+        # `interval` seconds
+        if not ENABLED:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_export < interval:
+                return
+            self._last_export = now
+        try:
+            self.write_prometheus(path)
+        except OSError:
+            pass
+
+
+def _quantile(counts, count, q):
+    if not count:
+        return 0.0
+    target = q * count
+    cumulative = 0
+    for bound, bucket_count in zip(BUCKETS, counts):
+        cumulative += bucket_count
+        if cumulative >= target:
+            return bound if bound != math.inf else BUCKETS[-2]
+    return BUCKETS[-2]
+
+
+REGISTRY = Registry()
+
+if TRACE_ALLOCATIONS and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+
+_UNTRACKED = nullcontext()
+
+
+def track(name, registry=REGISTRY):
+    # Records the with-block under `name`. When instrumentation is off this
+    # returns a shared no-op context manager, so the block costs nothing
+    # beyond the with statement itself.
+    if not ENABLED:
+        return _UNTRACKED
+    return _track(name, registry)
+
+
+@contextmanager
+def _track(name, registry):
+    alloc_start = tracemalloc.get_traced_memory()[0] if TRACE_ALLOCATIONS else 0
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        alloc = tracemalloc.get_traced_memory()[0] - alloc_start if TRACE_ALLOCATIONS else 0
+        registry.observe(name, elapsed, max(alloc, 0))
+
+
+def timed(name, enabled=None, registry=REGISTRY):
+    # Decorator recording every call of the function under `name`
+    enabled = ENABLED if enabled is None else enabled
+
+    def decorate(func):
+        if not enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            alloc_start = tracemalloc.get_traced_memory()[0] if TRACE_ALLOCATIONS else 0
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                alloc = tracemalloc.get_traced_memory()[0] - alloc_start if TRACE_ALLOCATIONS else 0
+                registry.observe(name, elapsed, max(alloc, 0))
+
+        return wrapper
+
+    return decorate
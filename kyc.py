@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from credit_scoring import to_aadhaar_array
+
+MIN_AGE = 18
+# Years an applicant's stated age may differ from the Aadhaar record, which
+# doesn't move with birthdays
+AGE_TOLERANCE = 1
+
+# Reasons KYC fails, in the order they are checked; an applicant gets the
+# first that applies
+KYC_REASONS = {
+    "aadhaar_not_found": "Aadhaar number not found",
+    "name_mismatch": "Name doesn't match the Aadhaar record",
+    "age_mismatch": "Age doesn't match the Aadhaar record",
+    "address_mismatch": "State doesn't match the Aadhaar record",
+    "under_age": f"Applicant is under {MIN_AGE}",
+}
+
+
+def text_hashes(values):
+    # 64-bit hash of each value with case, surrounding and repeated spaces
+    # ignored, so names compare as integers
+    text = pd.Series(values, dtype=object).fillna("").astype(str)
+    text = text.str.casefold().str.split().str.join(" ")
+    return pd.util.hash_array(text.to_numpy(dtype=object), categorize=False).view(np.int64)
+
+
+# Aadhaar records sorted by number, joined to a batch of applicants with one
+# searchsorted instead of a DataFrame filter per applicant
+class AadhaarIndex:
+    def __init__(self, aadhaar_data):
+        keys = aadhaar_data["aadhaar_number"].to_numpy(dtype=np.int64)
+        # Stable sort so the first record per Aadhaar number wins
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        order = order[first]
+        self.keys = keys[first]
+        self.name = text_hashes(aadhaar_data["name"].to_numpy(dtype=object))[order]
+        self.age = aadhaar_data["age"].to_numpy(dtype=np.int16)[order]
+        self.address = _category_hashes(aadhaar_data["address"])[order]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def verify(self, aadhaar_numbers, names, ages, addresses):
+        # Index into KYC_REASONS of each applicant's failure, -1 if verified
+        ids = to_aadhaar_array(aadhaar_numbers)
+        reason = np.full(len(ids), -1, dtype=np.int8)
+        if len(self.keys) == 0:
+            reason[:] = 0
+            return reason
+        positions = np.searchsorted(self.keys, ids)
+        np.minimum(positions, len(self.keys) - 1, out=positions)
+        ages = np.asarray(ages, dtype=np.int16)
+        record_age = self.age[positions]
+        # Checked last to first, so the earliest failing check is kept
+        checks = [
+            self.keys[positions] != ids,
+            self.name[positions] != text_hashes(names),
+            np.abs(record_age - ages) > AGE_TOLERANCE,
+            self.address[positions] != text_hashes(addresses),
+            record_age < MIN_AGE,
+        ]
+        for code in range(len(checks) - 1, -1, -1):
+            reason[checks[code]] = code
+        return reason
+
+
+def _category_hashes(column):
+    # Categorical columns only need each category hashed once
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        hashes = text_hashes(column.cat.categories.to_numpy(dtype=object))
+        codes = column.cat.codes.to_numpy()
+        return np.where(codes >= 0, hashes[codes], text_hashes([""])[0])
+    return text_hashes(column.to_numpy(dtype=object))
+
+
+def build_aadhaar_index(aadhaar_data):
+    return AadhaarIndex(aadhaar_data)
@@ -0,0 +1,228 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from credit_scoring import to_aadhaar_array
+
+# On-disk columnar land registry: one raw little-endian file per column,
+# rows sorted by aadhaar_number, opened with np.memmap so lookups only page
+# in the parts of each column they touch.
+#
+# Each conversion writes its column files into a new generation directory
+# inside the registry and then atomically replaces meta.json, which names
+# that generation. Column files are never rewritten, so a registry that is
+# already open keeps reading the generation it opened, and a conversion
+# that dies part way leaves the previous registry in place.
+COLUMN_DTYPES = {
+    "aadhaar_number": np.dtype("<i8"),
+    "land_size": np.dtype("<i4"),
+    "crop_code": np.dtype("<i2"),
+}
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+# Rows are bucketed by Aadhaar range while converting so each bucket can be
+# sorted in memory on its own; the buckets concatenate into one sorted file.
+NUM_BUCKETS = 256
+BUCKET_WIDTH = 10**12 // NUM_BUCKETS + 1
+RECORD_DTYPE = np.dtype([(name, dtype) for name, dtype in COLUMN_DTYPES.items()])
+
+
+class LandRegistry:
+    def __init__(self, path):
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported land registry version {meta['version']} in {path}")
+        self.path = path
+        self.rows = meta["rows"]
+        self.crops = meta["crops"]
+        # Registries written before generations keep their columns in path
+        data_dir = os.path.join(path, meta.get("data", ""))
+        self.columns = {}
+        for name, dtype in COLUMN_DTYPES.items():
+            if self.rows:
+                self.columns[name] = np.memmap(
+                    os.path.join(data_dir, f"{name}.bin"), dtype=dtype, mode="r", shape=(self.rows,)
+                )
+            else:
+                self.columns[name] = np.zeros(0, dtype=dtype)
+        self.keys = self.columns["aadhaar_number"]
+        self.land_size = self.columns["land_size"]
+        self.crop_name_len = np.array([len(crop) for crop in self.crops] + [0], dtype=np.int64)
+
+    def land_columns(self, start, stop):
+        # Same contract as credit_scoring.LandIndex.land_columns; reads only
+        # those rows of each column
+        crop_code = np.asarray(self.columns["crop_code"][start:stop], dtype=np.int64)
+        return np.asarray(self.land_size[start:stop]), self.crop_name_len[crop_code]
+
+    def __len__(self):
+        return self.rows
+
+    def _positions(self, ids):
+        # Search with sorted needles so the binary searches walk the key
+        # column in order instead of hopping around it
+        order = np.argsort(ids, kind="stable")
+        positions = np.empty(len(ids), dtype=np.int64)
+        positions[order] = np.searchsorted(self.keys, ids[order])
+        np.minimum(positions, self.rows - 1, out=positions)
+        return positions
+
+    def lookup(self, aadhaar_numbers):
+        # Same contract as credit_scoring.LandIndex.lookup
+        ids = to_aadhaar_array(aadhaar_numbers)
+        if self.rows == 0:
+            empty = np.zeros(len(ids), dtype=np.int64)
+            return np.zeros(len(ids), dtype=bool), empty, empty
+        positions = self._positions(ids)
+        found = self.keys[positions] == ids
+        land_size = np.asarray(self.columns["land_size"][positions], dtype=np.int64)
+        crop_code = np.asarray(self.columns["crop_code"][positions], dtype=np.int64)
+        return found, land_size, self.crop_name_len[crop_code]
+
+    def records(self, aadhaar_numbers):
+        # Matching rows as a DataFrame in the land_records.csv schema
+        ids = to_aadhaar_array(aadhaar_numbers)
+        if self.rows == 0:
+            positions = np.zeros(0, dtype=np.int64)
+        else:
+            positions = self._positions(ids)
+            positions = positions[self.keys[positions] == ids]
+        return pd.DataFrame({
+            "aadhaar_number": np.asarray(self.keys[positions]),
+            "land_size": np.asarray(self.columns["land_size"][positions]),
+            "crop_type": pd.Categorical.from_codes(
+                np.asarray(self.columns["crop_code"][positions]), self.crops
+            ),
+        })
+
+
+def open_registry(path):
+    return LandRegistry(path)
+
+
+def current_generation(path):
+    # Generation directory meta.json points at, or None
+    try:
+        with open(os.path.join(path, META_FILE)) as f:
+            return json.load(f).get("data")
+    except FileNotFoundError:
+        return None
+
+
+def convert_csv(csv_path, out_dir, chunksize=1_000_000):
+    # Convert a land_records.csv-schema file into a registry directory
+    # without holding the whole file in memory.
+    os.makedirs(out_dir, exist_ok=True)
+    previous = current_generation(out_dir)
+    generation = os.path.basename(tempfile.mkdtemp(prefix="gen-", dir=out_dir))
+    data_dir = os.path.join(out_dir, generation)
+    try:
+        rows, crops = _write_columns(csv_path, data_dir, chunksize)
+        meta = {
+            "version": FORMAT_VERSION,
+            "rows": rows,
+            "crops": crops,
+            "columns": {name: dtype.str for name, dtype in COLUMN_DTYPES.items()},
+            "data": generation,
+        }
+        tmp = os.path.join(out_dir, META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(out_dir, META_FILE))
+    except BaseException:
+        shutil.rmtree(data_dir, ignore_errors=True)
+        raise
+    # The generation just replaced stays for readers that read the old
+    # meta.json but haven't mapped its columns yet; anything older (or left
+    # by a failed conversion) goes. Mapped files outlive their removal.
+    for name in os.listdir(out_dir):
+        if name.startswith("gen-") and name not in (generation, previous):
+            shutil.rmtree(os.path.join(out_dir, name), ignore_errors=True)
+    return open_registry(out_dir)
+
+
+def _write_columns(csv_path, data_dir, chunksize):
+    # Column files for the CSV in data_dir; returns the row count and crop
+    # names in code order
+    bucket_dir = os.path.join(data_dir, "_buckets")
+    os.makedirs(bucket_dir, exist_ok=True)
+    crops = {}
+    try:
+        buckets = [open(os.path.join(bucket_dir, f"{i}.bin"), "wb") for i in range(NUM_BUCKETS)]
+        try:
+            for chunk in pd.read_csv(
+                csv_path,
+                usecols=["aadhaar_number", "land_size", "crop_type"],
+                dtype={"aadhaar_number": "int64", "land_size": "int32", "crop_type": "category"},
+                chunksize=chunksize,
+            ):
+                _write_buckets(chunk, crops, buckets)
+        finally:
+            for f in buckets:
+                f.close()
+
+        rows = 0
+        outputs = {name: open(os.path.join(data_dir, f"{name}.bin"), "wb") for name in COLUMN_DTYPES}
+        try:
+            for i in range(NUM_BUCKETS):
+                records = np.fromfile(os.path.join(bucket_dir, f"{i}.bin"), dtype=RECORD_DTYPE)
+                # Stable sort keeps file order among duplicates; first one wins
+                records = records[np.argsort(records["aadhaar_number"], kind="stable")]
+                keys = records["aadhaar_number"]
+                first = np.ones(len(records), dtype=bool)
+                first[1:] = keys[1:] != keys[:-1]
+                records = records[first]
+                for name, f in outputs.items():
+                    f.write(np.ascontiguousarray(records[name]).tobytes())
+                rows += len(records)
+            for f in outputs.values():
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            for f in outputs.values():
+                f.close()
+    finally:
+        shutil.rmtree(bucket_dir, ignore_errors=True)
+    return rows, sorted(crops, key=crops.get)
+
+
+def _write_buckets(chunk, crops, buckets):
+    # Map this chunk's crop categories onto registry-wide codes
+    crop_type = chunk["crop_type"]
+    for crop in crop_type.cat.categories:
+        crops.setdefault(str(crop), len(crops))
+    # Missing crop types get the code one past the last crop (name length 0)
+    category_codes = np.array([crops[str(c)] for c in crop_type.cat.categories] + [-1], dtype=np.int16)
+    codes = category_codes[crop_type.cat.codes.to_numpy()]
+
+    records = np.empty(len(chunk), dtype=RECORD_DTYPE)
+    records["aadhaar_number"] = chunk["aadhaar_number"].to_numpy()
+    records["land_size"] = chunk["land_size"].to_numpy()
+    records["crop_code"] = codes
+    bucket_ids = np.clip(records["aadhaar_number"] // BUCKET_WIDTH, 0, NUM_BUCKETS - 1)
+    order = np.argsort(bucket_ids, kind="stable")
+    records, bucket_ids = records[order], bucket_ids[order]
+    bounds = np.searchsorted(bucket_ids, np.arange(NUM_BUCKETS + 1))
+    for i in range(NUM_BUCKETS):
+        if bounds[i] < bounds[i + 1]:
+            buckets[i].write(records[bounds[i]:bounds[i + 1]].tobytes())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert land_records.csv into a memory-mapped land registry")
+    parser.add_argument("csv_path")
+    parser.add_argument("out_dir")
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    args = parser.parse_args()
+    registry = convert_csv(args.csv_path, args.out_dir, args.chunksize)
+    print(f"Wrote {len(registry):,} land records to {args.out_dir}")
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+# Advertised loan range and rates
+MIN_PRINCIPAL = 15_000
+MAX_PRINCIPAL = 300_000
+BASE_RATE = 8.0  # annual %, the starting rate
+MAX_RATE = 24.0
+MAX_TERM = 60  # months
+FIRST_LOAN_ID = 10101
+
+SCHEDULE_COLUMNS = ["Payment (₹)", "Principal (₹)", "Interest (₹)", "Balance (₹)"]
+
+
+def month_number(month):
+    # "YYYY-MM" (or anything np.datetime64 accepts) -> months since 1970-01
+    return int(np.datetime64(month, "M").astype(np.int64))
+
+
+def this_month():
+    return month_number(np.datetime64("today", "M"))
+
+
+def month_starts(first_month, months):
+    return pd.DatetimeIndex(np.arange(first_month, first_month + months).astype("datetime64[M]"))
+
+
+def validate_loans(principal, annual_rate, months):
+    principal = np.asarray(principal, dtype=np.float64)
+    annual_rate = np.asarray(annual_rate, dtype=np.float64)
+    months = np.asarray(months, dtype=np.int64)
+    if np.any((principal < MIN_PRINCIPAL) | (principal > MAX_PRINCIPAL)):
+        raise ValueError(f"Loan amounts must be between ₹{MIN_PRINCIPAL:,} and ₹{MAX_PRINCIPAL:,}")
+    if np.any((annual_rate < 0) | (annual_rate > MAX_RATE)):
+        raise ValueError(f"Interest rates must be between 0% and {MAX_RATE}%")
+    if np.any((months < 1) | (months > MAX_TERM)):
+        raise ValueError(f"Loan terms must be between 1 and {MAX_TERM} months")
+    return principal, annual_rate, months
+
+
+def emi(principal, annual_rate, months):
+    # Equated monthly instalment for each loan (reducing balance, monthly
+    # compounding). Inputs broadcast; zero-rate loans repay evenly.
+    principal, annual_rate, months = validate_loans(principal, annual_rate, months)
+    return _emi(principal, annual_rate / 1200, months)
+
+
+def _emi(principal, rate, months):
+    growth = (1 + rate) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payment = principal * rate * growth / (growth - 1)
+    return np.where(rate > 0, payment, principal / months)
+
+
+def amortization(principal, annual_rate, months, dtype=np.float64):
+    # Full schedules for a batch of loans as (loans x longest term) arrays:
+    # payment, principal repaid, interest and closing balance per month.
+    # Months past a loan's term are zero. Balances come from the closed
+    # form B_k = (P - E/r) g^k + E/r with g = 1 + r, built in place from a
+    # running product, so no month waits on a Python loop over the last.
+    principal, annual_rate, months = np.broadcast_arrays(*validate_loans(principal, annual_rate, months))
+    rate = annual_rate / 1200
+    payment = _emi(principal, rate, months)
+    term = int(months.max()) if months.size else 0
+    k = np.arange(term + 1)
+
+    balance = np.empty((len(principal), term + 1))
+    balance[:, 0] = 1
+    balance[:, 1:] = (1 + rate)[:, None]
+    np.cumprod(balance, axis=1, out=balance)
+    zero = rate == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(zero, 0, payment / rate)
+    balance *= (principal - annuity)[:, None]
+    balance += annuity[:, None]
+    if zero.any():
+        balance[zero] = principal[zero, None] - payment[zero, None] * k
+    np.maximum(balance, 0, out=balance)
+    balance *= k <= months[:, None]
+
+    interest = balance[:, :-1] * rate[:, None]
+    principal_paid = balance[:, :-1] - balance[:, 1:]
+    return {
+        "payment": (interest + principal_paid).astype(dtype, copy=False),
+        "principal": principal_paid.astype(dtype, copy=False),
+        "interest": interest.astype(dtype, copy=False),
+        "balance": balance[:, 1:].astype(dtype, copy=False),
+    }
+
+
+def iter_amortization(principal, annual_rate, months, chunk_size=50_000, dtype=np.float64):
+    # Schedules for a whole loan book in chunks of `chunk_size` loans, so
+    # memory stays bounded at chunk_size x longest term per array
+    principal, annual_rate, months = np.broadcast_arrays(
+        np.asarray(principal), np.asarray(annual_rate), np.asarray(months)
+    )
+    for start in range(0, len(principal), chunk_size):
+        stop = start + chunk_size
+        yield start, amortization(principal[start:stop], annual_rate[start:stop], months[start:stop], dtype)
+
+
+def schedule_frame(principal, annual_rate, months):
+    # Month-by-month schedule of one loan for display
+    schedule = amortization([principal], [annual_rate], [months])
+    return pd.DataFrame(
+        {column: schedule[key][0].round(2) for column, key in zip(
+            SCHEDULE_COLUMNS, ["payment", "principal", "interest", "balance"]
+        )},
+        index=pd.RangeIndex(1, months + 1, name="Month"),
+    )
+
+
+def payments_by_month(payment, start_month, months, first_month, n_months):
+    # Total instalments due in each of the n_months calendar months from
+    # first_month, across every loan. Each loan adds its EMI at its first
+    # month and removes it after its last, so this is O(loans + months).
+    payment = np.asarray(payment, dtype=np.float64)
+    start = np.asarray(start_month, dtype=np.int64) - first_month
+    stop = start + np.asarray(months, dtype=np.int64)
+    delta = np.zeros(n_months + 1)
+    np.add.at(delta, np.clip(start, 0, n_months), payment)
+    np.add.at(delta, np.clip(stop, 0, n_months), -payment)
+    return np.cumsum(delta[:-1])
+
+
+def outstanding(principal, annual_rate, months, paid):
+    # Balance still owed on each loan after `paid` instalments, and the
+    # interest its remaining instalments carry
+    principal, annual_rate, months = validate_loans(principal, annual_rate, months)
+    paid = np.asarray(paid, dtype=np.int64)
+    rate = annual_rate / 1200
+    payment = _emi(principal, rate, months)
+    growth = (1 + rate) ** paid
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balance = np.where(rate > 0, principal * growth - payment * (growth - 1) / rate, principal - payment * paid)
+    balance = np.maximum(balance, 0)
+    return balance, np.maximum(payment * (months - paid) - balance, 0)
+
+
+def paid_instalments(start_month, months, current_month=None):
+    current_month = this_month() if current_month is None else current_month
+    return np.clip(current_month - np.asarray(start_month), 0, np.asarray(months))
+
+
+def generate_loan_book(n, first_month=None, seed=0, borrowers=None, contributors=None):
+    # Synthetic loan book for testing: amounts across the advertised range,
+    # rates from BASE_RATE up, common terms, starts over the last five
+    # years, spread over `borrowers` Farmers and funded by `contributors`
+    # Contributors (user ids from 1)
+    first_month = this_month() - MAX_TERM if first_month is None else first_month
+    borrowers = borrowers or max(n // 4, 1)
+    contributors = contributors or max(n // 100, 1)
+    rng = np.random.default_rng(seed)
+    principal = np.round(rng.uniform(MIN_PRINCIPAL, MAX_PRINCIPAL, n), -3)
+    annual_rate = np.round(rng.uniform(BASE_RATE, 14.0, n), 1)
+    months = rng.choice([6, 12, 18, 24, 36, 48, 60], n)
+    start_month = first_month + rng.integers(0, MAX_TERM, n)
+    return pd.DataFrame({
+        "loan_id": np.arange(FIRST_LOAN_ID, FIRST_LOAN_ID + n),
+        "borrower_id": rng.integers(1, borrowers + 1, n),
+        "contributor_id": rng.integers(1, contributors + 1, n),
+        "principal": principal,
+        "annual_rate": annual_rate,
+        "months": months,
+        "start_month": start_month,
+    })
@@ -0,0 +1,91 @@
+import threading
+
+import numpy as np
+
+from loans import emi
+
+# Columns of every running total: loan count, principal, principal-weighted
+# interest rate (for the average rate) and interest over the full terms
+FIELDS = ("loans", "principal", "rate_principal", "interest")
+
+
+class PortfolioStats:
+    # Running totals over a loan book: overall, per borrower and per
+    # contributor (rows indexed by user id). add() and remove() adjust them
+    # by a batch of loans, so reading any total is O(1) however large the
+    # book grows; nothing is ever re-summed from the loans themselves.
+    def __init__(self):
+        self.total = np.zeros(len(FIELDS))
+        self.by_borrower = np.zeros((0, len(FIELDS)))
+        self.by_contributor = np.zeros((0, len(FIELDS)))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_loans(cls, loans):
+        stats = cls()
+        stats.add(loans)
+        return stats
+
+    def add(self, loans):
+        # loans: frame with borrower_id, contributor_id, principal,
+        # annual_rate and months columns
+        self._apply(loans, 1.0)
+
+    def remove(self, loans):
+        self._apply(loans, -1.0)
+
+    def _apply(self, loans, sign):
+        principal = loans["principal"].to_numpy(dtype=np.float64)
+        annual_rate = loans["annual_rate"].to_numpy(dtype=np.float64)
+        months = loans["months"].to_numpy(dtype=np.int64)
+        values = np.empty((len(principal), len(FIELDS)))
+        values[:, 0] = 1
+        values[:, 1] = principal
+        values[:, 2] = principal * annual_rate
+        values[:, 3] = emi(principal, annual_rate, months) * months - principal
+        values *= sign
+        borrowers = loans["borrower_id"].to_numpy(dtype=np.int64)
+        contributors = loans["contributor_id"].to_numpy(dtype=np.int64)
+        with self._lock:
+            self.total += values.sum(axis=0)
+            self.by_borrower = _add_rows(self.by_borrower, borrowers, values)
+            self.by_contributor = _add_rows(self.by_contributor, contributors, values)
+
+    def overall(self):
+        return _summary(self.total)
+
+    def borrower(self, user_id):
+        return _summary(_row(self.by_borrower, user_id))
+
+    def contributor(self, user_id):
+        return _summary(_row(self.by_contributor, user_id))
+
+
+def _add_rows(table, ids, values):
+    if len(ids) == 0:
+        return table
+    rows = int(ids.max()) + 1
+    if rows > len(table):
+        # Grow geometrically so a stream of new user ids doesn't copy the
+        # table every batch
+        grown = np.zeros((max(rows, len(table) * 3 // 2), table.shape[1]))
+        grown[:len(table)] = table
+        table = grown
+    np.add.at(table, ids, values)
+    return table
+
+
+def _row(table, user_id):
+    if user_id is None or not 0 <= user_id < len(table):
+        return np.zeros(len(FIELDS))
+    return table[user_id]
+
+
+def _summary(row):
+    loans, principal, rate_principal, interest = row
+    return {
+        "loans": int(round(loans)),
+        "principal": principal,
+        "average_rate": rate_principal / principal if principal else 0.0,
+        "interest": interest,
+    }
@@ -0,0 +1,201 @@
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from credit_scoring import RISK_BANDS, build_land_index, crop_name_lengths, land_scores, risk_codes, to_aadhaar_array
+
+# Change feed: one CSV per day (named so they sort in order, e.g.
+# 2024-06-01.csv) with aadhaar_number, land_size, crop_type and an optional
+# op column. op "delete" removes the record; anything else inserts it or
+# replaces the current one.
+CHANGE_DTYPES = {"aadhaar_number": str, "land_size": "Int32", "crop_type": "category", "op": "category"}
+
+# Subdirectory of the change feed that unreadable or out-of-order files are
+# moved into
+QUARANTINE_DIR = "quarantine"
+
+LAND_SIZE_DTYPE = np.int32
+CROP_LEN_DTYPE = np.int16
+SCORE_DTYPE = np.int32
+
+
+logger = logging.getLogger(__name__)
+
+# Rows per pass when totalling the base records, so a memory-mapped
+# registry is read in bounded pieces
+TOTALS_CHUNK = 1 << 18
+
+
+class ScoreTable:
+    # Credit score and risk band for every Aadhaar number in the land
+    # records plus every applied change, with running totals per band.
+    #
+    # The land index (or memory-mapped registry) it is built on is the
+    # read-only base; applied changes live in a small overlay of sorted
+    # arrays, one entry per changed Aadhaar number, checked before the base.
+    # Applying a batch of changes rescores only the affected numbers and
+    # adjusts the totals by the difference, instead of rescoring everyone,
+    # and never copies the base.
+    #
+    # lookup() has the LandIndex contract, so the table can be passed
+    # anywhere a land index is accepted and reflects every applied change.
+    def __init__(self, land_index):
+        self.base = land_index
+        # Overlay: (keys, land_size, crop_len, live); live False marks a
+        # deleted record. Swapped whole, so readers see one consistent state.
+        self._overlay = (
+            np.zeros(0, dtype=np.int64), np.zeros(0, dtype=LAND_SIZE_DTYPE),
+            np.zeros(0, dtype=CROP_LEN_DTYPE), np.zeros(0, dtype=bool),
+        )
+        self._rows = len(land_index)
+        self.score_sum = 0
+        self.band_count = np.zeros(len(RISK_BANDS), dtype=np.int64)
+        for start in range(0, self._rows, TOTALS_CHUNK):
+            land_size, crop_len = land_index.land_columns(start, start + TOTALS_CHUNK)
+            score = land_scores(land_size.astype(np.int64), crop_len)
+            self.score_sum += int(score.sum(dtype=np.int64))
+            self.band_count += np.bincount(risk_codes(score), minlength=len(RISK_BANDS))
+        self.applied = set()
+        self.rejected = set()
+        self.last_applied = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    @classmethod
+    def from_land_data(cls, land_data):
+        return cls(build_land_index(land_data))
+
+    def __len__(self):
+        return self._rows
+
+    def lookup(self, aadhaar_numbers):
+        ids = to_aadhaar_array(aadhaar_numbers)
+        found, land_size, crop_len = self.base.lookup(ids)
+        keys, changed_land_size, changed_crop_len, live = self._overlay
+        if len(keys):
+            positions = np.minimum(np.searchsorted(keys, ids), len(keys) - 1)
+            changed = keys[positions] == ids
+            found = np.where(changed, live[positions], found)
+            land_size = np.where(changed, changed_land_size[positions], land_size)
+            crop_len = np.where(changed, changed_crop_len[positions], crop_len)
+        return found, land_size, crop_len
+
+    def scores(self, aadhaar_numbers):
+        # (found mask, score, index into RISK_BANDS) aligned to the input
+        found, land_size, crop_len = self.lookup(aadhaar_numbers)
+        score = land_scores(np.asarray(land_size, dtype=np.int64), crop_len).astype(SCORE_DTYPE)
+        return found, score, risk_codes(score)
+
+    def bands_at(self, positions):
+        # Index into RISK_BANDS for the base records at `positions` (in key
+        # order, wrapping around); deleted records count as High risk
+        if len(self.base) == 0:
+            return np.full(len(positions), len(RISK_BANDS) - 1, dtype=np.int8)
+        keys = np.asarray(self.base.keys[np.asarray(positions) % len(self.base)])
+        found, _, risk = self.scores(keys)
+        risk[~found] = len(RISK_BANDS) - 1
+        return risk
+
+    def average_score(self):
+        return self.score_sum / len(self) if len(self) else 0.0
+
+    def band_counts(self):
+        return dict(zip(RISK_BANDS, self.band_count.tolist()))
+
+    def apply_changes(self, changes):
+        # Apply a batch of land-record changes (see CHANGE_DTYPES); when an
+        # Aadhaar number appears more than once the last change wins.
+        # Returns the number of Aadhaar numbers rescored, added or removed.
+        ids = to_aadhaar_array(changes["aadhaar_number"].to_numpy())
+        # Last occurrence per number, in key order; malformed IDs dropped
+        unique, last = np.unique(ids[::-1], return_index=True)
+        rows = len(ids) - 1 - last[unique >= 0]
+        ids = ids[rows]
+        delete = (
+            changes["op"].astype(str).to_numpy()[rows] == "delete"
+            if "op" in changes else np.zeros(len(rows), dtype=bool)
+        )
+        land_size = pd.to_numeric(changes["land_size"].iloc[rows], errors="coerce").fillna(0).to_numpy(dtype=LAND_SIZE_DTYPE)
+        crop_len = crop_name_lengths(changes["crop_type"].iloc[rows]).astype(CROP_LEN_DTYPE)
+        land_size[delete] = 0
+        crop_len[delete] = 0
+        score = land_scores(land_size.astype(np.int64), crop_len)
+
+        with self._lock:
+            # Take every replaced or removed record out of the totals
+            exists, old_score, old_risk = self.scores(ids)
+            self.score_sum -= int(old_score[exists].sum(dtype=np.int64))
+            self.band_count -= np.bincount(old_risk[exists], minlength=len(RISK_BANDS))
+            added = ~delete
+            self.score_sum += int(score[added].sum(dtype=np.int64))
+            self.band_count += np.bincount(risk_codes(score[added]), minlength=len(RISK_BANDS))
+            self._rows += int(added.sum()) - int(exists.sum())
+
+            # Merge into the overlay; ids are sorted and unique, and replace
+            # any earlier change to the same number
+            keys = self._overlay[0]
+            kept = ~np.isin(keys, ids)
+            at = np.searchsorted(keys[kept], ids)
+            self._overlay = tuple(
+                np.insert(column[kept], at, values)
+                for column, values in zip(self._overlay, (ids, land_size, crop_len, ~delete))
+            )
+        return len(ids)
+
+    def apply_change_file(self, path):
+        return self.apply_changes(pd.read_csv(path, dtype=CHANGE_DTYPES))
+
+    def sync(self, changes_dir):
+        # Apply change files in name order, each once. Returns the number of
+        # files applied.
+        #
+        # Producers must write a change file under another name (e.g.
+        # 2024-06-02.csv.tmp) and rename it to its .csv name once it is
+        # complete: only *.csv names are read, so a file still being written
+        # is never picked up. A file that can't be read, or whose name sorts
+        # before the last one applied (too late to apply in order), is
+        # logged and moved into QUARANTINE_DIR so no table applies it.
+        try:
+            names = sorted(name for name in os.listdir(changes_dir) if name.endswith(".csv"))
+        except FileNotFoundError:
+            return 0
+        if all(name in self.applied or name in self.rejected for name in names):
+            return 0
+        applied = 0
+        with self._sync_lock:
+            for name in names:
+                if name in self.applied or name in self.rejected:
+                    continue
+                path = os.path.join(changes_dir, name)
+                if self.last_applied is not None and name < self.last_applied:
+                    logger.warning("Change file %s arrived after %s was applied", path, self.last_applied)
+                    self._reject(changes_dir, name)
+                    continue
+                try:
+                    self.apply_change_file(path)
+                except FileNotFoundError:
+                    # Quarantined by another process since it was listed
+                    self.rejected.add(name)
+                    continue
+                except (ValueError, KeyError, TypeError, OSError):
+                    logger.exception("Could not apply change file %s", path)
+                    self._reject(changes_dir, name)
+                    continue
+                self.applied.add(name)
+                self.last_applied = name
+                applied += 1
+        return applied
+
+    def _reject(self, changes_dir, name):
+        self.rejected.add(name)
+        quarantine = os.path.join(changes_dir, QUARANTINE_DIR)
+        try:
+            os.makedirs(quarantine, exist_ok=True)
+            os.replace(os.path.join(changes_dir, name), os.path.join(quarantine, name))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.exception("Could not quarantine change file %s", name)
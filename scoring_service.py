@@ -0,0 +1,268 @@
+import argparse
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from bulk_score import open_score_table
+from credit_scoring import get_risk_level, score_from_land
+from data_loader import LAND_CHANGES_DIR, land_path
+
+# Local scoring service: an HTTP front end on localhost that coalesces
+# concurrent lookups into batches and scores them on a process pool, so
+# pandas/NumPy work runs outside the Streamlit process and its GIL.
+SCORING_URL = os.environ.get("HARVEST_SCORING_URL", "http://127.0.0.1:8765")
+SCORING_TIMEOUT = 5.0
+
+BATCH_WINDOW = 0.002  # seconds to wait for more lookups after the first
+MAX_BATCH = 1024  # Aadhaar numbers per batch
+MAX_REQUEST = 10_000  # Aadhaar numbers per HTTP request
+MAX_BODY = MAX_REQUEST * 64  # bytes per HTTP request body
+
+# Score table used by score_lookup and the change files it follows; set
+# once per worker process by init_worker
+_land = None
+_changes_dir = None
+
+
+def init_worker(land_path, changes_dir=LAND_CHANGES_DIR):
+    # The same scores as data_loader.load_score_table gives the app: the
+    # land records plus every change file in changes_dir
+    global _land, _changes_dir
+    _land = open_score_table(land_path, changes_dir)
+    _changes_dir = changes_dir
+
+
+def score_lookup(aadhaar_numbers):
+    # Runs in a pool worker: JSON-ready result rows, built there so the
+    # server process only forwards them. Unknown or malformed numbers get a
+    # null score and risk. Change files that arrived since the last batch
+    # are applied first.
+    if _changes_dir:
+        _land.sync(_changes_dir)
+    found, land_size, crop_len = _land.lookup(aadhaar_numbers)
+    score, risk = score_from_land(land_size, crop_len)
+    return [
+        {
+            "aadhaar_number": str(aadhaar),
+            "score": int(score[i]) if found[i] else None,
+            "risk": risk[i] if found[i] else None,
+            "risk_level": get_risk_level(risk[i]) if found[i] else 0,
+        }
+        for i, aadhaar in enumerate(aadhaar_numbers)
+    ]
+
+
+class ScoreBatcher:
+    # Collects lookups from many request threads. The first lookup opens a
+    # batch; everything arriving within `window` seconds (up to max_batch
+    # numbers) joins it, and the batch goes to the pool as one score_lookup
+    # call. Up to 2 batches per worker are in flight at once.
+    def __init__(self, pool, workers, window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.pool = pool
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._in_flight = threading.BoundedSemaphore(workers * 2)
+        self._thread = threading.Thread(target=self._run, name="harvest-score-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, aadhaar_numbers):
+        # Future resolving to the result rows for these numbers, in order
+        future = Future()
+        self._queue.put((list(aadhaar_numbers), future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.window
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._in_flight.acquire()
+            ids = np.array([aadhaar for numbers, _ in batch for aadhaar in numbers], dtype=object)
+            try:
+                result = self.pool.submit(score_lookup, ids)
+            except Exception as exc:
+                self._in_flight.release()
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            result.add_done_callback(lambda done, batch=batch: self._split(done, batch))
+
+    def _split(self, done, batch):
+        self._in_flight.release()
+        try:
+            rows = done.result()
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        start = 0
+        for numbers, future in batch:
+            future.set_result(rows[start:start + len(numbers)])
+            start += len(numbers)
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    # POST /score {"aadhaar_numbers": [...]} -> {"results": [...]}
+    # GET /health -> {"status": "ok"}
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY each
+    # response waits out the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok"})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/score":
+            self._send(404, {"error": "not found"})
+            return
+        # Checked before reading: a negative length would block the handler
+        # thread and a huge one would be read whole into memory. The body
+        # is left unread, so the connection is closed after the reply.
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send(400, {"error": "invalid Content-Length"})
+            return
+        if length > MAX_BODY:
+            self.close_connection = True
+            self._send(413, {"error": f"request body is over {MAX_BODY} bytes"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length))
+            numbers = [str(aadhaar) for aadhaar in body["aadhaar_numbers"]]
+        except (ValueError, KeyError, TypeError):
+            self._send(400, {"error": "expected {\"aadhaar_numbers\": [...]}"})
+            return
+        if len(numbers) > MAX_REQUEST:
+            self._send(413, {"error": f"at most {MAX_REQUEST} Aadhaar numbers per request"})
+            return
+        try:
+            results = self.server.batcher.submit(numbers).result(SCORING_TIMEOUT) if numbers else []
+        except Exception:
+            self._send(503, {"error": "scoring failed"})
+            return
+        self._send(200, {"results": results})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, land_path, workers, window=BATCH_WINDOW, max_batch=MAX_BATCH,
+                 changes_dir=LAND_CHANGES_DIR):
+        super().__init__(address, ScoringHandler)
+        # Each worker builds its score table once, then serves every batch
+        self.pool = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(land_path, changes_dir))
+        self.batcher = ScoreBatcher(self.pool, workers, window, max_batch)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+
+class ScoringClient:
+    # Keeps one keep-alive HTTP connection per calling thread; raises
+    # ConnectionError if the service can't be reached
+    def __init__(self, url=SCORING_URL, timeout=SCORING_TIMEOUT):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return connection
+
+    def score(self, aadhaar_numbers):
+        # Bytes, so http.client sends headers and body in one packet
+        body = json.dumps({"aadhaar_numbers": [str(aadhaar) for aadhaar in aadhaar_numbers]}).encode()
+        # A kept-alive connection the server has since closed fails on first
+        # use, so retry once on a fresh one
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request("POST", "/score", body, {"Content-Type": "application/json"})
+                response = connection.getresponse()
+                payload = json.loads(response.read())
+                break
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise ConnectionError(f"Scoring service unavailable: {exc}") from exc
+        if response.status != 200:
+            raise ConnectionError(f"Scoring service error {response.status}: {payload.get('error')}")
+        return payload["results"]
+
+    def calculate_credit_score(self, aadhaar_number):
+        # Same contract as credit_scoring.calculate_credit_score
+        result = self.score([aadhaar_number])[0]
+        return result["score"], result["risk"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve credit scores over localhost HTTP")
+    parser.add_argument("--land", default=land_path(), help="land_records.csv or a land registry directory")
+    parser.add_argument("--changes", default=LAND_CHANGES_DIR,
+                        help="land-record change files to apply, as in the app (empty to skip)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--window-ms", type=float, default=BATCH_WINDOW * 1000)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    args = parser.parse_args(argv)
+
+    server = ScoringServer(
+        (args.host, args.port), args.land, args.workers, args.window_ms / 1000, args.max_batch, args.changes
+    )
+    print(f"Scoring service on http://{args.host}:{server.server_port} with {args.workers} workers", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+
+SECTION_TIMEOUT = 10.0
+SECTION_WORKERS = 16
+
+CHART_RENDERERS = {
+    "line": lambda slot, data: slot.line_chart(data),
+    "bar": lambda slot, data: slot.bar_chart(data),
+}
+
+
+class SectionPool:
+    # Worker threads shared by every session's reruns, plus the provider
+    # calls running on them. A call still running from an earlier rerun, or
+    # from another session, is joined instead of submitted again, so a hung
+    # provider holds one worker rather than one per rerun.
+    def __init__(self, workers=SECTION_WORKERS):
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="harvest-section")
+        self._running = {}
+        self._lock = threading.Lock()
+
+    def submit(self, ctx, provider, args):
+        key = (provider, args)
+        with self._lock:
+            future = self._running.get(key)
+            if future is not None:
+                return future
+            future = self._running[key] = self.pool.submit(_with_script_context, ctx, provider, args)
+        # Outside the lock: runs right away if the call has already finished
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    def _finished(self, key, future):
+        with self._lock:
+            if self._running.get(key) is future:
+                del self._running[key]
+
+    def running(self):
+        with self._lock:
+            return len(self._running)
+
+
+# One pool per process
+@st.cache_resource(show_spinner=False)
+def section_pool():
+    return SectionPool()
+
+
+def _with_script_context(ctx, provider, args):
+    # Attach the session's script context so st.cache_data works inside the
+    # worker thread, and detach it again before the thread is reused.
+    # add_script_run_ctx(thread, None) would re-attach the thread's current
+    # context, so the attribute is cleared directly.
+    thread = threading.current_thread()
+    add_script_run_ctx(thread, ctx)
+    try:
+        return provider(*args)
+    finally:
+        setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+
+
+def render_sections(sections, timeout=SECTION_TIMEOUT):
+    # sections: (title, render, provider, args) tuples, where render(slot,
+    # data) draws into an st.empty() slot. Every provider starts at once on
+    # the shared pool; each slot shows a placeholder until its data arrives
+    # and is filled in completion order. A section still running after
+    # `timeout` seconds is shown as timed out; the rest of the page is not
+    # held up by it.
+    ctx = get_script_run_ctx()
+    pool = section_pool()
+    pending = {}
+    for title, render, provider, args in sections:
+        st.write(f"### {title}")
+        slot = st.empty()
+        slot.caption("Loading…")
+        pending[pool.submit(ctx, provider, args)] = (title, slot, render)
+
+    deadline = time.monotonic() + timeout
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            title, slot, render = pending.pop(future)
+            try:
+                render(slot, future.result())
+            except Exception:
+                slot.error(f"Could not load {title}.")
+
+    for future, (title, slot, _) in pending.items():
+        # Leave it running: a slow provider that finishes later still fills
+        # its cache for the next rerun, which joins it until then
+        slot.warning(f"{title} is taking longer than expected. It will appear on the next refresh.")
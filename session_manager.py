@@ -0,0 +1,168 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Memory allowed for per-session cached data across every session in the
+# process. Past it, the data of the longest-idle sessions is dropped and
+# rebuilt if they come back.
+SESSION_MEMORY_BUDGET = int(float(os.environ.get("HARVEST_SESSION_BUDGET_MB", "256")) * 2**20)
+# Sessions seen this recently are never evicted
+ACTIVE_WINDOW = 10.0
+
+USER_KEY = "user"
+
+_MISSING = object()
+
+
+@dataclass(slots=True, frozen=True)
+class SessionUser:
+    # The logged-in user: the only login details kept in st.session_state
+    id: int
+    username: str
+    role: str
+    token: str = field(repr=False)
+
+
+def current_user():
+    return st.session_state.get(USER_KEY)
+
+
+def footprint(value, _seen=None):
+    # Approximate bytes held by a value and everything it references, each
+    # object counted once
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if hasattr(value, "nbytes") or hasattr(value, "memory_usage"):
+        # NumPy and pandas objects include their data in getsizeof, except
+        # array views
+        return max(size, int(getattr(value, "nbytes", 0) or 0))
+    if isinstance(value, dict):
+        size += sum(footprint(k, seen) + footprint(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(footprint(item, seen) for item in value)
+    elif hasattr(type(value), "__slots__"):
+        size += sum(footprint(getattr(value, slot), seen) for slot in type(value).__slots__ if hasattr(value, slot))
+    elif hasattr(value, "__dict__"):
+        size += footprint(vars(value), seen)
+    return size
+
+
+class SessionRegistry:
+    # Data cached per session (see session_cached), held here instead of in
+    # st.session_state so it can be measured and evicted across sessions.
+    # Sessions with cached data are kept least recently seen first; when
+    # the total passes the budget, idle sessions' data is dropped oldest
+    # first. Sessions active within `active_window` seconds are never
+    # evicted, so the budget can be exceeded while every session is in use.
+    def __init__(self, budget=SESSION_MEMORY_BUDGET, active_window=ACTIVE_WINDOW):
+        self.budget = budget
+        self.active_window = active_window
+        self.total = 0
+        self.evictions = 0
+        # session id -> [last seen, {name: (value, bytes)}, bytes]
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _seen(self, session_id, now):
+        entry = self._sessions.get(session_id)
+        if entry is not None:
+            entry[0] = now
+            self._sessions.move_to_end(session_id)
+        return entry
+
+    def touch(self, session_id):
+        with self._lock:
+            self._seen(session_id, time.monotonic())
+
+    def get(self, session_id, name, default=None):
+        with self._lock:
+            entry = self._seen(session_id, time.monotonic())
+            return entry[1].get(name, (default, 0))[0] if entry else default
+
+    def put(self, session_id, name, value):
+        size = footprint(value)
+        with self._lock:
+            now = time.monotonic()
+            entry = self._seen(session_id, now)
+            if entry is None:
+                entry = self._sessions[session_id] = [now, {}, 0]
+            _, old = entry[1].get(name, (None, 0))
+            entry[1][name] = (value, size)
+            entry[2] += size - old
+            self.total += size - old
+            self._evict(now, session_id)
+
+    def drop(self, session_id):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self.total -= entry[2]
+
+    def session_bytes(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            return entry[2] if entry else 0
+
+    def _evict(self, now, current):
+        # Oldest first, stopping under budget or at the first session still
+        # active (the current one is the most recent)
+        while self.total > self.budget:
+            session_id, (last_seen, _, size) = next(iter(self._sessions.items()))
+            if session_id == current or now - last_seen < self.active_window:
+                break
+            del self._sessions[session_id]
+            self.total -= size
+            self.evictions += 1
+
+
+# One registry per process, shared by every session
+@st.cache_resource(show_spinner=False)
+def get_session_registry(budget=SESSION_MEMORY_BUDGET):
+    return SessionRegistry(budget)
+
+
+def session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def touch_session():
+    # Called on every rerun, so idle time counts from the session's last one
+    current = session_id()
+    if current is not None:
+        get_session_registry().touch(current)
+
+
+def session_cached(name, build):
+    # build() for this session, reused on its later reruns until evicted.
+    # Data shared between users belongs in st.cache_data instead, which
+    # keeps one copy for everyone.
+    current = session_id()
+    if current is None:
+        return build()
+    registry = get_session_registry()
+    value = registry.get(current, name, _MISSING)
+    if value is _MISSING:
+        value = build()
+        registry.put(current, name, value)
+    return value
+
+
+def session_footprint(state=None):
+    # (bytes in st.session_state, bytes of cached data) for this session
+    state = st.session_state if state is None else state
+    current = session_id()
+    cached = get_session_registry().session_bytes(current) if current is not None else 0
+    return footprint({key: state[key] for key in state.keys()}), cached
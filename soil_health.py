@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+IRRIGATION_BONUS = 20
+SCORE_RANGE = (0, 120)
+# (lower, upper, label, gauge colour); a score on a boundary goes up a band
+GAUGE_BANDS = [
+    (0, 40, "Poor", "red"),
+    (40, 80, "Fair", "yellow"),
+    (80, 120, "Good", "green"),
+]
+BAND_LABELS = np.array([label for _, _, label, _ in GAUGE_BANDS], dtype=object)
+_BAND_EDGES = np.array([lower for lower, _, _, _ in GAUGE_BANDS[1:]])
+
+
+def _irrigated(irrigation):
+    irrigation = np.asarray(irrigation).reshape(-1)
+    if irrigation.dtype == bool:
+        return irrigation
+    return irrigation == "Yes"
+
+
+def soil_health_scores(organic_matter, irrigation):
+    # organic_matter in %, irrigation as "Yes"/"No" or bool, one per plot
+    organic_matter = np.asarray(organic_matter).reshape(-1)
+    return organic_matter + np.where(_irrigated(irrigation), IRRIGATION_BONUS, 0)
+
+
+def soil_health_bands(scores):
+    # Index into GAUGE_BANDS for each score
+    return np.digitize(scores, _BAND_EDGES)
+
+
+def score_plots(organic_matter, irrigation):
+    # Scores and band labels for many plots in one pass
+    scores = soil_health_scores(organic_matter, irrigation)
+    return scores, BAND_LABELS[soil_health_bands(scores)]
+
+
+def soil_health_score(organic_matter, irrigation):
+    return organic_matter + (IRRIGATION_BONUS if irrigation in ("Yes", True) else 0)
+
+
+def soil_health_band(score):
+    for lower, upper, label, _ in reversed(GAUGE_BANDS):
+        if score >= lower:
+            return label
+    return GAUGE_BANDS[0][2]
+
+
+def score_plots_csv(input_path, output_path, chunksize=1_000_000):
+    # Bulk endpoint: stream a CSV with organic_matter and irrigation columns
+    # and append soil_health_score and soil_health_band to each row.
+    header = True
+    rows = 0
+    for chunk in pd.read_csv(input_path, chunksize=chunksize):
+        scores, bands = score_plots(chunk["organic_matter"].to_numpy(), chunk["irrigation"].to_numpy())
+        chunk["soil_health_score"] = scores
+        chunk["soil_health_band"] = bands
+        chunk.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+        header = False
+        rows += len(chunk)
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score soil health for a CSV of farm plots")
+    parser.add_argument("input", help="CSV with organic_matter and irrigation columns")
+    parser.add_argument("output")
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    args = parser.parse_args()
+    rows = score_plots_csv(args.input, args.output, args.chunksize)
+    print(f"Scored {rows:,} plots")
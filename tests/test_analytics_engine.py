@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from analytics_engine import DailyRollup
+
+FIRST_DAY = 20_000
+
+
+@pytest.fixture
+def rollup():
+    # One transaction of 1.0 per day on days 0..29, all in category 0
+    rollup = DailyRollup(FIRST_DAY)
+    days = FIRST_DAY + np.arange(30)
+    rollup.append(days, np.zeros(30), np.ones(30))
+    return rollup
+
+
+def transactions(rollup, days, end):
+    return int(rollup.window(days, FIRST_DAY + end)[1].sum())
+
+
+@pytest.mark.parametrize("days, end, expected", [
+    (7, 29, 7),
+    (7, 10, 7),
+    (7, 3, 4),
+    (7, 32, 4),
+    (7, 36, 0),
+    (7, 40, 0),
+    (7, -1, 0),
+    (7, -10, 0),
+    (90, 29, 30),
+])
+def test_window_counts_only_overlapping_days(rollup, days, end, expected):
+    assert transactions(rollup, days, end) == expected
+
+
+def test_window_defaults_to_last_day(rollup):
+    assert int(rollup.window(7)[1].sum()) == 7
+
+
+def test_summary_previous_window_does_not_overlap(rollup):
+    summary = rollup.summary(7, FIRST_DAY + 32)
+    assert summary["transactions"] == 4
+    # Days 19..25 against days 26..32, of which 26..29 have data
+    assert summary["transactions_change"] == pytest.approx(4 / 7 - 1)
+    assert summary["total"] == pytest.approx(4.0)
+
+
+def test_empty_rollup():
+    rollup = DailyRollup(FIRST_DAY)
+    amount, count, success = rollup.window(7, FIRST_DAY + 5)
+    assert count.sum() == 0 and amount.sum() == 0 and success.sum() == 0
+    summary = rollup.summary(7, FIRST_DAY + 5)
+    assert summary["transactions"] == 0
+    assert summary["transactions_change"] is None
+
+
+@pytest.mark.parametrize("category", [-1, 99])
+def test_append_rejects_unknown_category(rollup, category):
+    with pytest.raises(ValueError):
+        rollup.append([FIRST_DAY + 1, FIRST_DAY + 2], [0, category], [1.0, 1.0])
+    # Nothing from the rejected batch is counted
+    assert transactions(rollup, 30, 29) == 30
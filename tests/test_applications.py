@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+
+from applications import APPROVAL, FRAUD, KYC, ApplicationPipeline, RecentApplications
+from data_loader import load_score_table
+from kyc import AadhaarIndex
+from score_table import ScoreTable
+
+AADHAAR = pd.DataFrame({
+    "aadhaar_number": [123456789012, 987654321098, 456789123456],
+    "name": ["Ramesh", "Suresh", "Meena"],
+    "age": [45, 38, 50],
+    "address": pd.Categorical(["Karnataka", "Tamil Nadu", "Kerala"]),
+})
+# Ramesh scores 575 (Moderate), Meena 745 (Low); Suresh has no land
+LAND = pd.DataFrame({
+    "aadhaar_number": [123456789012, 456789123456],
+    "land_size": [5, 20],
+    "crop_type": ["Wheat", "Sugarcane"],
+})
+RAMESH = {"aadhaar_number": "123456789012", "name": "Ramesh", "age": 45, "address": "Karnataka", "months": 12}
+
+
+@pytest.fixture
+def pipeline():
+    aadhaar_index, score_table = AadhaarIndex(AADHAAR), ScoreTable.from_land_data(LAND)
+    pipeline = ApplicationPipeline(lambda: aadhaar_index, lambda: score_table, workers=2)
+    yield pipeline
+    pipeline.close()
+
+
+def apply(pipeline, amount, **changes):
+    return pipeline.submit(**{**RAMESH, **changes}, amount=amount).result(5)
+
+
+def test_application_reaches_approval(pipeline):
+    result = apply(pipeline, 100_000)
+    assert result["status"] == APPROVAL and result["reason"] is None
+    assert pipeline.pending() == {APPROVAL: 1, KYC: 0, FRAUD: 0}
+    assert [application["id"] for application in pipeline.awaiting()] == [result["id"]]
+    assert pipeline.decide(result["id"], True)["name"] == "Ramesh"
+    assert pipeline.decide(result["id"], True) is None
+    assert pipeline.pending()[APPROVAL] == 0
+    assert pipeline.outcomes["Approved"] == 1
+
+
+@pytest.mark.parametrize("changes, stage, reason", [
+    ({"aadhaar_number": "111111111111"}, KYC, "aadhaar_not_found"),
+    ({"name": "Rajesh"}, KYC, "name_mismatch"),
+    ({"age": 30}, KYC, "age_mismatch"),
+    ({"months": 72}, FRAUD, "term_out_of_range"),
+])
+def test_rejections(pipeline, changes, stage, reason):
+    result = apply(pipeline, 100_000, **changes)
+    assert (result["status"], result["stage"], result["reason"]) == ("Rejected", stage, reason)
+
+
+def test_band_limit_rejection_does_not_lock_out_retry(pipeline):
+    assert apply(pipeline, 200_000)["reason"] == "over_band_limit"
+    assert apply(pipeline, 100_000)["reason"] is None
+    assert apply(pipeline, 100_000)["reason"] == "repeat_aadhaar"
+
+
+def test_applicants_without_land_get_the_high_risk_limit(pipeline):
+    suresh = {"aadhaar_number": "987654321098", "name": "suresh", "age": 38, "address": "tamil nadu"}
+    assert apply(pipeline, 60_000, **suresh)["reason"] == "over_band_limit"
+    assert apply(pipeline, 40_000, **suresh)["reason"] is None
+
+
+def test_recent_applications_within_batch_and_window():
+    recent = RecentApplications(window=10)
+    ids = pd.array([1, 2, 1, 3]).to_numpy("int64")
+    eligible = ids != 3
+    assert recent.add(ids, 100.0, eligible).tolist() == [False, False, True, False]
+    assert recent.add(ids[3:], 101.0).tolist() == [False]
+    assert recent.add(ids[:1], 105.0).tolist() == [True]
+    # Seen again at 105, so still inside the window at 114
+    assert recent.add(ids[:1], 114.0).tolist() == [True]
+    assert recent.add(ids[1:2], 200.0).tolist() == [False]
+
+
+def test_checks_follow_land_changes(tmp_path):
+    land = tmp_path / "land_records.csv"
+    LAND.to_csv(land, index=False)
+    changes = tmp_path / "land_changes"
+    changes.mkdir()
+    aadhaar_index = AadhaarIndex(AADHAAR)
+    pipeline = ApplicationPipeline(
+        lambda: aadhaar_index, lambda: load_score_table(str(land), str(changes)), workers=1
+    )
+    try:
+        assert apply(pipeline, 200_000)["reason"] == "over_band_limit"
+        # More land moves Ramesh to Low risk for the next batch
+        pd.DataFrame({"aadhaar_number": ["123456789012"], "land_size": [25], "crop_type": ["Wheat"]}).to_csv(
+            changes / "2024-06-01.csv", index=False
+        )
+        assert apply(pipeline, 200_000)["reason"] is None
+    finally:
+        pipeline.close()
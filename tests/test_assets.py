@@ -0,0 +1,9 @@
+import assets
+
+
+def test_missing_and_unreadable_images(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "ASSET_DIR", str(tmp_path))
+    assert assets.asset_bytes("sidebar") is None
+    # Not an image Pillow can decode: served as stored
+    (tmp_path / "credit.jpg").write_bytes(b"not a jpeg")
+    assert assets.asset_bytes("sidebar") == b"not a jpeg"
@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from bulk_score import bulk_score
+
+pytest.importorskip("pyarrow")
+
+
+def test_parquet_output_when_first_chunk_has_no_matches(tmp_path):
+    land = tmp_path / "land_records.csv"
+    pd.DataFrame({
+        "aadhaar_number": [123456789012],
+        "land_size": [5],
+        "crop_type": ["Wheat"],
+    }).to_csv(land, index=False)
+    applicants = tmp_path / "applicants.csv"
+    pd.DataFrame({"aadhaar_number": ["1", "2", "123456789012", "123456789012.0"]}).to_csv(applicants, index=False)
+    output = tmp_path / "scores.parquet"
+
+    assert bulk_score(str(applicants), str(output), str(land), chunksize=2) == 4
+    result = pd.read_parquet(output)
+    assert result["aadhaar_number"].tolist() == ["1", "2", "123456789012", "123456789012.0"]
+    assert result["score"].notna().tolist() == [False, False, True, False]
+    assert result["risk"].tolist()[2] == "Moderate"
+    assert result["risk_level"].tolist() == [0, 0, 50, 0]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_applies_land_change_files(tmp_path, workers):
+    land = tmp_path / "land_records.csv"
+    pd.DataFrame({
+        "aadhaar_number": [123456789012, 987654321098],
+        "land_size": [5, 12],
+        "crop_type": ["Wheat", "Rice"],
+    }).to_csv(land, index=False)
+    changes = tmp_path / "land_changes"
+    changes.mkdir()
+    pd.DataFrame({
+        "aadhaar_number": ["123456789012", "987654321098", "456789123456"],
+        "land_size": [25, 12, 3],
+        "crop_type": ["Wheat", "Rice", "Maize"],
+        "op": ["upsert", "delete", "upsert"],
+    }).to_csv(changes / "2024-06-01.csv", index=False)
+    applicants = tmp_path / "applicants.csv"
+    pd.DataFrame({"aadhaar_number": ["123456789012", "987654321098", "456789123456"]}).to_csv(applicants, index=False)
+    output = tmp_path / "scores.parquet"
+
+    assert bulk_score(str(applicants), str(output), str(land), chunksize=2, workers=workers,
+                      changes_dir=str(changes)) == 3
+    result = pd.read_parquet(output)
+    # Same scores as the scoring service gives over these files
+    assert result["score"].tolist()[0] == 775 and pd.isna(result["score"].tolist()[1])
+    assert result["score"].tolist()[2] == 555
+    assert result["risk"].tolist()[0] == "Low"
@@ -0,0 +1,39 @@
+import time
+
+import pytest
+
+from contact_queue import ContactQueue
+
+
+def test_writer_survives_a_failed_group(tmp_path):
+    contact = ContactQueue(str(tmp_path / "contact.db"), handler=lambda messages: None)
+    try:
+        # Too large for an SQLite integer: not an sqlite3.Error
+        with pytest.raises(OverflowError):
+            contact.submit("Asha", "asha@example.com", "Hello", user_id=2**70).result(5)
+        assert contact.submit("Asha", "asha@example.com", "Hello", user_id=1).result(5) >= 1
+    finally:
+        contact.close()
+
+
+def test_drainer_survives_a_failing_handler(tmp_path):
+    drained = []
+    failures = [RuntimeError("inbox unavailable")]
+
+    def handler(messages):
+        if failures:
+            raise failures.pop()
+        drained.extend(message["message"] for message in messages)
+
+    contact = ContactQueue(str(tmp_path / "contact.db"), handler=handler, drain_interval=0.01)
+    try:
+        contact.submit("Asha", "asha@example.com", "first").result(5)
+        contact.submit("Asha", "asha@example.com", "second").result(5)
+        deadline = time.monotonic() + 5
+        while contact.queued() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        contact.close()
+    # The failed pass left both queued; a later pass delivered them
+    assert not failures and drained == ["first", "second"]
+    assert contact.queued() == 0
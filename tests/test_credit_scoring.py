@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from credit_scoring import build_land_index, calculate_credit_score, score_batch, to_aadhaar_array
+
+LAND = pd.DataFrame({
+    "aadhaar_number": [123456789012, 987654321098],
+    "land_size": [5, 12],
+    "crop_type": ["Wheat", "Rice"],
+})
+
+IDS = [
+    "123456789012", " 123456789012 ", "+123456789012", "123456789012.0", "1.23456789012e11",
+    "987654321098", "not-a-number", "", "99999999999999999999", 987654321098,
+]
+
+
+def reference(value):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return -1
+    return number if -2**63 <= number < 2**63 else -1
+
+
+@pytest.mark.parametrize("values", [
+    np.array(IDS, dtype=object),
+    np.array([str(value) for value in IDS]),
+    np.array([*IDS, None, np.nan], dtype=object),
+])
+def test_to_aadhaar_array_matches_int(values):
+    expected = [reference(value) for value in values]
+    assert to_aadhaar_array(values).tolist() == expected
+
+
+def test_to_aadhaar_array_leaves_input_unchanged():
+    values = np.array(["1.5", "12"], dtype=object)
+    to_aadhaar_array(values)
+    assert values.tolist() == ["1.5", "12"]
+
+
+def test_score_batch_matches_calculate_credit_score():
+    index = build_land_index(LAND)
+    ids = np.array(IDS, dtype=object)
+    result = score_batch(ids, index)
+    for aadhaar, score, risk in zip(ids, result["score"], result["risk"]):
+        expected = calculate_credit_score(aadhaar, index)
+        got = (None, None) if pd.isna(score) else (score, risk)
+        assert got == expected, aadhaar
+
+
+def test_calculate_credit_score_on_dataframe_matches_index():
+    index = build_land_index(LAND)
+    duplicated = pd.concat([LAND, LAND.assign(land_size=99)], ignore_index=True)
+    for aadhaar in IDS:
+        assert calculate_credit_score(aadhaar, LAND) == calculate_credit_score(aadhaar, index), aadhaar
+        # First record per number wins either way
+        assert calculate_credit_score(aadhaar, duplicated) == calculate_credit_score(aadhaar, index), aadhaar
@@ -0,0 +1,39 @@
+import pytest
+
+import dashboard_data
+from dashboard_data import get_loan_book, issue_loan, live_stats, portfolio_stats, user_loans
+
+
+@pytest.fixture
+def small_book(monkeypatch):
+    monkeypatch.setattr(dashboard_data, "SYNTHETIC_LOANS", 400)
+    monkeypatch.setattr(dashboard_data, "SYNTHETIC_BORROWERS", 40)
+    monkeypatch.setattr(dashboard_data, "SYNTHETIC_CONTRIBUTORS", 8)
+    for cached in (get_loan_book, portfolio_stats, user_loans, live_stats):
+        cached.clear()
+    yield get_loan_book()
+    for cached in (get_loan_book, portfolio_stats, user_loans, live_stats):
+        cached.clear()
+
+
+def test_approved_application_is_booked(small_book):
+    farmer = 41  # no loans in the synthetic book
+    before = portfolio_stats().overall()
+    assert user_loans(farmer).empty
+    live_stats("Farmer", farmer)
+
+    loan_id = issue_loan({"id": 7, "user_id": farmer, "amount": 60_000.0, "months": 12})
+
+    loans = user_loans(farmer)
+    assert loans.index.tolist() == [loan_id]
+    assert loans["Amount (₹)"].tolist() == [60_000.0]
+    assert loans["Instalments Paid"].tolist() == [0]
+    after = portfolio_stats().overall()
+    assert after["loans"] == before["loans"] + 1
+    assert after["principal"] == pytest.approx(before["principal"] + 60_000)
+    # Cached statistics show it straight away
+    assert dict((label, value) for label, value, _ in live_stats("Farmer", farmer))["📊 Credit Amount"] == "₹60,000"
+    # Ids keep counting up and the book stays sorted by borrower
+    assert issue_loan({"id": 8, "user_id": 3, "amount": 20_000.0, "months": 6}) == loan_id + 1
+    assert small_book.loans["borrower_id"].is_monotonic_increasing
+    assert len(small_book.loans) == 402
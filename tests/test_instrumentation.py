@@ -0,0 +1,43 @@
+import pytest
+
+import instrumentation
+from instrumentation import Registry, track
+
+
+def test_sub_millisecond_quantiles():
+    registry = Registry()
+    for _ in range(99):
+        registry.observe("fast", 0.00003)
+    registry.observe("fast", 0.0004)
+    (row,) = registry.snapshot()
+    assert row["p50_ms"] == pytest.approx(0.05)
+    assert row["p99_ms"] == pytest.approx(0.05)
+    registry.observe("slow", 3.0)
+    assert registry.snapshot()[1]["p50_ms"] == pytest.approx(5000.0)
+
+
+def test_prometheus_buckets_are_cumulative():
+    registry = Registry()
+    registry.observe("call", 0.0002)
+    text = registry.render_prometheus()
+    assert 'harvest_call_seconds_bucket{name="call",le="0.0001"} 0' in text
+    assert 'harvest_call_seconds_bucket{name="call",le="0.00025"} 1' in text
+    assert 'harvest_call_seconds_bucket{name="call",le="+Inf"} 1' in text
+
+
+def test_track_disabled_is_a_shared_no_op(monkeypatch):
+    monkeypatch.setattr(instrumentation, "ENABLED", False)
+    registry = Registry()
+    assert track("a", registry) is track("b", registry)
+    with track("a", registry):
+        pass
+    assert registry.snapshot() == []
+
+
+def test_track_enabled_records(monkeypatch):
+    monkeypatch.setattr(instrumentation, "ENABLED", True)
+    registry = Registry()
+    with pytest.raises(ValueError):
+        with track("block", registry):
+            raise ValueError
+    assert [row["calls"] for row in registry.snapshot()] == [1]
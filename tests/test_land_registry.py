@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+import pytest
+
+from land_registry import convert_csv, open_registry
+
+IDS = ["123456789012", "987654321098", "456789123456"]
+
+
+def write_land(path, land_size):
+    pd.DataFrame({
+        "aadhaar_number": [123456789012, 987654321098],
+        "land_size": land_size,
+        "crop_type": ["Wheat", "Rice"],
+    }).to_csv(path, index=False)
+
+
+def test_reconvert_while_registry_is_open(tmp_path):
+    land = tmp_path / "land_records.csv"
+    out = tmp_path / "land_registry"
+    write_land(land, [5, 12])
+    reader = convert_csv(str(land), str(out))
+
+    write_land(land, [25, 30])
+    convert_csv(str(land), str(out))
+    # The open registry keeps reading what it opened; a new one sees the
+    # reconverted records
+    assert reader.lookup(IDS)[1][:2].tolist() == [5, 12]
+    assert open_registry(str(out)).lookup(IDS)[1][:2].tolist() == [25, 30]
+
+    write_land(land, [7, 8])
+    convert_csv(str(land), str(out))
+    assert reader.records(IDS)["land_size"].tolist() == [5, 12]
+    # Only the current generation and the one it replaced are kept
+    assert len([name for name in os.listdir(out) if name.startswith("gen-")]) == 2
+
+
+def test_failed_conversion_keeps_previous_registry(tmp_path):
+    land = tmp_path / "land_records.csv"
+    out = tmp_path / "land_registry"
+    write_land(land, [5, 12])
+    convert_csv(str(land), str(out))
+
+    land.write_text("aadhaar_number,land_size,crop_type\n123456789012,not a number,Wheat\n")
+    with pytest.raises(ValueError):
+        convert_csv(str(land), str(out))
+    assert open_registry(str(out)).lookup(IDS)[1][:2].tolist() == [5, 12]
+    assert len([name for name in os.listdir(out) if name.startswith("gen-")]) == 1
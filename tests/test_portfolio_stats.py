@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from loans import emi, generate_loan_book
+from portfolio_stats import PortfolioStats
+
+
+def recompute(loans, column, user_id):
+    # Totals for one user straight from the loans, for comparison
+    mine = loans[loans[column] == user_id]
+    principal = mine["principal"].sum()
+    return {
+        "loans": len(mine),
+        "principal": principal,
+        "average_rate": (mine["principal"] * mine["annual_rate"]).sum() / principal if principal else 0.0,
+        "interest": (emi(mine["principal"], mine["annual_rate"], mine["months"]) * mine["months"]
+                     - mine["principal"]).sum(),
+    }
+
+
+def assert_matches(stats, loans):
+    overall = stats.overall()
+    assert overall["loans"] == len(loans)
+    assert overall["principal"] == pytest.approx(loans["principal"].sum())
+    for column, lookup in (("borrower_id", stats.borrower), ("contributor_id", stats.contributor)):
+        # Every user with loans, plus ids with none on either side
+        for user_id in [0, *np.unique(loans[column]), int(loans[column].max()) + 1]:
+            got, expected = lookup(int(user_id)), recompute(loans, column, user_id)
+            assert got["loans"] == expected["loans"], (column, user_id)
+            for field in ("principal", "average_rate", "interest"):
+                assert got[field] == pytest.approx(expected[field], abs=1e-6), (column, user_id, field)
+
+
+@pytest.fixture
+def book():
+    return generate_loan_book(400, borrowers=40, contributors=8)
+
+
+def test_batches_match_full_recompute(book):
+    stats = PortfolioStats()
+    for start in range(0, len(book), 64):
+        stats.add(book.iloc[start:start + 64])
+    assert_matches(stats, book)
+
+
+def test_remove_matches_full_recompute(book):
+    stats = PortfolioStats.from_loans(book)
+    retired = book.sample(100, random_state=1)
+    stats.remove(retired)
+    assert_matches(stats, book.drop(retired.index))
+    stats.remove(book.drop(retired.index))
+    assert stats.overall()["loans"] == 0
+    assert stats.borrower(1)["principal"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_growing_user_ids_keep_earlier_rows(book):
+    stats = PortfolioStats.from_loans(book)
+    later = generate_loan_book(50, seed=1, borrowers=10, contributors=2)
+    later["borrower_id"] += 1000
+    later["contributor_id"] += 500
+    stats.add(later)
+    assert_matches(stats, pd.concat([book, later], ignore_index=True))
+
+
+def test_unknown_users_read_as_empty():
+    stats = PortfolioStats()
+    assert stats.borrower(5) == {"loans": 0, "principal": 0.0, "average_rate": 0.0, "interest": 0.0}
+    assert stats.contributor(None)["loans"] == 0
+    stats.add(generate_loan_book(10, borrowers=2, contributors=1))
+    assert stats.borrower(-1)["loans"] == 0
+    assert stats.borrower(10**6)["loans"] == 0
@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from land_registry import convert_csv
+from score_table import QUARANTINE_DIR, ScoreTable
+
+LAND = pd.DataFrame({
+    "aadhaar_number": [123456789012, 987654321098, 456789123456, 111122223333],
+    "land_size": [5, 12, 20, 1],
+    "crop_type": ["Wheat", "Rice", "Sugarcane", "Maize"],
+})
+# Update, delete, insert, and a number changed twice in one batch
+CHANGES = [
+    pd.DataFrame({
+        "aadhaar_number": ["123456789012", "987654321098", "555566667777", "456789123456", "456789123456"],
+        "land_size": [25, 12, 3, 2, 9],
+        "crop_type": ["Wheat", "Rice", "Maize", "Rice", "Cotton"],
+        "op": ["upsert", "delete", "upsert", "upsert", "upsert"],
+    }),
+    # Deletes an inserted number, re-adds a deleted one
+    pd.DataFrame({
+        "aadhaar_number": ["555566667777", "987654321098"],
+        "land_size": [3, 7],
+        "crop_type": ["Maize", "Jute"],
+        "op": ["delete", "upsert"],
+    }),
+]
+EXPECTED = pd.DataFrame({
+    "aadhaar_number": [123456789012, 456789123456, 111122223333, 987654321098],
+    "land_size": [25, 9, 1, 7],
+    "crop_type": ["Wheat", "Cotton", "Maize", "Jute"],
+})
+IDS = ["123456789012", "987654321098", "456789123456", "111122223333", "555566667777", "x"]
+
+
+@pytest.fixture(params=["index", "registry"])
+def table(request, tmp_path):
+    if request.param == "index":
+        return ScoreTable.from_land_data(LAND)
+    LAND.to_csv(tmp_path / "land_records.csv", index=False)
+    return ScoreTable(convert_csv(str(tmp_path / "land_records.csv"), str(tmp_path / "land_registry")))
+
+
+def test_changes_match_a_full_rebuild(table):
+    full = ScoreTable.from_land_data(EXPECTED)
+    for changes in CHANGES:
+        table.apply_changes(changes)
+    # Values are only defined where found
+    for method in (ScoreTable.lookup, ScoreTable.scores):
+        (found, *mine), (full_found, *expected) = method(table, IDS), method(full, IDS)
+        assert found.tolist() == full_found.tolist() == [True, True, True, True, False, False]
+        for column, full_column in zip(mine, expected):
+            assert column[found].tolist() == full_column[found].tolist()
+    assert len(table) == len(full) == 4
+    assert table.score_sum == full.score_sum
+    assert table.band_counts() == full.band_counts()
+
+
+def test_base_is_not_copied(table):
+    keys = np.asarray(table.base.keys).copy()
+    table.apply_changes(CHANGES[0])
+    # Only the changed numbers are held; the base is untouched
+    assert len(table._overlay[0]) == 4
+    assert np.array_equal(table.base.keys, keys)
+
+
+def write_changes(path, land_size):
+    pd.DataFrame({
+        "aadhaar_number": ["123456789012"], "land_size": [land_size], "crop_type": ["Wheat"],
+    }).to_csv(path, index=False)
+
+
+def test_sync_skips_files_still_being_written(tmp_path):
+    table = ScoreTable.from_land_data(LAND)
+    write_changes(tmp_path / "2024-06-01.csv.tmp", 25)
+    assert table.sync(str(tmp_path)) == 0
+    os.replace(tmp_path / "2024-06-01.csv.tmp", tmp_path / "2024-06-01.csv")
+    assert table.sync(str(tmp_path)) == 1
+    assert table.lookup(["123456789012"])[1].tolist() == [25]
+
+
+@pytest.mark.parametrize("content", [
+    "aadhaar_number,land_size,crop_type\n123456789012,lots,Wheat\n",
+    "aadhaar_number,land_size\n",
+    "",
+    b"\xff\xfe\x00garbage",
+])
+def test_sync_quarantines_unreadable_files(tmp_path, content):
+    table = ScoreTable.from_land_data(LAND)
+    bad = tmp_path / "2024-06-01.csv"
+    bad.write_bytes(content if isinstance(content, bytes) else content.encode())
+    write_changes(tmp_path / "2024-06-02.csv", 25)
+
+    assert table.sync(str(tmp_path)) == 1
+    assert table.lookup(["123456789012"])[1].tolist() == [25]
+    assert not bad.exists() and (tmp_path / QUARANTINE_DIR / "2024-06-01.csv").exists()
+    assert table.sync(str(tmp_path)) == 0
+
+
+def test_sync_rejects_files_older_than_the_last_applied(tmp_path):
+    table = ScoreTable.from_land_data(LAND)
+    write_changes(tmp_path / "2024-06-02.csv", 25)
+    assert table.sync(str(tmp_path)) == 1
+    write_changes(tmp_path / "2024-06-01.csv", 7)
+    assert table.sync(str(tmp_path)) == 0
+    assert table.lookup(["123456789012"])[1].tolist() == [25]
+    assert (tmp_path / QUARANTINE_DIR / "2024-06-01.csv").exists()
@@ -0,0 +1,63 @@
+import http.client
+import threading
+
+import pandas as pd
+import pytest
+
+import scoring_service
+from credit_scoring import calculate_credit_score
+from data_loader import load_score_table
+
+
+def test_workers_apply_change_files(tmp_path):
+    land = tmp_path / "land_records.csv"
+    pd.DataFrame({
+        "aadhaar_number": [123456789012, 987654321098],
+        "land_size": [5, 12],
+        "crop_type": ["Wheat", "Rice"],
+    }).to_csv(land, index=False)
+    changes = tmp_path / "land_changes"
+    changes.mkdir()
+    ids = ["123456789012", "987654321098", "456789123456"]
+
+    scoring_service.init_worker(str(land), str(changes))
+    assert [row["score"] for row in scoring_service.score_lookup(ids)] == [575, 640, None]
+
+    pd.DataFrame({
+        "aadhaar_number": ["123456789012", "987654321098", "456789123456"],
+        "land_size": [25, 12, 3],
+        "crop_type": ["Wheat", "Rice", "Maize"],
+        "op": ["upsert", "delete", "upsert"],
+    }).to_csv(changes / "2024-06-01.csv", index=False)
+    rows = scoring_service.score_lookup(ids)
+    assert [row["score"] for row in rows] == [775, None, 555]
+    assert [row["risk"] for row in rows] == ["Low", None, "Moderate"]
+
+    # Matches the app's in-process fallback over the same files
+    table = load_score_table(str(land), str(changes))
+    for aadhaar, row in zip(ids, rows):
+        assert calculate_credit_score(aadhaar, table) == (row["score"], row["risk"])
+
+
+@pytest.mark.parametrize("length, status", [
+    ("-1", 400),
+    ("ten", 400),
+    (str(scoring_service.MAX_BODY + 1), 413),
+])
+def test_rejects_bad_content_length_before_reading(tmp_path, length, status):
+    land = tmp_path / "land_records.csv"
+    pd.DataFrame({"aadhaar_number": [123456789012], "land_size": [5], "crop_type": ["Wheat"]}).to_csv(land, index=False)
+    server = scoring_service.ScoringServer(("127.0.0.1", 0), str(land), 1, changes_dir=str(tmp_path / "changes"))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+        connection.putrequest("POST", "/score")
+        connection.putheader("Content-Length", length)
+        connection.endheaders()
+        # No body is sent; the reply must not wait for one
+        assert connection.getresponse().status == status
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,41 @@
+import threading
+from types import SimpleNamespace
+
+from sections import SCRIPT_RUN_CONTEXT_ATTR_NAME, SectionPool
+
+
+def context():
+    return getattr(threading.current_thread(), SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+
+
+def test_worker_context_is_cleared_after_each_call():
+    pool = SectionPool(workers=1)
+    # Stands in for a session's ScriptRunContext
+    ctx = SimpleNamespace(pages_manager=SimpleNamespace(main_script_hash="main"))
+    assert pool.submit(ctx, context, ()).result() is ctx
+    # Same (only) worker thread, no session attached
+    assert pool.pool.submit(context).result() is None
+
+
+def test_running_call_is_joined_not_resubmitted():
+    pool = SectionPool(workers=4)
+    release = threading.Event()
+    calls = []
+
+    def provider(user_id, months):
+        calls.append((user_id, months))
+        release.wait(5)
+        return months
+
+    first = pool.submit(None, provider, (1, 6))
+    again = pool.submit(None, provider, (1, 6))
+    other = pool.submit(None, provider, (2, 6))
+    assert again is first and other is not first
+    assert pool.running() == 2
+    release.set()
+    assert first.result() == 6 and other.result() == 6
+    assert sorted(calls) == [(1, 6), (2, 6)]
+    # Finished calls are submitted afresh
+    assert pool.running() == 0
+    assert pool.submit(None, provider, (1, 6)).result() == 6
+    assert len(calls) == 3
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from user_store import SQLitePool, UserStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = UserStore(SQLitePool(str(tmp_path / "users.db"), size=2), iterations=1)
+    yield store
+    store.pool.close()
+
+
+def test_admin_cannot_self_register(store):
+    assert store.login("mallory", "pw", "Admin") is None
+    store.create_user("alice", "pw", "Admin")
+    user, _ = store.login("alice", "pw", "Admin")
+    assert user["role"] == "Admin"
+    with pytest.raises(ValueError):
+        store.create_user("alice", "pw", "Admin")
+
+
+def test_farmer_registers_on_first_login(store):
+    user, token = store.login("ravi", "pw", "Farmer")
+    assert store.get_session(token) == user
+    assert store.login("ravi", "wrong", "Farmer") is None
+    assert store.login("ravi", "pw", "Contributor") is None
+
+
+def test_sessions_expire(store):
+    _, token = store.login("ravi", "pw", "Farmer")
+    store.session_ttl = 0
+    assert store.get_session(token) is None
+    store._sessions.clear()
+    assert store.get_session(token) is None
+    assert store.rotate_session(token) is None
+
+
+def test_rotate_session_invalidates_old_token(store):
+    user, token = store.login("ravi", "pw", "Farmer")
+    rotated, new_token = store.rotate_session(token)
+    assert rotated == user and new_token != token
+    assert store.get_session(token) is None
+    assert store.get_session(new_token) == user
+    assert store.rotate_session(token) is None
+
+
+def test_rotation_keeps_expiry(store):
+    _, token = store.login("ravi", "pw", "Farmer")
+    time.sleep(0.05)
+    _, new_token = store.rotate_session(token)
+    store.session_ttl = 0.04
+    assert store.get_session(new_token) is None
+    store._sessions.clear()
+    assert store.get_session(new_token) is None
+
+
+def test_login_prunes_expired_sessions(store):
+    _, token = store.login("ravi", "pw", "Farmer")
+    store.session_ttl = 0
+    store._pruned_at = 0.0
+    store.login("ravi", "pw", "Farmer")
+    with store.pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sessions WHERE token = ?", (token,)).fetchone()[0] == 0
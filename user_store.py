@@ -0,0 +1,271 @@
+import hashlib
+import hmac
+import os
+import queue
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import streamlit as st
+
+DB_PATH = os.environ.get(
+    "HARVEST_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "harvest.db"),
+)
+ROLES = ["Admin", "Farmer", "Contributor"]
+# Roles a new username can register itself with at login. Admin accounts
+# are created with `python user_store.py add-user NAME --role Admin`.
+SELF_REGISTER_ROLES = ["Farmer", "Contributor"]
+PASSWORD_ITERATIONS = 100_000
+SESSION_CACHE_SIZE = 4096
+# Cached sessions are re-checked against the database after this many
+# seconds, so a logout on another replica takes effect
+SESSION_CACHE_TTL = 60
+# The running user count is re-read from the database after this many
+# seconds, so registrations on other replicas are counted too
+USER_COUNT_TTL = 60
+# Sessions expire this long after login, however active they are
+SESSION_TTL = int(float(os.environ.get("HARVEST_SESSION_TTL_HOURS", "12")) * 3600)
+# Expired sessions are deleted at most this often, from login
+SESSION_PRUNE_INTERVAL = 600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    role TEXT NOT NULL,
+    salt BLOB NOT NULL,
+    password_hash BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    token TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_created_at ON sessions(created_at);
+"""
+
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache prepares each one once
+SELECT_USER_BY_NAME = "SELECT id, username, role, salt, password_hash FROM users WHERE username = ?"
+INSERT_USER = "INSERT INTO users (username, role, salt, password_hash, created_at) VALUES (?, ?, ?, ?, ?)"
+INSERT_SESSION = "INSERT INTO sessions (token, user_id, created_at) VALUES (?, ?, ?)"
+SELECT_SESSION = (
+    "SELECT users.id, users.username, users.role, sessions.created_at FROM sessions "
+    "JOIN users ON users.id = sessions.user_id WHERE sessions.token = ? AND sessions.created_at > ?"
+)
+DELETE_SESSION = "DELETE FROM sessions WHERE token = ?"
+DELETE_EXPIRED_SESSIONS = "DELETE FROM sessions WHERE created_at <= ?"
+COUNT_USERS = "SELECT COUNT(*) FROM users"
+
+
+class SQLitePool:
+    # Fixed-size pool of SQLite connections shared by all sessions. UserStore
+    # only relies on connection(), so a server database pool with the same
+    # method can replace this one.
+    def __init__(self, path=DB_PATH, size=8):
+        self.path = path
+        self._connections = queue.LifoQueue()
+        for _ in range(size):
+            self._connections.put(self._connect())
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._connections.get()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._connections.put(conn)
+
+    def close(self):
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+
+def hash_password(password, salt, iterations=PASSWORD_ITERATIONS):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+
+class UserStore:
+    def __init__(self, pool, session_cache_size=SESSION_CACHE_SIZE, iterations=PASSWORD_ITERATIONS,
+                 session_ttl=SESSION_TTL):
+        self.pool = pool
+        self.iterations = iterations
+        self.session_ttl = session_ttl
+        self._sessions = OrderedDict()
+        self._session_cache_size = session_cache_size
+        self._user_count = None
+        self._user_count_at = 0.0
+        self._pruned_at = 0.0
+        self._lock = threading.Lock()
+
+    def login(self, username, password, role):
+        # Returns (user, session token), or None if the credentials don't
+        # match. A username seen for the first time is registered with the
+        # given role if it is one of SELF_REGISTER_ROLES. Password hashing
+        # happens outside the pooled connection so slow hashes don't hold
+        # connections or write locks.
+        with self.pool.connection() as conn:
+            row = conn.execute(SELECT_USER_BY_NAME, (username,)).fetchone()
+        token = secrets.token_urlsafe(24)
+        self._prune()
+
+        if row is None:
+            if role not in SELF_REGISTER_ROLES:
+                return None
+            salt = secrets.token_bytes(16)
+            password_hash = hash_password(password, salt, self.iterations)
+            try:
+                with self.pool.connection() as conn:
+                    now = time.time()
+                    user_id = conn.execute(INSERT_USER, (username, role, salt, password_hash, now)).lastrowid
+                    conn.execute(INSERT_SESSION, (token, user_id, now))
+                user = {"id": user_id, "username": username, "role": role}
+                self._remember(token, user, now)
+                with self._lock:
+                    if self._user_count is not None:
+                        self._user_count += 1
+                return user, token
+            except sqlite3.IntegrityError:
+                # Registered concurrently by another session
+                with self.pool.connection() as conn:
+                    row = conn.execute(SELECT_USER_BY_NAME, (username,)).fetchone()
+
+        user_id, name, user_role, salt, password_hash = row
+        if user_role != role or not hmac.compare_digest(
+            hash_password(password, salt, self.iterations), password_hash
+        ):
+            return None
+        user = {"id": user_id, "username": name, "role": user_role}
+        now = time.time()
+        with self.pool.connection() as conn:
+            conn.execute(INSERT_SESSION, (token, user_id, now))
+        self._remember(token, user, now)
+        return user, token
+
+    def create_user(self, username, password, role):
+        # Registers a user with any role; raises ValueError if the username
+        # is taken
+        salt = secrets.token_bytes(16)
+        password_hash = hash_password(password, salt, self.iterations)
+        try:
+            with self.pool.connection() as conn:
+                user_id = conn.execute(INSERT_USER, (username, role, salt, password_hash, time.time())).lastrowid
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Username {username!r} is already registered") from None
+        with self._lock:
+            if self._user_count is not None:
+                self._user_count += 1
+        return {"id": user_id, "username": username, "role": role}
+
+    def get_session(self, token):
+        # The session's user, or None if the token is unknown or expired
+        with self._lock:
+            cached = self._sessions.get(token)
+            if cached is not None and time.monotonic() - cached[1] < SESSION_CACHE_TTL:
+                if time.time() - cached[2] < self.session_ttl:
+                    self._sessions.move_to_end(token)
+                    return cached[0]
+                del self._sessions[token]
+                return None
+        with self.pool.connection() as conn:
+            row = conn.execute(SELECT_SESSION, (token, time.time() - self.session_ttl)).fetchone()
+        if row is None:
+            return None
+        user = {"id": row[0], "username": row[1], "role": row[2]}
+        self._remember(token, user, row[3])
+        return user
+
+    def rotate_session(self, token):
+        # Replaces a live session's token with a new one, keeping its
+        # expiry. Returns (user, new token), or None if the token is
+        # unknown, expired or was already rotated.
+        new_token = secrets.token_urlsafe(24)
+        with self._lock:
+            self._sessions.pop(token, None)
+        with self.pool.connection() as conn:
+            row = conn.execute(SELECT_SESSION, (token, time.time() - self.session_ttl)).fetchone()
+            # Only one of two concurrent rotations deletes the old token
+            if row is None or conn.execute(DELETE_SESSION, (token,)).rowcount != 1:
+                return None
+            conn.execute(INSERT_SESSION, (new_token, row[0], row[3]))
+        user = {"id": row[0], "username": row[1], "role": row[2]}
+        self._remember(new_token, user, row[3])
+        return user, new_token
+
+    def logout(self, token):
+        with self._lock:
+            self._sessions.pop(token, None)
+        with self.pool.connection() as conn:
+            conn.execute(DELETE_SESSION, (token,))
+
+    def user_count(self):
+        # Registered users, kept as a running count between re-reads
+        with self._lock:
+            if self._user_count is not None and time.monotonic() - self._user_count_at < USER_COUNT_TTL:
+                return self._user_count
+        with self.pool.connection() as conn:
+            count = conn.execute(COUNT_USERS).fetchone()[0]
+        with self._lock:
+            self._user_count, self._user_count_at = count, time.monotonic()
+        return count
+
+    def _prune(self):
+        # Deletes expired sessions, at most every SESSION_PRUNE_INTERVAL
+        now = time.time()
+        with self._lock:
+            if now - self._pruned_at < SESSION_PRUNE_INTERVAL:
+                return
+            self._pruned_at = now
+        with self.pool.connection() as conn:
+            conn.execute(DELETE_EXPIRED_SESSIONS, (now - self.session_ttl,))
+
+    def _remember(self, token, user, created_at):
+        with self._lock:
+            self._sessions[token] = (user, time.monotonic(), created_at)
+            self._sessions.move_to_end(token)
+            while len(self._sessions) > self._session_cache_size:
+                self._sessions.popitem(last=False)
+
+
+# One store and connection pool per process, shared by every session
+@st.cache_resource(show_spinner=False)
+def get_user_store(path=DB_PATH):
+    return UserStore(SQLitePool(path))
+
+
+if __name__ == "__main__":
+    import argparse
+    import getpass
+
+    parser = argparse.ArgumentParser(description="Manage Harvest Pay users")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_user = commands.add_parser("add-user", help="Register a user with any role, including Admin")
+    add_user.add_argument("username")
+    add_user.add_argument("--role", choices=ROLES, default="Admin")
+    add_user.add_argument("--db", default=DB_PATH)
+    args = parser.parse_args()
+
+    password = getpass.getpass(f"Password for {args.username}: ")
+    store = UserStore(SQLitePool(args.db, size=1))
+    try:
+        user = store.create_user(args.username, password, args.role)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    finally:
+        store.pool.close()
+    print(f"Registered {user['username']} ({user['role']}) with id {user['id']}")